@@ -643,18 +643,15 @@ def optimizar_modelo_satisfaccion_gastronomica():
             # Entrenar modelo optimizado
             print(f"\n ENTRENANDO MODELO OPTIMIZADO...")
 
-            from sklearn.model_selection import train_test_split
             from sklearn.feature_extraction.text import TfidfVectorizer
             from sklearn.naive_bayes import ComplementNB
             from sklearn.metrics import accuracy_score, classification_report, cohen_kappa_score
+            from src.ml.preprocessing.feature_store import TextFeatureStore
+            from src.ml.training.hyperparameter_search import fit_candidates
 
             X = df_optimizado['comment']
             y = df_optimizado['sentimiento']
 
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
-
             # Vectorización optimizada para el dominio gastronómico
             print(" Configurando vectorización TF-IDF optimizada...")
             vectorizer_gastro = TfidfVectorizer(
@@ -672,9 +669,14 @@ def optimizar_modelo_satisfaccion_gastronomica():
                 norm='l2' # Normalización L2 para vectores unitarios
             )
 
+            # Split estratificado + fit_transform, reutilizados del feature store
+            # si el dataset optimizado y el vectorizador no cambiaron
             print(" ⚙️ Entrenando vectorizador...")
-            X_train_tfidf = vectorizer_gastro.fit_transform(X_train)
-            X_test_tfidf = vectorizer_gastro.transform(X_test)
+            store = TextFeatureStore(project_root / "data" / "cache" / "features")
+            features = store.get_or_build(X, y, vectorizer_gastro, test_size=0.2, random_state=42, stratify=True)
+            vectorizer_gastro = features.vectorizer
+            X_train_tfidf, X_test_tfidf = features.X_train, features.X_test
+            y_train, y_test = features.y_train, features.y_test
 
             print(f" Vocabulario: {len(vectorizer_gastro.vocabulary_):,} términos")
             print(f" Matriz entrenamiento: {X_train_tfidf.shape}")
@@ -699,14 +701,29 @@ def optimizar_modelo_satisfaccion_gastronomica():
                 )
             }
 
-            # Evaluar cada clasificador
+            # Ensemble con los mejores (no depende de los individuales)
+            candidates = dict(classifiers)
+            candidates['ensemble'] = VotingClassifier(
+                estimators=[
+                    ('nb', ComplementNB(alpha=0.1)),
+                    ('lr', LogisticRegression(max_iter=1000, class_weight='balanced', random_state=42))
+                ],
+                voting='soft'
+            )
+
+            # Evaluar cada clasificador (todos se ajustan en paralelo). Si el
+            # ensemble falla se comparan solo los individuales
+            fitted = fit_candidates(
+                candidates, X_train_tfidf, y_train, X_test_tfidf, y_test,
+                allow_failure=('ensemble',)
+            )
+
             best_classifier = None
             best_score = 0
             classifier_scores = {}
 
-            for name, clf in classifiers.items():
-                clf.fit(X_train_tfidf, y_train)
-                score = clf.score(X_test_tfidf, y_test)
+            for name in classifiers:
+                clf, score, _ = fitted[name]
                 classifier_scores[name] = score
                 print(f" • {name}: {score:.3f}")
 
@@ -717,17 +734,8 @@ def optimizar_modelo_satisfaccion_gastronomica():
             # Usar el mejor clasificador individual o ensemble si es mejor
             print(f"\n Mejor clasificador individual: {best_score:.3f}")
 
-            # Crear ensemble con los mejores
-            try:
-                ensemble = VotingClassifier(
-                    estimators=[
-                        ('nb', ComplementNB(alpha=0.1)),
-                        ('lr', LogisticRegression(max_iter=1000, class_weight='balanced', random_state=42))
-                    ],
-                    voting='soft'
-                )
-                ensemble.fit(X_train_tfidf, y_train)
-                ensemble_score = ensemble.score(X_test_tfidf, y_test)
+            if 'ensemble' in fitted:
+                ensemble, ensemble_score, _ = fitted['ensemble']
                 print(f" Ensemble score: {ensemble_score:.3f}")
 
                 if ensemble_score > best_score:
@@ -736,7 +744,7 @@ def optimizar_modelo_satisfaccion_gastronomica():
                 else:
                     classifier_gastro = best_classifier
                     print(" Usando clasificador individual (mejor rendimiento)")
-            except:
+            else:
                 classifier_gastro = best_classifier
                 print(" Usando clasificador individual")
 
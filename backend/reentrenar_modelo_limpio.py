@@ -16,7 +16,8 @@ print("=" * 80)
 
 try:
     from src.ml.models import SentimentAnalysisModel
-    from sklearn.model_selection import train_test_split
+    from src.ml.preprocessing.feature_store import TextFeatureStore
+    from src.ml.training.hyperparameter_search import fit_candidates
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.naive_bayes import ComplementNB
     from sklearn.linear_model import LogisticRegression
@@ -50,13 +51,6 @@ try:
     X = df['comment']
     y = df['sentimiento']
 
-    # Split estratificado
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-
-    print(f" Train: {len(X_train):,} | Test: {len(X_test):,}")
-
     # Vectorización TF-IDF optimizada
     print(f"\n Configurando vectorizador TF-IDF...")
     vectorizer = TfidfVectorizer(
@@ -73,9 +67,16 @@ try:
         norm='l2'
     )
 
+    # Split estratificado + fit_transform, reutilizados del feature store
+    # si los datos y los parámetros del vectorizador no cambiaron
     print(f" Entrenando vectorizador...")
-    X_train_tfidf = vectorizer.fit_transform(X_train)
-    X_test_tfidf = vectorizer.transform(X_test)
+    store = TextFeatureStore(project_root / "data" / "cache" / "features")
+    features = store.get_or_build(X, y, vectorizer, test_size=0.2, random_state=42, stratify=True)
+    vectorizer = features.vectorizer
+    X_train_tfidf, X_test_tfidf = features.X_train, features.X_test
+    y_train, y_test = features.y_train, features.y_test
+
+    print(f" Train: {len(y_train):,} | Test: {len(y_test):,}")
 
     print(f" Vocabulario: {len(vectorizer.vocabulary_):,} términos")
     print(f" Matriz train: {X_train_tfidf.shape}")
@@ -103,14 +104,25 @@ try:
         )
     }
 
+    # El ensemble no depende de los individuales: todos se ajustan en paralelo
+    candidates = dict(classifiers)
+    candidates['Ensemble'] = VotingClassifier(
+        estimators=[
+            ('nb', ComplementNB(alpha=0.1)),
+            ('lr', LogisticRegression(max_iter=1000, class_weight='balanced',
+                                     solver='saga', random_state=42))
+        ],
+        voting='soft'
+    )
+    fitted = fit_candidates(candidates, X_train_tfidf, y_train, X_test_tfidf, y_test)
+
     best_clf = None
     best_score = 0
     best_name = ""
 
-    for name, clf in classifiers.items():
-        print(f"\n Entrenando {name}...")
-        clf.fit(X_train_tfidf, y_train)
-        score = clf.score(X_test_tfidf, y_test)
+    for name in classifiers:
+        clf, score, seconds = fitted[name]
+        print(f"\n {name}: {seconds:.1f}s")
         print(f" → Accuracy: {score:.4f} ({score*100:.2f}%)")
 
         if score > best_score:
@@ -118,18 +130,9 @@ try:
             best_clf = clf
             best_name = name
 
-    # Crear ensemble si mejora
-    print(f"\n Probando Ensemble Voting...")
-    ensemble = VotingClassifier(
-        estimators=[
-            ('nb', ComplementNB(alpha=0.1)),
-            ('lr', LogisticRegression(max_iter=1000, class_weight='balanced',
-                                     solver='saga', random_state=42))
-        ],
-        voting='soft'
-    )
-    ensemble.fit(X_train_tfidf, y_train)
-    ensemble_score = ensemble.score(X_test_tfidf, y_test)
+    # Usar el ensemble si mejora
+    ensemble, ensemble_score, seconds = fitted['Ensemble']
+    print(f"\n Ensemble Voting: {seconds:.1f}s")
     print(f" → Ensemble Accuracy: {ensemble_score:.4f} ({ensemble_score*100:.2f}%)")
 
     # Seleccionar mejor modelo
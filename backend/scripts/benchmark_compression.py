@@ -0,0 +1,131 @@
+"""
+Benchmark de compresión de respuestas
+Bytes ahorrados vs. costo de CPU de gzip/brotli en los payloads típicos de la API.
+
+Payloads:
+- GET /api/districts/statistics/summary
+- POST /api/v1/recommendations (top_n configurable)
+- POST /api/v1/sentiment/analyze/batch (100 comentarios con probabilidades)
+
+Uso:
+    python scripts/benchmark_compression.py
+    python scripts/benchmark_compression.py --top-n 50 --repeat 200 --json compression.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from src.presentation.api.middleware.compression import brotli, compress  # noqa: E402
+
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 11)
+
+
+async def collect_payloads(top_n: int) -> Dict[str, bytes]:
+    """Obtiene los cuerpos sin comprimir de los endpoints (en proceso)."""
+    import httpx
+    from fastapi.responses import ORJSONResponse
+    from src.presentation.api.main import app
+    from src.infrastructure import get_sentiment_model
+
+    payloads = {}
+    headers = {'Accept-Encoding': 'identity'}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        response = await client.get('/api/districts/statistics/summary', headers=headers)
+        payloads['districts/statistics'] = response.content
+
+        response = await client.post('/api/v1/recommendations', headers=headers, json={
+            'user_location': {'lat': -12.1211, 'long': -77.0297},
+            'preferences': {},
+            'filters': {},
+            'top_n': top_n
+        })
+        payloads[f'recommendations (top_n={top_n})'] = response.content
+
+    # Mismo formato que /sentiment/analyze/batch (sin depender del CSV de reseñas)
+    comments = [f"La comida estuvo muy buena pero el servicio fue lento, visita {i}" for i in range(100)]
+    results = [
+        {
+            'comment': r['text_original'],
+            'sentiment': r['sentiment'],
+            'confidence': r['confidence'],
+            'confidence_level': None,
+            'probabilities': r['probabilities'],
+            'processed_text': r['text_processed']
+        }
+        for r in get_sentiment_model().predict_batch(comments)
+    ]
+    payloads['sentiment/analyze/batch (100)'] = ORJSONResponse({
+        'total': len(results),
+        'results': results,
+        'summary': {'positivo': 0, 'neutro': 0, 'negativo': 0}
+    }).body
+
+    return payloads
+
+
+def measure(body: bytes, encoding: str, level: int, repeat: int) -> Dict:
+    """Tamaño comprimido y mediana del tiempo de compresión."""
+    kwargs = {'gzip_level': level} if encoding == 'gzip' else {'brotli_quality': level}
+    samples = []
+    compressed = b''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = compress(body, encoding, **kwargs)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {
+        'encoding': encoding,
+        'level': level,
+        'bytes': len(compressed),
+        'saved_pct': round(100 * (1 - len(compressed) / len(body)), 1),
+        'cpu_us': round(statistics.median(samples), 1)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de compresión de respuestas')
+    parser.add_argument('--top-n', type=int, default=50, help='Recomendaciones por respuesta')
+    parser.add_argument('--repeat', type=int, default=100, help='Repeticiones por medición')
+    parser.add_argument('--json', dest='json_path', help='Guardar reporte en JSON')
+    args = parser.parse_args()
+
+    payloads = asyncio.run(collect_payloads(args.top_n))
+
+    codecs = [('gzip', level) for level in GZIP_LEVELS]
+    if brotli is not None:
+        codecs += [('br', quality) for quality in BROTLI_QUALITIES]
+    else:
+        print(" brotli no instalado: solo se mide gzip")
+
+    report: Dict[str, List[Dict]] = {}
+    print("=" * 70)
+    print("BENCHMARK DE COMPRESIÓN")
+    print("=" * 70)
+    for name, body in payloads.items():
+        print(f"\n {name}: {len(body):,} bytes sin comprimir")
+        print(f" {'codec':8s} {'nivel':>5s} {'bytes':>9s} {'ahorro':>8s} {'CPU (µs)':>10s}")
+        rows = [measure(body, encoding, level, args.repeat) for encoding, level in codecs]
+        for row in rows:
+            print(f" {row['encoding']:8s} {row['level']:>5d} {row['bytes']:>9,d} "
+                  f"{row['saved_pct']:>7.1f}% {row['cpu_us']:>10.1f}")
+        report[name] = [{'raw_bytes': len(body)}] + rows
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\n Reporte guardado: {args.json_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Benchmark de serialización de respuestas
+Compara el camino anterior (convert_numpy_types + DTOs validados + re-validación
+contra response_model + JSONResponse) con el camino rápido (model_construct +
+ORJSONResponse) y estima qué parte del tiempo de la petición es serialización.
+
+Uso:
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --top-n 50 --batch-size 100 --repeat 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+
+from src.application.dto import (  # noqa: E402
+    RecommendationRequestDTO,
+    RecommendationResponseDTO,
+    RecommendationItemDTO,
+    RestaurantDTO,
+    SentimentAnalysisResponseDTO,
+    BatchSentimentAnalysisResponseDTO
+)
+from src.application.services.recommendation_service import convert_numpy_types  # noqa: E402
+
+
+def time_ms(func: Callable, repeat: int) -> float:
+    """Mediana del tiempo de ejecución (ms)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def legacy_recommendation_payload(response: RecommendationResponseDTO) -> bytes:
+    """Camino anterior: DTOs validados campo a campo + validación de response_model + json."""
+    items = []
+    for item in response.recommendations:
+        restaurant = item.restaurant
+        restaurant_dto = RestaurantDTO(**{
+            key: convert_numpy_types(value)
+            for key, value in restaurant.model_dump().items()
+        })
+        items.append(RecommendationItemDTO(
+            restaurant=restaurant_dto,
+            score=convert_numpy_types(item.score),
+            reason=convert_numpy_types(item.reason),
+            details={key: convert_numpy_types(value) for key, value in item.details.items()}
+        ))
+    dto = RecommendationResponseDTO(
+        recommendations=items,
+        total_found=response.total_found,
+        execution_time_ms=response.execution_time_ms,
+        metadata=response.metadata
+    )
+    # FastAPI: _prepare_response_content + validate + serialize(mode='json')
+    validated = RecommendationResponseDTO.model_validate(dto.model_dump())
+    return JSONResponse(validated.model_dump(mode='json')).body
+
+
+def fast_recommendation_payload(response: RecommendationResponseDTO) -> bytes:
+    """Camino rápido: DTOs ya construidos con model_construct + orjson."""
+    return ORJSONResponse(response.model_dump()).body
+
+
+def legacy_batch_payload(results) -> bytes:
+    items = [SentimentAnalysisResponseDTO(**result) for result in results]
+    dto = BatchSentimentAnalysisResponseDTO(total=len(items), results=items, summary={'positivo': 0})
+    validated = BatchSentimentAnalysisResponseDTO.model_validate(dto.model_dump())
+    return JSONResponse(validated.model_dump(mode='json')).body
+
+
+def fast_batch_payload(results) -> bytes:
+    items = [SentimentAnalysisResponseDTO.model_construct(**result) for result in results]
+    dto = BatchSentimentAnalysisResponseDTO.model_construct(total=len(items), results=items, summary={'positivo': 0})
+    return ORJSONResponse(dto.model_dump()).body
+
+
+async def request_ms(path: str, payload: Dict, repeat: int) -> float:
+    """Tiempo end-to-end en proceso (ASGITransport) del endpoint actual."""
+    import httpx
+    from src.presentation.api.main import app
+
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        await client.post(path, json=payload)  # calentamiento
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+    return statistics.median(samples)
+
+
+def report(name: str, total_ms: Optional[float], legacy_ms: float, fast_ms: float) -> None:
+    print(f"\n {name}")
+    if total_ms is None:
+        print(f" Serialización anterior:        {legacy_ms:8.3f} ms")
+        print(f" Serialización rápida:          {fast_ms:8.3f} ms")
+    else:
+        before_total = total_ms - fast_ms + legacy_ms
+        print(f" Petición (actual, en proceso): {total_ms:8.3f} ms")
+        print(f" Serialización anterior:        {legacy_ms:8.3f} ms ({legacy_ms / before_total:6.1%} de la petición)")
+        print(f" Serialización rápida:          {fast_ms:8.3f} ms ({fast_ms / total_ms:6.1%} de la petición)")
+    print(f" Aceleración de serialización:  {legacy_ms / fast_ms:8.1f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de serialización de respuestas')
+    parser.add_argument('--top-n', type=int, default=50, help='Recomendaciones por respuesta')
+    parser.add_argument('--batch-size', type=int, default=100, help='Comentarios en /sentiment/analyze/batch')
+    parser.add_argument('--repeat', type=int, default=100, help='Repeticiones por medición')
+    args = parser.parse_args()
+
+    from src.application import RecommendationService
+    from src.infrastructure import get_restaurant_repository, get_sentiment_model
+
+    print("=" * 70)
+    print("BENCHMARK DE SERIALIZACIÓN")
+    print("=" * 70)
+
+    # Recomendaciones
+    rec_payload = {
+        'user_location': {'lat': -12.1211, 'long': -77.0297},
+        'preferences': {},
+        'filters': {},
+        'top_n': args.top_n
+    }
+    service = RecommendationService(get_restaurant_repository())
+    response = service.get_recommendations(RecommendationRequestDTO(**rec_payload))
+
+    assert fast_recommendation_payload(response) and legacy_recommendation_payload(response)
+    report(
+        f"POST /api/v1/recommendations (top_n={args.top_n})",
+        asyncio.run(request_ms('/api/v1/recommendations', rec_payload, args.repeat)),
+        time_ms(lambda: legacy_recommendation_payload(response), args.repeat),
+        time_ms(lambda: fast_recommendation_payload(response), args.repeat)
+    )
+
+    # Sentimientos en lote
+    comments = [f"La comida estuvo muy buena, plato {i}" for i in range(args.batch_size)]
+    results = [
+        {
+            'comment': r['text_original'],
+            'sentiment': r['sentiment'],
+            'confidence': r['confidence'],
+            'probabilities': r['probabilities'],
+            'processed_text': r['text_processed']
+        }
+        for r in get_sentiment_model().predict_batch(comments)
+    ]
+    try:
+        total = asyncio.run(request_ms('/api/v1/sentiment/analyze/batch', {'comments': comments}, args.repeat))
+    except Exception as e:
+        print(f"\n /sentiment/analyze/batch no disponible en proceso ({e}); se omite el total")
+        total = None
+    report(
+        f"POST /api/v1/sentiment/analyze/batch ({args.batch_size} comentarios)",
+        total,
+        time_ms(lambda: legacy_batch_payload(results), args.repeat),
+        time_ms(lambda: fast_batch_payload(results), args.repeat)
+    )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
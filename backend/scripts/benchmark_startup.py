@@ -0,0 +1,121 @@
+"""
+Benchmark de arranque de la API
+Mide el tiempo de importación del módulo de la app con `python -X importtime`.
+
+Uso:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 5 --json startup.json --max-ms 1500
+
+Falla (exit code 1) si el import supera --max-ms o si se importa alguno de
+los módulos pesados que deben cargarse de forma diferida (sklearn, nltk, psutil).
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+APP_MODULE = 'src.presentation.api.main'
+
+# Módulos que no deben importarse al arrancar la app
+FORBIDDEN_MODULES = ('sklearn', 'nltk', 'psutil', 'scipy')
+
+
+def run_importtime(module: str) -> Dict[str, Dict[str, int]]:
+    """
+    Ejecuta `python -X importtime -c "import <module>"` en un proceso limpio.
+
+    Returns:
+        Diccionario {modulo: {'self_us': int, 'cumulative_us': int}}
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Error importando {module}:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        # Formato: "import time:   <self> |   <cumulative> | <indent><module>"
+        self_part, cumulative_part, name = line.split(':', 1)[1].split('|')
+        timings[name.strip()] = {
+            'self_us': int(self_part),
+            'cumulative_us': int(cumulative_part)
+        }
+
+    return timings
+
+
+def top_level_packages(timings: Dict[str, Dict[str, int]], n: int) -> List[Dict]:
+    """Paquetes de primer nivel ordenados por tiempo acumulado."""
+    packages = {}
+    for name, timing in timings.items():
+        root = name.split('.')[0]
+        if name == root:
+            packages[root] = timing['cumulative_us']
+    ranked = sorted(packages.items(), key=lambda x: x[1], reverse=True)[:n]
+    return [{'package': pkg, 'cumulative_ms': round(us / 1000, 1)} for pkg, us in ranked]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de tiempo de arranque (import) de la API')
+    parser.add_argument('--module', default=APP_MODULE, help='Módulo a importar')
+    parser.add_argument('--runs', type=int, default=3, help='Número de ejecuciones')
+    parser.add_argument('--top', type=int, default=10, help='Paquetes a mostrar')
+    parser.add_argument('--json', dest='json_path', help='Guardar reporte en JSON')
+    parser.add_argument('--max-ms', type=float, help='Umbral máximo de import (ms)')
+    args = parser.parse_args()
+
+    totals_ms = []
+    timings = {}
+    for _ in range(args.runs):
+        timings = run_importtime(args.module)
+        totals_ms.append(timings[args.module]['cumulative_us'] / 1000)
+
+    forbidden = sorted(m for m in FORBIDDEN_MODULES if m in timings)
+    report = {
+        'module': args.module,
+        'runs': args.runs,
+        'median_ms': round(statistics.median(totals_ms), 1),
+        'min_ms': round(min(totals_ms), 1),
+        'max_ms': round(max(totals_ms), 1),
+        'modules_imported': len(timings),
+        'top_packages': top_level_packages(timings, args.top),
+        'forbidden_modules_imported': forbidden
+    }
+
+    print("=" * 70)
+    print(f"BENCHMARK DE ARRANQUE: {args.module}")
+    print("=" * 70)
+    print(f" Mediana: {report['median_ms']} ms (min {report['min_ms']}, max {report['max_ms']}, {args.runs} runs)")
+    print(f" Módulos importados: {report['modules_imported']}")
+    print("\n Top paquetes (acumulado):")
+    for item in report['top_packages']:
+        print(f" {item['package']:30s} {item['cumulative_ms']:>8.1f} ms")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\n Reporte guardado: {args.json_path}")
+
+    failed = False
+    if forbidden:
+        print(f"\n ERROR: módulos pesados importados al arrancar: {forbidden}")
+        failed = True
+    if args.max_ms is not None and report['median_ms'] > args.max_ms:
+        print(f"\n ERROR: {report['median_ms']} ms supera el umbral de {args.max_ms} ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Control de regresiones de rendimiento
+Compara un resultado de pytest-benchmark (--benchmark-json) con un baseline.
+
+Uso:
+    pytest test/benchmarks --benchmark-json=bench.json
+    python scripts/check_benchmark_regression.py bench.json test/benchmarks/baselines/quick.json
+    python scripts/check_benchmark_regression.py bench.json test/benchmarks/baselines/quick.json --threshold 0.10
+
+    # Actualizar el baseline después de una optimización aceptada
+    python scripts/check_benchmark_regression.py bench.json test/benchmarks/baselines/quick.json --save-baseline
+
+Falla (exit code 1) si algún benchmark es más lento que el baseline en más
+de --threshold (por defecto 20% sobre la mediana). Los tiempos dependen de
+la máquina: el baseline debe generarse en el mismo tipo de runner.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+STATS = ('median', 'mean', 'min')
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, float]]:
+    """
+    Lee un JSON de pytest-benchmark o un baseline compacto.
+
+    Returns:
+        {nombre completo del benchmark: {median, mean, min, stddev, rounds}}
+    """
+    data = json.loads(path.read_text())
+    if 'benchmarks' in data and isinstance(data['benchmarks'], dict):
+        return data['benchmarks']
+
+    return {
+        bench['fullname']: {
+            'median': bench['stats']['median'],
+            'mean': bench['stats']['mean'],
+            'min': bench['stats']['min'],
+            'stddev': bench['stats']['stddev'],
+            'rounds': bench['stats']['rounds'],
+        }
+        for bench in data.get('benchmarks', [])
+    }
+
+
+def save_baseline(current_path: Path, baseline_path: Path) -> None:
+    """Guarda un baseline compacto (solo estadísticas) a partir del resultado actual."""
+    raw = json.loads(current_path.read_text())
+    machine = raw.get('machine_info', {})
+    baseline = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': {
+            'python': machine.get('python_version'),
+            'cpu': (machine.get('cpu') or {}).get('brand_raw'),
+            'system': machine.get('system'),
+        },
+        'benchmarks': load_results(current_path),
+    }
+    baseline_path.parent.mkdir(parents=True, exist_ok=True)
+    baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+    print(f" Baseline guardado: {baseline_path} ({len(baseline['benchmarks'])} benchmarks)")
+
+
+def compare(current: Dict, baseline: Dict, stat: str, threshold: float) -> int:
+    """Imprime la comparación y retorna el número de regresiones."""
+    regressions = 0
+    print(f" {'benchmark':60s} {'baseline':>11s} {'actual':>11s} {'cambio':>8s}  estado")
+    for name in sorted(set(current) | set(baseline)):
+        if name not in current:
+            print(f" {name:60s} {'-':>11s} {'-':>11s} {'':>8s}  sin ejecutar")
+            continue
+        now = current[name][stat]
+        if name not in baseline:
+            print(f" {name:60s} {'-':>11s} {now * 1e3:>9.3f}ms {'':>8s}  nuevo")
+            continue
+
+        before = baseline[name][stat]
+        change = (now - before) / before if before else 0.0
+        if change > threshold:
+            status = 'REGRESIÓN'
+            regressions += 1
+        elif change < -threshold:
+            status = 'mejora'
+        else:
+            status = 'ok'
+        print(f" {name:60s} {before * 1e3:>9.3f}ms {now * 1e3:>9.3f}ms {change:>+7.1%}  {status}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Control de regresiones de benchmarks')
+    parser.add_argument('current', type=Path, help='JSON de pytest --benchmark-json')
+    parser.add_argument('baseline', type=Path, help='Baseline a comparar (o a crear con --save-baseline)')
+    parser.add_argument('--threshold', type=float, default=0.20, help='Regresión máxima tolerada (0.20 = 20%%)')
+    parser.add_argument('--stat', choices=STATS, default='median', help='Estadística a comparar')
+    parser.add_argument('--save-baseline', action='store_true', help='Sobrescribir el baseline con el resultado actual')
+    args = parser.parse_args()
+
+    if args.save_baseline:
+        save_baseline(args.current, args.baseline)
+        return 0
+
+    if not args.baseline.exists():
+        print(f" Baseline no encontrado: {args.baseline} (créalo con --save-baseline)")
+        return 1
+
+    print("=" * 100)
+    print(f"REGRESIONES DE RENDIMIENTO ({args.stat}, umbral {args.threshold:.0%})")
+    print("=" * 100)
+    regressions = compare(
+        load_results(args.current),
+        load_results(args.baseline),
+        args.stat,
+        args.threshold
+    )
+
+    if regressions:
+        print(f"\n {regressions} benchmark(s) superan el umbral de regresión")
+        return 1
+    print("\n Sin regresiones")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+Load test de la API
+Genera tráfico concurrente con una mezcla realista de recomendaciones,
+análisis de sentimientos y consultas de distritos, y reporta throughput,
+latencias p50/p95/p99 y tasa de errores por nivel de concurrencia.
+
+Modos:
+- En proceso (por defecto): la app FastAPI se ejecuta en el mismo proceso a
+  través de httpx.ASGITransport, con su lifespan (warm-up incluido). Cliente
+  y servidor comparten el event loop: mide la capacidad de un worker.
+- --url: contra un servidor ya levantado.
+- --spawn-uvicorn: levanta `uvicorn --workers N` local, espera a /health y
+  lo detiene al terminar (para comparar cantidades de workers).
+
+Uso:
+    python scripts/load_test.py
+    python scripts/load_test.py --concurrency 1,8,32 --duration 15 --json load_c32.json
+    python scripts/load_test.py --mix recommendations=6,sentiment=3,districts=1
+    python scripts/load_test.py --spawn-uvicorn --workers 4 --concurrency 16,64
+    python scripts/load_test.py --url http://localhost:8000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import builtins
+import contextlib
+import functools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+# Salida del reporte (los prints de la app se silencian en modo en proceso)
+REPORT_OUT = sys.stdout
+
+DEFAULT_MIX = {'recommendations': 5, 'sentiment': 3, 'districts': 2}
+
+DISTRICTS = ['Miraflores', 'Barranco', 'San_Isidro', 'Surco', 'Surquillo', 'Lince', 'Magdalena']
+CATEGORIES = ['Peruano', 'Italiano', 'Chifa', 'Pizzería', 'Cevichería', 'Parrilla']
+COMMENTS = [
+    "La comida estuvo excelente y el servicio muy amable",
+    "Pésimo servicio, esperamos una hora y la comida llegó fría",
+    "Normal, nada especial pero los precios son razonables",
+    "El ceviche más fresco que he probado, volveré pronto",
+    "Muy caro para lo que ofrecen, no lo recomiendo",
+    "Buen ambiente, la atención podría mejorar",
+]
+
+Request = Tuple[str, str, Optional[dict]]  # (método, path, json)
+
+
+# ========== Escenarios ==========
+
+def recommendations_request(rng: random.Random) -> Request:
+    preferences = {'category': rng.choice(CATEGORIES)} if rng.random() < 0.3 else {}
+    filters = {'max_distance_km': rng.choice([2.0, 5.0, 10.0])} if rng.random() < 0.5 else {}
+    return 'POST', '/api/v1/recommendations', {
+        'user_location': {'lat': rng.uniform(-12.15, -12.08), 'long': rng.uniform(-77.07, -77.0)},
+        'preferences': preferences,
+        'filters': filters,
+        'top_n': rng.choice([5, 10, 20]),
+    }
+
+
+def sentiment_request(rng: random.Random) -> Request:
+    if rng.random() < 0.2:
+        return 'POST', '/api/v1/sentiment/analyze/batch', {'comments': rng.sample(COMMENTS, 4)}
+    return 'POST', '/api/v1/sentiment/analyze', {'comment': rng.choice(COMMENTS)}
+
+
+def districts_request(rng: random.Random) -> Request:
+    roll = rng.random()
+    if roll < 0.4:
+        return 'GET', '/api/districts/', None
+    if roll < 0.8:
+        return 'GET', f'/api/districts/{rng.choice(DISTRICTS)}', None
+    return 'GET', '/api/districts/statistics/summary', None
+
+
+SCENARIOS: Dict[str, Callable[[random.Random], Request]] = {
+    'recommendations': recommendations_request,
+    'sentiment': sentiment_request,
+    'districts': districts_request,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'recommendations=5,sentiment=3' -> {'recommendations': 5.0, 'sentiment': 3.0}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Escenario desconocido: {name} (opciones: {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ========== Ejecución ==========
+
+async def run_level(client, concurrency: int, mix: Dict[str, float], duration: Optional[float],
+                    total_requests: Optional[int], seed: int) -> Dict:
+    """Ejecuta un nivel de concurrencia y retorna sus métricas."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: List[Tuple[str, float, bool]] = []
+    errors: Dict[str, int] = {}
+    issued = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    def take_ticket() -> bool:
+        nonlocal issued
+        if total_requests is not None:
+            if issued >= total_requests:
+                return False
+            issued += 1
+            return True
+        return time.perf_counter() < deadline
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        while take_ticket():
+            scenario = rng.choices(names, weights)[0]
+            method, path, body = SCENARIOS[scenario](rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code < 400
+                if not ok:
+                    key = f"{scenario}:{response.status_code}"
+                    errors[key] = errors.get(key, 0) + 1
+            except Exception as e:
+                ok = False
+                key = f"{scenario}:{type(e).__name__}"
+                errors[key] = errors.get(key, 0) + 1
+            samples.append((scenario, (time.perf_counter() - start) * 1000, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'overall': summarize([s for s in samples], elapsed),
+        'scenarios': {
+            name: summarize([s for s in samples if s[0] == name], elapsed)
+            for name in names
+        },
+        'errors': errors,
+    }
+
+
+def summarize(samples: List[Tuple[str, float, bool]], elapsed: float) -> Dict:
+    """Throughput, percentiles de latencia (ms) y tasa de errores."""
+    if not samples:
+        return {'requests': 0}
+    latencies = np.array([latency for _, latency, _ in samples])
+    failed = sum(1 for _, _, ok in samples if not ok)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 1),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(latencies.max()), 2),
+        'error_rate': round(failed / len(samples), 4),
+    }
+
+
+async def run_in_process(levels, verbose: bool = False, **kwargs) -> List[Dict]:
+    import httpx
+
+    results = []
+    app_output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(open(os.devnull, 'w'))
+    with app_output:
+        from src.presentation.api.main import app
+        await _drive_app(app, httpx, levels, results, **kwargs)
+    return results
+
+
+async def _drive_app(app, httpx, levels, results: List[Dict], **kwargs) -> None:
+    # El lifespan ejecuta el warm-up como en producción
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=60) as client:
+            for concurrency in levels:
+                results.append(await run_level(client, concurrency, **kwargs))
+                print_level(results[-1])
+
+
+async def run_against_url(url: str, levels, **kwargs) -> List[Dict]:
+    import httpx
+
+    results = []
+    for concurrency in levels:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+            results.append(await run_level(client, concurrency, **kwargs))
+            print_level(results[-1])
+    return results
+
+
+def spawn_uvicorn(workers: int, port: int) -> subprocess.Popen:
+    """Levanta uvicorn local y espera a que /health reporte ready."""
+    import httpx
+
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'src.presentation.api.main:app',
+         '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--log-level', 'warning'],
+        cwd=BACKEND_DIR,
+        env={**os.environ, 'PYTHONPATH': str(BACKEND_DIR)},
+    )
+    deadline = time.time() + 180
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn terminó con código {process.returncode}")
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/health', timeout=2).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("uvicorn no reportó ready en 180 s")
+
+
+def print_level(result: Dict) -> None:
+    print = functools.partial(builtins.print, file=REPORT_OUT, flush=True)
+    print(f"\n Concurrencia {result['concurrency']} ({result['elapsed_s']} s)")
+    print(f" {'escenario':16s} {'req':>7s} {'rps':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s} {'errores':>8s}")
+    rows = [('TOTAL', result['overall'])] + list(result['scenarios'].items())
+    for name, stats in rows:
+        if not stats.get('requests'):
+            continue
+        print(f" {name:16s} {stats['requests']:>7d} {stats['throughput_rps']:>8.1f} "
+              f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms "
+              f"{stats['max_ms']:>6.1f}ms {stats['error_rate']:>7.2%}")
+    if result['errors']:
+        print(f" errores: {result['errors']}")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Load test de la API')
+    parser.add_argument('--concurrency', default='1,8,32', help='Niveles de concurrencia separados por coma')
+    parser.add_argument('--duration', type=float, default=10.0, help='Segundos por nivel')
+    parser.add_argument('--requests', type=int, help='Peticiones por nivel (reemplaza --duration)')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help='Pesos por escenario: recommendations=5,sentiment=3,districts=2')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla de la mezcla de tráfico')
+    parser.add_argument('--url', help='Servidor a probar (por defecto, la app en proceso)')
+    parser.add_argument('--spawn-uvicorn', action='store_true', help='Levantar uvicorn local para la prueba')
+    parser.add_argument('--workers', type=int, default=1, help='Workers de uvicorn (con --spawn-uvicorn)')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto de uvicorn (con --spawn-uvicorn)')
+    parser.add_argument('--json', dest='json_path', help='Guardar reporte en JSON')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar los logs de la app (modo en proceso)')
+    parser.add_argument('--max-error-rate', type=float, help='Falla (exit 1) si algún nivel supera esta tasa de errores')
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    kwargs = {
+        'mix': args.mix,
+        'duration': None if args.requests else args.duration,
+        'total_requests': args.requests,
+        'seed': args.seed,
+    }
+
+    if args.spawn_uvicorn:
+        mode = f'uvicorn (workers={args.workers})'
+    elif args.url:
+        mode = args.url
+    else:
+        mode = 'in-process (ASGI)'
+
+    print("=" * 80)
+    print(f"LOAD TEST - {mode}")
+    print(f" mezcla: {args.mix}")
+    print("=" * 80)
+
+    process = None
+    try:
+        if args.spawn_uvicorn:
+            process = spawn_uvicorn(args.workers, args.port)
+            results = asyncio.run(run_against_url(f'http://127.0.0.1:{args.port}', levels, **kwargs))
+        elif args.url:
+            results = asyncio.run(run_against_url(args.url, levels, **kwargs))
+        else:
+            results = asyncio.run(run_in_process(levels, verbose=args.verbose, **kwargs))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'mode': mode,
+        'workers': args.workers if args.spawn_uvicorn else None,
+        'mix': args.mix,
+        'duration_s': kwargs['duration'],
+        'requests_per_level': args.requests,
+        'seed': args.seed,
+        'levels': results,
+    }
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\n Reporte guardado: {args.json_path}")
+
+    if args.max_error_rate is not None:
+        worst = max(level['overall'].get('error_rate', 0) for level in results)
+        if worst > args.max_error_rate:
+            print(f"\n Tasa de errores {worst:.2%} supera el máximo {args.max_error_rate:.2%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Reporte de memoria por componente
+Carga los datasets, caches y modelos como lo hace el warm-up de la API y
+reporta cuánta memoria ocupa cada uno (ver src/infrastructure/memory_report.py).
+
+Uso:
+    python scripts/memory_report.py
+    python scripts/memory_report.py --tracemalloc --top 15
+    python scripts/memory_report.py --json memory.json
+
+Sirve para estimar la densidad de workers (RSS por proceso) y verificar el
+efecto de las optimizaciones de memoria comparando dos reportes JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def print_report(report: dict) -> None:
+    process = report.get('process', {})
+    print("\n" + "=" * 78)
+    print("REPORTE DE MEMORIA")
+    print("=" * 78)
+    print(f" PID {report['pid']}  RSS {process.get('rss_mb', '-')} MB  "
+          f"USS {process.get('uss_mb', '-')} MB  contabilizado {report['accounted_mb']} MB")
+    print(f"\n {'componente':42s} {'tipo':10s} {'MB':>10s}  detalle")
+    for entry in report['components']:
+        details = {
+            key: value for key, value in entry.items()
+            if key not in ('component', 'kind', 'bytes', 'mb')
+        }
+        detail = ', '.join(f"{key}={value}" for key, value in details.items())
+        print(f" {entry['component']:42s} {entry['kind']:10s} {entry['mb']:>10.3f}  {detail}")
+
+    traced = report.get('tracemalloc')
+    if traced:
+        print(f"\n tracemalloc: {traced['traced_mb']} MB (pico {traced['peak_mb']} MB)")
+        for stat in traced['top']:
+            print(f"   {stat['mb']:>9.3f} MB  {stat['blocks']:>8d} bloques  {stat['location']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Reporte de memoria por componente')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Trazar asignaciones durante la carga (más lento)')
+    parser.add_argument('--top', type=int, default=10, help='Sitios de asignación a mostrar con --tracemalloc')
+    parser.add_argument('--no-load', action='store_true', help='No ejecutar el warm-up antes de medir')
+    parser.add_argument('--json', type=Path, help='Guardar el reporte en JSON')
+    args = parser.parse_args()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    if not args.no_load:
+        from src.infrastructure.warmup import run_warmup
+        state = asyncio.run(run_warmup())
+        for step in state.steps:
+            if step.status != 'ok':
+                print(f" warm-up {step.name}: {step.status} {step.detail or ''}")
+
+    from src.infrastructure.memory_report import build_memory_report
+    report = build_memory_report(tracemalloc_top=args.top if args.tracemalloc else 0)
+    print_report(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+        print(f"\n Reporte guardado: {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
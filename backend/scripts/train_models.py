@@ -0,0 +1,74 @@
+"""
+Entrenamiento de modelos ML
+Entrena y guarda clustering, rating predictor y recommender system con
+ModelTrainer (ver src/ml/training/trainer.py).
+
+Uso:
+    python scripts/train_models.py
+    python scripts/train_models.py --search --n-jobs 8
+    python scripts/train_models.py --search --k 4 5 6 7 8 --n-estimators 100 200 --max-depth 10 16
+
+Con --search el k del clustering se elige por silhouette y el Random Forest
+por RMSE de validación cruzada, evaluando los candidatos en paralelo. Los
+folds ya ajustados se reutilizan entre corridas mientras los datos no cambien
+(cache en data/cache/training, desactivable con --no-cache).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _max_depth(value: str):
+    return None if value.lower() == 'none' else int(value)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Entrenamiento de modelos ML')
+    parser.add_argument('--data', type=Path,
+                        default=BACKEND_DIR / 'data' / 'processed' / 'restaurantes_sin_anomalias.csv')
+    parser.add_argument('--models-dir', type=Path, default=BACKEND_DIR / 'data' / 'models')
+    parser.add_argument('--search', action='store_true', help='Búsqueda paralela de k e hiperparámetros')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Procesos (-1 = todos los núcleos)')
+    parser.add_argument('--k', type=int, nargs='+', help='Valores de k a evaluar')
+    parser.add_argument('--n-estimators', type=int, nargs='+', help='Valores de n_estimators a evaluar')
+    parser.add_argument('--max-depth', type=_max_depth, nargs='+', help='Valores de max_depth ("none" = sin límite)')
+    parser.add_argument('--clustering-algorithm', choices=('auto', 'kmeans', 'minibatch'), default='auto',
+                        help='auto = MiniBatchKMeans en catálogos grandes')
+    parser.add_argument('--batch-size', type=int, default=4096, help='Tamaño de lote de MiniBatchKMeans')
+    parser.add_argument('--no-cache', action='store_true', help='No reutilizar folds de corridas anteriores')
+    parser.add_argument('--measure-memory', action='store_true',
+                        help='Registrar el pico de memoria del clustering (pasada extra con tracemalloc)')
+    args = parser.parse_args()
+
+    from src.ml.training.hyperparameter_search import DEFAULT_K_VALUES
+    from src.ml.training.trainer import ModelTrainer
+
+    trainer = ModelTrainer(
+        data_path=str(args.data),
+        models_dir=str(args.models_dir),
+        n_jobs=args.n_jobs,
+        cache_dir=None if args.no_cache else str(BACKEND_DIR / 'data' / 'cache' / 'training'),
+        clustering_algorithm=args.clustering_algorithm,
+        clustering_batch_size=args.batch_size,
+        measure_memory=args.measure_memory
+    )
+
+    param_grid = {}
+    if args.n_estimators:
+        param_grid['n_estimators'] = args.n_estimators
+    if args.max_depth:
+        param_grid['max_depth'] = args.max_depth
+
+    start = time.perf_counter()
+    trainer.train_all(search=args.search, k_values=args.k or DEFAULT_K_VALUES, param_grid=param_grid)
+    print(f"Tiempo total: {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,11 +22,14 @@ from .sentiment_dto import (
     SentimentAnalysisRequestDTO,
     SentimentAnalysisResponseDTO,
     RestaurantSentimentStatsDTO,
+    BulkSentimentStatsRequestDTO,
+    BulkSentimentStatsResponseDTO,
     BatchSentimentAnalysisRequestDTO,
     BatchSentimentAnalysisResponseDTO,
     SentimentComparisonRequestDTO,
     SentimentComparisonResponseDTO,
-    ReviewDTO
+    ReviewDTO,
+    ReviewPageDTO
 )
 
 __all__ = [
@@ -38,6 +41,7 @@ __all__ = [
     'SentimentAnalysisRequestDTO',
     'BatchSentimentAnalysisRequestDTO',
     'SentimentComparisonRequestDTO',
+    'BulkSentimentStatsRequestDTO',
 
     # Response DTOs
     'RestaurantDTO',
@@ -47,7 +51,9 @@ __all__ = [
     'AnalyticsResponseDTO',
     'SentimentAnalysisResponseDTO',
     'RestaurantSentimentStatsDTO',
+    'BulkSentimentStatsResponseDTO',
     'BatchSentimentAnalysisResponseDTO',
     'SentimentComparisonResponseDTO',
     'ReviewDTO',
+    'ReviewPageDTO',
 ]
\ No newline at end of file
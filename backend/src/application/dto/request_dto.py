@@ -23,6 +23,7 @@ class RecommendationRequestDTO(BaseModel):
     preferences: Dict = Field(default_factory=dict, description="Preferencias del usuario")
     filters: Dict = Field(default_factory=dict, description="Filtros de búsqueda")
     top_n: int = Field(default=5, ge=1, le=50, description="Número de recomendaciones")
+    include_sentiment: bool = Field(default=False, description="Incluir estadísticas de sentimientos de cada restaurante")
 
     class Config:
         json_schema_extra = {
@@ -38,7 +39,8 @@ class RecommendationRequestDTO(BaseModel):
                     "min_rating": 4.0,
                     "max_distance_km": 5.0
                 },
-                "top_n": 5
+                "top_n": 5,
+                "include_sentiment": False
             }
         }
 
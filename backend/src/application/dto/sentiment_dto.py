@@ -57,6 +57,12 @@ class ReviewDTO(BaseModel):
     confidence: Optional[float] = Field(None, description="Confianza del análisis")
 
 
+class ReviewPageDTO(BaseModel):
+    """DTO para una página de reseñas con paginación por cursor."""
+    reviews: List[ReviewDTO] = Field(..., description="Reseñas de la página")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la siguiente página (None si no hay más)")
+
+
 class RestaurantSentimentStatsDTO(BaseModel):
     """DTO para estadísticas de sentimientos de un restaurante."""
     restaurant_id: str = Field(..., description="ID del restaurante")
@@ -86,6 +92,27 @@ class RestaurantSentimentStatsDTO(BaseModel):
         }
 
 
+class BulkSentimentStatsRequestDTO(BaseModel):
+    """DTO para solicitar estadísticas de sentimientos de varios restaurantes."""
+    restaurant_ids: List[str] = Field(..., min_length=1, max_length=200, description="IDs de restaurantes (id_place)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "restaurant_ids": [
+                    "ChIJN1t_tDeuEmsRUsoyG83frY4",
+                    "ChIJI8tKKO63BZERfPTZdSvzPxI"
+                ]
+            }
+        }
+
+
+class BulkSentimentStatsResponseDTO(BaseModel):
+    """DTO para estadísticas de sentimientos de varios restaurantes."""
+    stats: Dict[str, RestaurantSentimentStatsDTO] = Field(..., description="Estadísticas por ID de restaurante")
+    not_found: List[str] = Field(default_factory=list, description="IDs sin reseñas")
+
+
 class BatchSentimentAnalysisRequestDTO(BaseModel):
     """DTO para análisis de sentimientos en lote."""
     comments: List[str] = Field(..., min_length=1, max_length=100, description="Lista de comentarios")
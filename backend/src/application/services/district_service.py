@@ -8,6 +8,7 @@ import logging
 
 from ..use_cases.district_use_cases import DistrictUseCases
 from ...domain.entities.district import District
+from ...shared.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +17,16 @@ class DistrictService:
     """
     Servicio de aplicación para la gestión de distritos
     Proporciona una interfaz de alto nivel para las operaciones con distritos
+
+    Las peticiones concurrentes idénticas (mismo método y parámetros
+    normalizados) comparten un único cálculo en vuelo (single-flight).
     """
 
-    def __init__(self, district_use_cases: DistrictUseCases):
+    def __init__(self,
+                 district_use_cases: DistrictUseCases,
+                 single_flight: Optional[SingleFlight] = None):
         self._district_use_cases = district_use_cases
+        self._single_flight = single_flight if single_flight is not None else SingleFlight()
 
     async def get_districts_for_dropdown(self) -> List[Dict[str, Any]]:
         """
@@ -31,6 +38,9 @@ class DistrictService:
         Raises:
             HTTPException: Si hay error al obtener los datos
         """
+        return await self._single_flight.do(('districts_dropdown',), self._get_districts_for_dropdown)
+
+    async def _get_districts_for_dropdown(self) -> List[Dict[str, Any]]:
         try:
             districts = await self._district_use_cases.get_all_districts_for_frontend()
 
@@ -69,6 +79,12 @@ class DistrictService:
         Raises:
             HTTPException: Si el distrito no existe o hay error en el procesamiento
         """
+        # Nombre normalizado una sola vez: la clave y la consulta usan el mismo
+        # valor, así las peticiones coalescidas reciben el mismo resultado
+        name = (district_name or '').strip().lower()
+        return await self._single_flight.do(('districts_info', name), lambda: self._get_district_info(name))
+
+    async def _get_district_info(self, district_name: str) -> Dict[str, Any]:
         try:
             district = await self._district_use_cases.get_district_details(district_name)
 
@@ -116,6 +132,18 @@ class DistrictService:
         Returns:
             Lista de distritos recomendados
         """
+        key = ('districts_recommended', bool(tourist_zone_only), float(min_rating), int(limit))
+        return await self._single_flight.do(
+            key,
+            lambda: self._get_recommended_districts(tourist_zone_only, min_rating, limit)
+        )
+
+    async def _get_recommended_districts(
+        self,
+        tourist_zone_only: bool,
+        min_rating: float,
+        limit: int
+    ) -> List[Dict[str, Any]]:
         try:
             preferences = {
                 'tourist_zone_only': tourist_zone_only,
@@ -169,6 +197,9 @@ class DistrictService:
         Returns:
             Diccionario con estadísticas de todos los distritos
         """
+        return await self._single_flight.do(('districts_statistics',), self._get_districts_statistics)
+
+    async def _get_districts_statistics(self) -> Dict[str, Any]:
         try:
             stats = await self._district_use_cases.get_district_statistics_summary()
 
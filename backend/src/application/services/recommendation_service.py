@@ -3,10 +3,12 @@ Recommendation Service
 Servicio de lógica de negocio para recomendaciones.
 """
 
+import time
 import numpy as np
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Optional, FrozenSet, Callable
 from src.domain import Restaurant, User, Recommendation
-from src.domain.repositories import RestaurantRepository
+from src.domain.repositories import RestaurantRepository, ReviewRepository
+from src.shared.instrumentation import stage
 from src.application.dto import (
  RecommendationRequestDTO,
  RecommendationResponseDTO,
@@ -15,10 +17,17 @@ from src.application.dto import (
 )
 
 
+# Peso del rating predicho (precalculado en el catálogo) al mezclarlo con stars
+PREDICTED_RATING_WEIGHT = 0.3
+
+
 def convert_numpy_types(obj: Any) -> Any:
     """
     Convierte recursivamente tipos de numpy a tipos nativos de Python.
     Esto resuelve el problema de serialización de Pydantic con tipos numpy.
+
+    El camino de recomendaciones ya no la necesita (los tipos son nativos en
+    origen); se conserva para datos que vengan directamente de pandas/numpy.
     """
     if isinstance(obj, np.integer):
         return int(obj)
@@ -42,7 +51,9 @@ class RecommendationService:
     def __init__(
         self,
         restaurant_repository: RestaurantRepository,
-        use_ml_models: bool = True
+        use_ml_models: bool = True,
+        review_repository: Optional[ReviewRepository] = None,
+        review_repository_provider: Optional[Callable[[], Optional[ReviewRepository]]] = None
     ):
         """
         Constructor con Dependency Injection.
@@ -50,9 +61,16 @@ class RecommendationService:
         Args:
             restaurant_repository: Repositorio de restaurantes (inyectado)
             use_ml_models: Si usar modelos ML (True) o algoritmo simple (False)
+            review_repository: Repositorio de reseñas para incluir
+                estadísticas de sentimientos (opcional)
+            review_repository_provider: Alternativa perezosa a
+                `review_repository`: solo se invoca si una petición pide
+                include_sentiment (None si no hay reseñas disponibles)
         """
         self.restaurant_repository = restaurant_repository
         self.use_ml_models = use_ml_models
+        self.review_repository = review_repository
+        self._review_repository_provider = review_repository_provider
 
         self.clustering_model = None
         self.rating_model = None
@@ -72,21 +90,24 @@ class RecommendationService:
 
                 if self.recommender_system:
                     import pandas as pd
-                    restaurants_df = pd.DataFrame([
-                        {
-                            'id_place': r.id,
-                            'title': r.title,
-                            'category': r.category,
-                            'address': r.address,
-                            'district': r.district,
-                            'lat': r.lat,
-                            'long': r.long,
-                            'stars': r.stars,
-                            'reviews': r.reviews
-                        }
-                        for r in self.restaurant_repository.find_all()
-                    ])
-                    self.recommender_system.set_restaurants_data(restaurants_df)
+                    with stage('recommendation.load_recommender_data'):
+                        restaurants_df = pd.DataFrame([
+                            {
+                                'id_place': r.id,
+                                'title': r.title,
+                                'category': r.category,
+                                'address': r.address,
+                                'district': r.district,
+                                'lat': r.lat,
+                                'long': r.long,
+                                'stars': r.stars,
+                                'reviews': r.reviews,
+                                'predicted_stars': r.predicted_stars,
+                                'cluster_id': r.cluster_id
+                            }
+                            for r in self.restaurant_repository.find_all()
+                        ])
+                        self.recommender_system.set_restaurants_data(restaurants_df)
 
                 models_loaded = sum([
                     self.clustering_model is not None,
@@ -113,8 +134,7 @@ class RecommendationService:
         Returns:
             RecommendationResponseDTO: Respuesta con recomendaciones
         """
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         user = User(
             user_id=f"temp_{int(time.time())}",
@@ -123,68 +143,110 @@ class RecommendationService:
             preferences=request.preferences
         )
 
-        candidates = self._filter_candidates(user, request.filters)
+        with stage('recommendation.filter_candidates'):
+            candidates = self._filter_candidates(user, request.filters)
+            reference_cluster = self._resolve_reference_cluster(user)
+            preferred_categories = self._preferred_categories(user, candidates)
 
-        recommendations = []
-        for restaurant in candidates:
-            score = self._calculate_recommendation_score(user, restaurant)
-            distance = self._calculate_distance(
-                user.location_lat,
-                user.location_long,
-                restaurant.lat,
-                restaurant.long
-            )
-            reason = self._generate_reason(restaurant, score, distance)
+        with stage('recommendation.scoring'):
+            recommendations = []
+            for restaurant in candidates:
+                score = self._calculate_recommendation_score(
+                    user, restaurant, reference_cluster, preferred_categories
+                )
+                distance = self._calculate_distance(
+                    user.location_lat,
+                    user.location_long,
+                    restaurant.lat,
+                    restaurant.long
+                )
+                reason = self._generate_reason(restaurant, score, distance)
 
-            recommendation = Recommendation(
-                restaurant=restaurant,
-                score=score,
-                distance_km=distance,
-                reason=reason
-            )
-            recommendations.append(recommendation)
+                recommendation = Recommendation(
+                    restaurant=restaurant,
+                    score=score,
+                    distance_km=distance,
+                    reason=reason
+                )
+                recommendations.append(recommendation)
 
-        recommendations.sort(key=lambda x: x.score, reverse=True)
-        top_recommendations = recommendations[:request.top_n]
+        with stage('recommendation.top_n'):
+            recommendations.sort(key=lambda x: x.score, reverse=True)
+            top_recommendations = recommendations[:request.top_n]
+
+        with stage('recommendation.build_dto'):
+            recommendation_items = [
+                self._to_recommendation_item_dto(rec)
+                for rec in top_recommendations
+            ]
+
+        metadata = {
+            'candidates_evaluated': len(candidates),
+            'user_location': {
+                'lat': user.location_lat,
+                'long': user.location_long
+            }
+        }
 
-        recommendation_items = [
-            self._to_recommendation_item_dto(rec)
-            for rec in top_recommendations
-        ]
+        if request.include_sentiment:
+            with stage('recommendation.sentiment_stats'):
+                metadata['sentiment_included'] = self._attach_sentiment_stats(recommendation_items)
 
-        execution_time = int((time.time() - start_time) * 1000)
+        execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-        return RecommendationResponseDTO(
+        return RecommendationResponseDTO.model_construct(
             recommendations=recommendation_items,
             total_found=len(recommendation_items),
             execution_time_ms=execution_time,
-            metadata={
-                'candidates_evaluated': len(candidates),
-                'user_location': {
-                    'lat': user.location_lat,
-                    'long': user.location_long
-                }
-            }
+            metadata=metadata
         )
 
+    def _attach_sentiment_stats(self, items: List[RecommendationItemDTO]) -> bool:
+        """
+        Agregar estadísticas de sentimientos a details['sentiment'] de cada item.
+
+        Se consultan todos los restaurantes de la respuesta en una sola
+        llamada al repositorio. Retorna False si no hay reseñas disponibles.
+        """
+        if not items:
+            return False
+
+        if self.review_repository is None and self._review_repository_provider is not None:
+            self.review_repository = self._review_repository_provider()
+            self._review_repository_provider = None
+        if self.review_repository is None:
+            return False
+
+        try:
+            stats = self.review_repository.get_sentiment_stats_bulk(
+                [item.restaurant.id for item in items]
+            )
+        except Exception as e:
+            print(f"Error obteniendo estadísticas de sentimientos: {e}")
+            return False
+
+        for item in items:
+            restaurant_stats = stats.get(item.restaurant.id)
+            item.details['sentiment'] = restaurant_stats if restaurant_stats and restaurant_stats['total'] else None
+
+        return True
+
     def _filter_candidates(
         self,
         user: User,
         filters: Dict
     ) -> List[Restaurant]:
-        """Filtra restaurantes candidatos según preferencias y filtros."""
-        candidates = self.restaurant_repository.find_all()
-
-        if user.preferred_category:
-            preferred = user.preferred_category.lower()
-            candidates = [
-                r for r in candidates
-                if preferred in r.category.lower() or r.category.lower() in preferred
-            ]
+        """
+        Filtra restaurantes candidatos según preferencias y filtros.
 
-        min_rating = filters.get('min_rating', user.min_rating)
-        if min_rating:
-            candidates = [r for r in candidates if r.stars >= min_rating]
+        Categoría, distrito y rating mínimo se resuelven en el repositorio
+        (comparación de códigos enteros); la distancia depende del usuario.
+        """
+        candidates = self.restaurant_repository.find_matching(
+            category=user.preferred_category,
+            district=filters.get('district'),
+            min_rating=filters.get('min_rating', user.min_rating)
+        )
 
         max_distance = filters.get('max_distance_km', user.max_distance_km)
         if max_distance:
@@ -198,25 +260,88 @@ class RecommendationService:
                 ) <= max_distance
             ]
 
-        district = filters.get('district')
-        if district:
-            candidates = [
-                r for r in candidates
-                if r.district.lower() == district.lower()
-            ]
-
         return candidates
 
+    @staticmethod
+    def _preferred_categories(user: User, candidates: List[Restaurant]) -> FrozenSet[str]:
+        """
+        Categorías (tal como están en el catálogo) iguales a la preferida sin
+        distinguir mayúsculas. Se normaliza una vez por categoría distinta,
+        no por candidato.
+        """
+        if not user.preferred_category:
+            return frozenset()
+        preferred = user.preferred_category.lower()
+        return frozenset(
+            category for category in {r.category for r in candidates}
+            if category.lower() == preferred
+        )
+
+    def _resolve_reference_cluster(self, user: User) -> Optional[int]:
+        """
+        Obtiene el cluster de referencia del usuario a partir de sus preferencias.
+
+        Acepta 'cluster_id' directamente o 'similar_to' (ID de un restaurante
+        cuyo cluster precalculado se usa como referencia).
+
+        Raises:
+            ValueError: Si 'cluster_id' no es un entero no negativo (400)
+        """
+        if not self.use_ml_models:
+            return None
+
+        cluster_id = user.get_preference('cluster_id')
+        if cluster_id is not None:
+            return self._parse_cluster_id(cluster_id)
+
+        similar_to = user.get_preference('similar_to')
+        if similar_to:
+            reference = self.restaurant_repository.find_by_id(str(similar_to))
+            if reference is not None:
+                return reference.cluster_id
+
+        return None
+
+    @staticmethod
+    def _parse_cluster_id(value: Any) -> int:
+        """Validar preferences['cluster_id']: entero no negativo (o su texto)."""
+        if isinstance(value, bool):
+            cluster_id = None
+        elif isinstance(value, int):
+            cluster_id = value
+        elif isinstance(value, float) and value.is_integer():
+            cluster_id = int(value)
+        elif isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+            cluster_id = int(value.strip())
+        else:
+            cluster_id = None
+
+        if cluster_id is None or cluster_id < 0:
+            raise ValueError(f"preferences.cluster_id debe ser un entero no negativo, se recibió {value!r}")
+        return cluster_id
+
     def _calculate_recommendation_score(
         self,
         user: User,
-        restaurant: Restaurant
+        restaurant: Restaurant,
+        reference_cluster: Optional[int] = None,
+        preferred_categories: Optional[FrozenSet[str]] = None
     ) -> float:
         """
         Calcula el score de recomendación (0.0 - 1.0).
         Formula: Rating (40%) + Popularidad (30%) + Cercanía (20%) + Categoría (10%)
+
+        Con modelos ML, el rating mezcla stars con predicted_stars y, si hay
+        un cluster de referencia, se usan los pesos del RestaurantRecommenderSystem:
+        Rating (35%) + Popularidad (25%) + Cercanía (20%) + Cluster (15%) + Categoría (5%)
         """
-        rating_score = float(restaurant.stars) / 5.0
+        stars = float(restaurant.stars)
+        if self.use_ml_models and restaurant.predicted_stars is not None:
+            stars = (
+                stars * (1.0 - PREDICTED_RATING_WEIGHT) +
+                float(restaurant.predicted_stars) * PREDICTED_RATING_WEIGHT
+            )
+        rating_score = stars / 5.0
         popularity_score = min(float(np.log10(restaurant.reviews + 1)) / 3.0, 1.0)
 
         distance = self._calculate_distance(
@@ -227,17 +352,26 @@ class RecommendationService:
         )
         distance_score = max(0.0, 1.0 - (float(distance) / 10.0))
 
-        category_score = 1.0 if (
-            user.preferred_category and
-            restaurant.category.lower() == user.preferred_category.lower()
-        ) else 0.5
-
-        final_score = (
-            rating_score * 0.4 +
-            popularity_score * 0.3 +
-            distance_score * 0.2 +
-            category_score * 0.1
-        )
+        if preferred_categories is None:
+            preferred_categories = self._preferred_categories(user, [restaurant])
+        category_score = 1.0 if restaurant.category in preferred_categories else 0.5
+
+        if reference_cluster is not None:
+            cluster_score = 1.0 if restaurant.cluster_id == reference_cluster else 0.5
+            final_score = (
+                rating_score * 0.35 +
+                popularity_score * 0.25 +
+                distance_score * 0.20 +
+                cluster_score * 0.15 +
+                category_score * 0.05
+            )
+        else:
+            final_score = (
+                rating_score * 0.4 +
+                popularity_score * 0.3 +
+                distance_score * 0.2 +
+                category_score * 0.1
+            )
 
         return round(float(final_score), 3)
 
@@ -289,35 +423,39 @@ class RecommendationService:
         self,
         recommendation: Recommendation
     ) -> RecommendationItemDTO:
-        """Convierte Recommendation entity a DTO."""
-        restaurant = recommendation.restaurant
+        """
+        Convierte Recommendation entity a DTO.
 
-        # Aplicar conversión de numpy types a tipos nativos
-        restaurant_data = {
-            'id': convert_numpy_types(restaurant.id),
-            'name': convert_numpy_types(restaurant.title),
-            'category': convert_numpy_types(restaurant.category),
-            'rating': convert_numpy_types(restaurant.stars),
-            'reviews': convert_numpy_types(restaurant.reviews),
-            'distance_km': convert_numpy_types(recommendation.distance_km),
-            'address': convert_numpy_types(restaurant.address),
-            'district': convert_numpy_types(restaurant.district),
-            'phone': convert_numpy_types(restaurant.phone_number),
-            'url': convert_numpy_types(restaurant.url)
-        }
+        Los campos ya son tipos nativos de Python (el repositorio convierte
+        al cargar y los scores/distancias se calculan con float()), por lo
+        que los DTOs se construyen sin re-validación (model_construct).
+        """
+        restaurant = recommendation.restaurant
 
-        restaurant_dto = RestaurantDTO(**restaurant_data)
+        restaurant_dto = RestaurantDTO.model_construct(
+            id=restaurant.id,
+            name=restaurant.title,
+            category=restaurant.category,
+            rating=restaurant.stars,
+            reviews=restaurant.reviews,
+            distance_km=recommendation.distance_km,
+            address=restaurant.address,
+            district=restaurant.district,
+            phone=restaurant.phone_number,
+            url=restaurant.url
+        )
 
-        # También convertir los valores del details dict
         details_data = {
-            'is_highly_rated': convert_numpy_types(restaurant.is_highly_rated),
-            'is_popular': convert_numpy_types(restaurant.is_popular),
-            'is_nearby': convert_numpy_types(recommendation.is_nearby)
+            'is_highly_rated': restaurant.is_highly_rated,
+            'is_popular': restaurant.is_popular,
+            'is_nearby': recommendation.is_nearby,
+            'predicted_stars': restaurant.predicted_stars,
+            'cluster_id': restaurant.cluster_id
         }
 
-        return RecommendationItemDTO(
+        return RecommendationItemDTO.model_construct(
             restaurant=restaurant_dto,
-            score=convert_numpy_types(recommendation.score),
-            reason=convert_numpy_types(recommendation.reason),
+            score=recommendation.score,
+            reason=recommendation.reason,
             details=details_data
         )
@@ -0,0 +1,183 @@
+"""
+Sentiment Micro-Batcher
+Agrupa peticiones concurrentes de análisis de sentimiento en lotes.
+
+Bajo concurrencia, cada POST /sentiment/analyze pagaría por separado la
+transformación TF-IDF y predict_proba. El batcher encola los comentarios,
+espera hasta `max_batch_size` elementos o `max_wait_ms` milisegundos, puntúa
+el lote con una sola llamada a `predict_batch` y resuelve el future de cada
+llamador con su propio resultado.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.ml.models import SentimentAnalysisModel
+
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 5.0
+
+# Ventana de muestras para percentiles de tamaño de lote y tiempo en cola
+METRICS_WINDOW = 1024
+
+
+class SentimentMicroBatcher:
+    """
+    Micro-batcher asíncrono delante de SentimentAnalysisModel.
+
+    El worker se crea en el primer `predict()` dentro del event loop activo
+    (y se recrea si el loop cambia, p. ej. entre TestClients).
+    """
+
+    def __init__(
+        self,
+        sentiment_model: 'SentimentAnalysisModel',
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS
+    ):
+        """
+        Args:
+            sentiment_model: Modelo entrenado (debe exponer predict_batch)
+            max_batch_size: Máximo de comentarios por lote
+            max_wait_ms: Máxima espera para completar un lote (ms)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser >= 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms no puede ser negativo")
+
+        self.sentiment_model = sentiment_model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Métricas
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._batch_sizes: Deque[int] = deque(maxlen=METRICS_WINDOW)
+        self._queue_times_ms: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    @classmethod
+    def from_env(cls, sentiment_model: 'SentimentAnalysisModel') -> 'SentimentMicroBatcher':
+        """
+        Crear el batcher con la configuración de las variables de entorno:
+
+        - SENTIMENT_BATCH_MAX_SIZE (por defecto 32)
+        - SENTIMENT_BATCH_MAX_WAIT_MS (por defecto 5)
+        """
+        return cls(
+            sentiment_model,
+            max_batch_size=int(os.getenv('SENTIMENT_BATCH_MAX_SIZE', DEFAULT_MAX_BATCH_SIZE)),
+            max_wait_ms=float(os.getenv('SENTIMENT_BATCH_MAX_WAIT_MS', DEFAULT_MAX_WAIT_MS))
+        )
+
+    async def predict(self, text: str) -> Dict[str, Any]:
+        """
+        Encolar un comentario y esperar su predicción.
+
+        Args:
+            text: Comentario a analizar
+
+        Returns:
+            Mismo diccionario que SentimentAnalysisModel.predict_single
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, time.perf_counter(), future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Worker: arma lotes y los puntúa fuera del event loop."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._score(batch)
+
+    async def _score(self, batch: List[Tuple[str, float, asyncio.Future]]) -> None:
+        started = time.perf_counter()
+        texts = [text for text, _, _ in batch]
+
+        self._batches += 1
+        self._items += len(batch)
+        self._batch_sizes.append(len(batch))
+        self._queue_times_ms.extend((started - enqueued) * 1000 for _, enqueued, _ in batch)
+
+        try:
+            # predict_batch es CPU-bound: se ejecuta en un thread para que el
+            # loop siga aceptando peticiones y llenando el siguiente lote
+            results = await self._loop.run_in_executor(
+                None, self.sentiment_model.predict_batch, texts
+            )
+        except Exception as e:
+            self._errors += 1
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Métricas del batcher: configuración, lotes procesados, tamaño de lote
+        y tiempo en cola (ms) sobre las últimas muestras.
+        """
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'batches': self._batches,
+            'items': self._items,
+            'errors': self._errors,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'batch_size': _summary(self._batch_sizes),
+            'queue_time_ms': _summary(self._queue_times_ms)
+        }
+
+
+def _summary(samples) -> Dict[str, float]:
+    """Media y percentiles (p50/p95/p99/max) de una ventana de muestras."""
+    if not samples:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def percentile(q: float) -> float:
+        return round(float(ordered[min(last, int(round(q * last)))]), 3)
+
+    return {
+        'mean': round(sum(ordered) / len(ordered), 3),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'max': round(float(ordered[-1]), 3)
+    }
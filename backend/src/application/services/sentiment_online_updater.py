@@ -0,0 +1,206 @@
+"""
+Sentiment Online Updater
+Actualización incremental del modelo de sentimientos con reseñas nuevas.
+
+Cada reseña nueva que guarda el repositorio se etiqueta con su rating
+(Sentiment.from_rating: la misma regla que el corpus de entrenamiento, nunca
+la predicción del propio modelo) y se encola. Un thread en segundo plano
+aplica la cola en lotes con `SentimentAnalysisModel.partial_update` cuando se
+juntan `batch_size` reseñas o pasan `flush_interval_s` segundos, sin
+reprocesar el corpus completo.
+
+Se activa con SENTIMENT_ONLINE_UPDATES=true (apagado por defecto).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TYPE_CHECKING
+
+from src.domain.entities import Review, Sentiment
+
+if TYPE_CHECKING:
+    from src.ml.models import SentimentAnalysisModel
+
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL_S = 30.0
+
+# Reseñas pendientes como máximo; al llenarse se descartan las más antiguas
+DEFAULT_MAX_PENDING = 10000
+
+
+def online_updates_enabled() -> bool:
+    return os.getenv('SENTIMENT_ONLINE_UPDATES', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+class SentimentOnlineUpdater:
+    """
+    Job en segundo plano que incorpora reseñas nuevas al modelo de sentimientos.
+
+    El modelo se resuelve con `model_provider` en el primer lote (registrar el
+    updater no fuerza su carga). El thread se crea con la primera reseña.
+    """
+
+    def __init__(
+        self,
+        model_provider: Callable[[], 'SentimentAnalysisModel'],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        save_path: Optional[str] = None
+    ):
+        """
+        Args:
+            model_provider: Devuelve el modelo entrenado a actualizar
+            batch_size: Reseñas por lote de partial_update
+            flush_interval_s: Máxima espera antes de aplicar un lote incompleto
+            max_pending: Tope de la cola de reseñas pendientes
+            save_path: Si se indica, el modelo se guarda tras cada lote
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser >= 1")
+        if flush_interval_s <= 0:
+            raise ValueError("flush_interval_s debe ser positivo")
+
+        self.model_provider = model_provider
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.save_path = save_path
+
+        self._pending: Deque[Tuple[str, str]] = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Métricas
+        self._submitted = 0
+        self._skipped = 0
+        self._dropped = 0
+        self._batches = 0
+        self._applied = 0
+        self._errors = 0
+        self._last_error: Optional[str] = None
+        self._last_update: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_env(cls, model_provider: Callable[[], 'SentimentAnalysisModel']) -> 'SentimentOnlineUpdater':
+        """
+        Crear el updater con la configuración de las variables de entorno:
+
+        - SENTIMENT_ONLINE_BATCH_SIZE (por defecto 64)
+        - SENTIMENT_ONLINE_FLUSH_S (por defecto 30)
+        - SENTIMENT_ONLINE_SAVE_PATH (por defecto no se guarda en disco)
+        """
+        return cls(
+            model_provider,
+            batch_size=int(os.getenv('SENTIMENT_ONLINE_BATCH_SIZE', DEFAULT_BATCH_SIZE)),
+            flush_interval_s=float(os.getenv('SENTIMENT_ONLINE_FLUSH_S', DEFAULT_FLUSH_INTERVAL_S)),
+            save_path=os.getenv('SENTIMENT_ONLINE_SAVE_PATH') or None
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, review: Review) -> bool:
+        """
+        Encolar una reseña nueva (listener del repositorio; no bloquea).
+
+        Returns:
+            False si la reseña no sirve para entrenar (sin comentario o
+            rating fuera de rango)
+        """
+        comment = review.comment
+        if not isinstance(comment, str) or not comment.strip() or not 1 <= review.rating <= 5:
+            self._skipped += 1
+            return False
+
+        label = Sentiment.from_rating(review.rating).value
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append((comment, label))
+            self._submitted += 1
+            full = len(self._pending) >= self.batch_size
+
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Aplicar ya las reseñas pendientes (en el thread que llama)."""
+        with self._apply_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return None
+
+            texts = [text for text, _ in batch]
+            labels = [label for _, label in batch]
+            try:
+                model = self.model_provider()
+                result = model.partial_update(texts, labels)
+                if self.save_path:
+                    model.save(self.save_path)
+            except Exception as e:
+                self._errors += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                print(f" Actualización incremental de sentimientos fallida: {self._last_error}")
+                return None
+
+            self._batches += 1
+            self._applied += len(batch)
+            self._last_update = {**result, 'timestamp': time.time()}
+            return result
+
+    def close(self, flush: bool = True) -> None:
+        """Detener el thread (aplicando antes lo pendiente si `flush`)."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self.running or self._stop.is_set():
+            return
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name='sentiment-online-updater', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval_s)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            self.flush()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas del job: reseñas recibidas/aplicadas, lotes y último error."""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'running': self.running,
+            'batch_size': self.batch_size,
+            'flush_interval_s': self.flush_interval_s,
+            'pending': pending,
+            'submitted': self._submitted,
+            'skipped': self._skipped,
+            'dropped': self._dropped,
+            'batches': self._batches,
+            'applied': self._applied,
+            'errors': self._errors,
+            'last_error': self._last_error,
+            'last_update': self._last_update,
+        }
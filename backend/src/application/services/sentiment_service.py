@@ -3,11 +3,19 @@ Sentiment Analysis Service
 Servicio de lógica de negocio para análisis de sentimientos.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, AsyncIterable, AsyncIterator, Iterator, TYPE_CHECKING
 
 from src.domain.entities import Review, Sentiment
 from src.domain.repositories import ReviewRepository
-from src.ml.models import SentimentAnalysisModel
+
+# Comentarios por llamada vectorizada al modelo en el análisis en streaming
+STREAM_CHUNK_SIZE = 1000
+
+if TYPE_CHECKING:
+    from src.ml.models import SentimentAnalysisModel
+    from src.application.services.sentiment_batcher import SentimentMicroBatcher
+    from src.shared.single_flight import SingleFlight
 
 
 def get_confidence_level(confidence: float) -> str:
@@ -46,7 +54,9 @@ class SentimentAnalysisService:
     def __init__(
         self,
         review_repository: ReviewRepository,
-        sentiment_model: Optional[SentimentAnalysisModel] = None
+        sentiment_model: Optional['SentimentAnalysisModel'] = None,
+        batcher: Optional['SentimentMicroBatcher'] = None,
+        single_flight: Optional['SingleFlight'] = None
     ):
         """
         Constructor con Dependency Injection.
@@ -54,9 +64,13 @@ class SentimentAnalysisService:
         Args:
             review_repository: Repositorio de reseñas (inyectado)
             sentiment_model: Modelo ML de sentimientos (opcional)
+            batcher: Micro-batcher para peticiones concurrentes (opcional)
+            single_flight: Coalescencia de consultas idénticas en vuelo (opcional)
         """
         self.review_repository = review_repository
         self.sentiment_model = sentiment_model
+        self.batcher = batcher
+        self.single_flight = single_flight
 
     def analyze_comment(self, comment: str) -> Dict[str, Any]:
         """
@@ -74,6 +88,121 @@ class SentimentAnalysisService:
         # Predecir sentimiento
         result = self.sentiment_model.predict_single(comment)
 
+        return self._to_analysis(result)
+
+    async def analyze_comment_async(self, comment: str) -> Dict[str, Any]:
+        """
+        Analizar un comentario pasando por el micro-batcher si está configurado.
+
+        Args:
+            comment: Texto del comentario
+
+        Returns:
+            Diccionario con el análisis de sentimiento
+        """
+        if self.batcher is None:
+            return self.analyze_comment(comment)
+
+        if not self.sentiment_model or not self.sentiment_model.is_trained:
+            raise ValueError("El modelo de sentimientos no está disponible o entrenado")
+
+        result = await self.batcher.predict(comment)
+
+        return self._to_analysis(result)
+
+    def analyze_comments(self, comments: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analizar varios comentarios con una sola predicción en lote.
+
+        Args:
+            comments: Lista de comentarios
+
+        Returns:
+            Lista de análisis, en el mismo orden
+        """
+        if not self.sentiment_model or not self.sentiment_model.is_trained:
+            raise ValueError("El modelo de sentimientos no está disponible o entrenado")
+
+        results = self.sentiment_model.predict_batch(comments)
+
+        return [self._to_analysis(result) for result in results]
+
+    async def analyze_stream(
+        self,
+        items: AsyncIterable[Dict[str, Any]],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        echo_comment: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analizar un stream de comentarios de tamaño arbitrario.
+
+        Los comentarios se puntúan en bloques de `chunk_size` (una predicción
+        vectorizada por bloque, fuera del event loop) y los resultados se
+        emiten a medida que se calculan; la memoria queda acotada por el
+        tamaño del bloque. Al final se emite el resumen acumulado.
+
+        Args:
+            items: Registros {'index', 'comment', 'id'?} o {'index', 'error'}
+            chunk_size: Comentarios por bloque
+            echo_comment: Incluir el comentario original en cada resultado
+
+        Yields:
+            Un registro por comentario ({'index', 'sentiment', ...} o
+            {'index', 'error'}) y finalmente {'summary', 'total', 'errors'}
+        """
+        if not self.sentiment_model or not self.sentiment_model.is_trained:
+            raise ValueError("El modelo de sentimientos no está disponible o entrenado")
+
+        summary = {"positivo": 0, "neutro": 0, "negativo": 0}
+        analyzed = 0
+        errors = 0
+        chunk: List[Dict[str, Any]] = []
+
+        async def score(pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                None, self.sentiment_model.predict_batch, [item['comment'] for item in pending]
+            )
+            records = []
+            for item, result in zip(pending, results):
+                summary[result['sentiment']] = summary.get(result['sentiment'], 0) + 1
+                record = {'index': item['index']}
+                if item.get('id') is not None:
+                    record['id'] = item['id']
+                if echo_comment:
+                    record['comment'] = item['comment']
+                record.update({
+                    'sentiment': result['sentiment'],
+                    'confidence': result['confidence'],
+                    'confidence_level': get_confidence_level(result['confidence']),
+                    'probabilities': result['probabilities']
+                })
+                records.append(record)
+            return records
+
+        async for item in items:
+            if 'error' in item:
+                errors += 1
+                yield item
+                continue
+
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                for record in await score(chunk):
+                    yield record
+                analyzed += len(chunk)
+                chunk = []
+
+        if chunk:
+            for record in await score(chunk):
+                yield record
+            analyzed += len(chunk)
+
+        yield {'summary': summary, 'total': analyzed, 'errors': errors}
+
+    @staticmethod
+    def _to_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convierte una predicción del modelo al formato del servicio."""
         # Calcular nivel de confiabilidad
         confidence_level = get_confidence_level(result['confidence'])
 
@@ -171,6 +300,48 @@ class SentimentAnalysisService:
         """
         return self.review_repository.get_sentiment_stats(restaurant_id)
 
+    async def get_sentiment_statistics_async(self, restaurant_id: str) -> Dict[str, Any]:
+        """
+        Estadísticas de sentimientos calculadas fuera del event loop.
+
+        Las peticiones concurrentes para el mismo restaurante comparten un
+        único cálculo si el servicio tiene single-flight configurado.
+        """
+        if self.single_flight is None:
+            return self.get_sentiment_statistics(restaurant_id)
+
+        # El índice por ID es exacto: clave y argumento usan el mismo ID
+        rid = restaurant_id.strip()
+        return await self.single_flight.run_in_executor(
+            ('sentiment_stats', rid),
+            self.get_sentiment_statistics,
+            rid
+        )
+
+    def get_sentiment_statistics_bulk(self, restaurant_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Estadísticas de sentimientos de varios restaurantes en una sola pasada.
+
+        Args:
+            restaurant_ids: IDs de restaurantes (se ignoran duplicados)
+
+        Returns:
+            Diccionario id -> estadísticas (total 0 si no tiene reseñas)
+        """
+        unique_ids = list(dict.fromkeys(rid.strip() for rid in restaurant_ids if rid and rid.strip()))
+        return self.review_repository.get_sentiment_stats_bulk(unique_ids)
+
+    async def get_sentiment_statistics_bulk_async(self, restaurant_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Versión de get_sentiment_statistics_bulk ejecutada fuera del event loop."""
+        if self.single_flight is None:
+            return self.get_sentiment_statistics_bulk(restaurant_ids)
+
+        return await self.single_flight.run_in_executor(
+            ('sentiment_stats_bulk', tuple(sorted(set(restaurant_ids)))),
+            self.get_sentiment_statistics_bulk,
+            restaurant_ids
+        )
+
     def get_reviews_by_sentiment(
         self,
         restaurant_id: str,
@@ -188,31 +359,83 @@ class SentimentAnalysisService:
         Returns:
             Lista de reseñas
         """
-        # Validar sentimiento
-        if sentiment not in ['positivo', 'neutro', 'negativo']:
+        self._validate_sentiment(sentiment)
+        reviews, _ = self.review_repository.find_page(
+            restaurant_id=restaurant_id,
+            sentiment=sentiment,
+            limit=limit
+        )
+        return [self._review_to_dict(review) for review in reviews]
+
+    @staticmethod
+    def _validate_sentiment(sentiment: Optional[str]) -> None:
+        if sentiment is not None and sentiment not in ['positivo', 'neutro', 'negativo']:
             raise ValueError(f"Sentimiento inválido: {sentiment}")
 
-        # Obtener todas las reseñas del restaurante
-        reviews = self.review_repository.find_by_restaurant(restaurant_id)
+    @staticmethod
+    def _review_to_dict(review: Review) -> Dict[str, Any]:
+        return {
+            'id': review.id,
+            'comment': review.comment,
+            'rating': review.rating,
+            'username': review.username,
+            'date': review.review_date.isoformat() if review.review_date else None,
+            'sentiment': review.sentiment.value if review.sentiment else None,
+            'confidence': review.sentiment_confidence
+        }
 
-        # Filtrar por sentimiento
-        filtered_reviews = [
-            r for r in reviews
-            if r.sentiment and r.sentiment.value == sentiment
-        ][:limit]
+    def get_reviews_page(
+        self,
+        restaurant_id: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Página de reseñas con paginación por cursor.
 
-        return [
-            {
-                'id': review.id,
-                'comment': review.comment,
-                'rating': review.rating,
-                'username': review.username,
-                'date': review.review_date.isoformat() if review.review_date else None,
-                'sentiment': review.sentiment.value if review.sentiment else None,
-                'confidence': review.sentiment_confidence
-            }
-            for review in filtered_reviews
-        ]
+        Args:
+            restaurant_id: Filtrar por restaurante (opcional)
+            sentiment: Filtrar por sentimiento (opcional)
+            cursor: Cursor opaco devuelto por la página anterior
+            limit: Tamaño de página
+
+        Returns:
+            {'reviews': [...], 'next_cursor': str o None}
+
+        Raises:
+            ValueError: Sentimiento o cursor inválidos
+        """
+        self._validate_sentiment(sentiment)
+        reviews, next_cursor = self.review_repository.find_page(
+            restaurant_id=restaurant_id,
+            sentiment=sentiment,
+            cursor=cursor,
+            limit=limit
+        )
+        return {
+            'reviews': [self._review_to_dict(review) for review in reviews],
+            'next_cursor': next_cursor
+        }
+
+    def export_reviews(
+        self,
+        restaurant_id: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorrer reseñas en bloques para exportación.
+
+        Solo hay un bloque en memoria a la vez; el consumidor lo serializa
+        y lo envía antes de pedir el siguiente.
+        """
+        self._validate_sentiment(sentiment)
+        return self.review_repository.iter_records(
+            restaurant_id=restaurant_id,
+            sentiment=sentiment,
+            chunk_size=chunk_size
+        )
 
     def get_top_positive_reviews(self, restaurant_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Obtener las reseñas más positivas de un restaurante"""
@@ -66,12 +66,12 @@ class DistrictUseCases:
         Returns:
             Lista de distritos recomendados
         """
-        all_districts = await self._district_repository.get_districts_with_statistics()
-
         # Si no hay preferencias, retornar los más populares
         if not user_preferences:
             return await self._district_repository.get_popular_districts()
 
+        all_districts = await self._district_repository.get_districts_with_statistics()
+
         filtered_districts = []
         min_rating = user_preferences.get('min_rating', 0)
         tourist_only = user_preferences.get('tourist_zone_only', False)
@@ -3,16 +3,20 @@ Domain Entity: Restaurant
 Representa un restaurante en el sistema.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, InitVar
 from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Restaurant:
     """
     Entidad Restaurant - Equivalente a @Entity en Spring Boot
     Representa un restaurante con toda su información.
+
+    Usa __slots__ (sin __dict__ por instancia): el catálogo completo se
+    materializa en memoria. Los repositorios que cargan datos ya validados
+    pasan `validate=False` y un `created_at` común a toda la carga.
     """
 
     # Identificación
@@ -39,16 +43,24 @@ class Restaurant:
     url_place: Optional[str] = None
     domain: Optional[str] = None
 
+    # Enriquecimiento ML (precalculado al cargar el catálogo)
+    predicted_stars: Optional[float] = None
+    cluster_id: Optional[int] = None
+
     # Metadata
     created_at: datetime = None
 
-    def __post_init__(self):
+    # Carga confiable desde un repositorio (no es un atributo)
+    validate: InitVar[bool] = True
+
+    def __post_init__(self, validate: bool):
         """Validaciones de negocio"""
-        if self.stars < 0 or self.stars > 5:
-            raise ValueError(f"Stars must be between 0 and 5, got {self.stars}")
+        if validate:
+            if self.stars < 0 or self.stars > 5:
+                raise ValueError(f"Stars must be between 0 and 5, got {self.stars}")
 
-        if self.reviews < 0:
-            raise ValueError(f"Reviews cannot be negative, got {self.reviews}")
+            if self.reviews < 0:
+                raise ValueError(f"Reviews cannot be negative, got {self.reviews}")
 
         if self.created_at is None:
             self.created_at = datetime.now()
@@ -3,7 +3,7 @@ Domain Entity: Review
 Representa una reseña de un restaurante con análisis de sentimiento.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, InitVar
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -15,12 +15,24 @@ class Sentiment(str, Enum):
     NEUTRAL = "neutro"
     NEGATIVE = "negativo"
 
+    @classmethod
+    def from_rating(cls, rating: int) -> 'Sentiment':
+        """Etiqueta derivada del rating (4-5 positivo, 3 neutro, 1-2 negativo)"""
+        if rating >= 4:
+            return cls.POSITIVE
+        if rating == 3:
+            return cls.NEUTRAL
+        return cls.NEGATIVE
 
-@dataclass
+
+@dataclass(slots=True)
 class Review:
     """
     Entidad Review que representa una reseña de restaurante.
     Incluye análisis de sentimiento calculado por ML.
+
+    Usa __slots__ (sin __dict__ por instancia). Los repositorios que cargan
+    datos ya validados pasan `validate=False`.
     """
 
     # Identificación
@@ -45,8 +57,14 @@ class Review:
     # Metadata
     processed_comment: Optional[str] = None
 
-    def __post_init__(self):
+    # Carga confiable desde un repositorio (no es un atributo)
+    validate: InitVar[bool] = True
+
+    def __post_init__(self, validate: bool):
         """Validaciones de negocio"""
+        if not validate:
+            return
+
         if not 1 <= self.rating <= 5:
             raise ValueError(f"Rating must be between 1 and 5, got {self.rating}")
 
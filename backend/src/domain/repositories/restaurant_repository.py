@@ -27,6 +27,23 @@ class RestaurantRepository(ABC):
     def find_by_category(self, category: str) -> List[Restaurant]:
         pass
 
+    @abstractmethod
+    def find_matching(
+        self,
+        category: Optional[str] = None,
+        district: Optional[str] = None,
+        min_rating: Optional[float] = None
+    ) -> List[Restaurant]:
+        """
+        Restaurantes que cumplen todos los filtros indicados.
+
+        - category: coincidencia parcial sin distinguir mayúsculas en ambos
+          sentidos ("pizza" coincide con "Pizzería" y viceversa)
+        - district: nombre exacto sin distinguir mayúsculas
+        - min_rating: stars mínimo
+        """
+        pass
+
     @abstractmethod
     def find_nearby(self, lat: float, long: float, radius_km: float) -> List[Restaurant]:
         pass
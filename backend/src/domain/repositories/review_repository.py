@@ -4,7 +4,7 @@ Define el contrato para acceder a las reseñas.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from src.domain.entities import Review
 
 
@@ -34,6 +34,32 @@ class ReviewRepository(ABC):
         """Obtener todas las reseñas"""
         pass
 
+    @abstractmethod
+    def find_page(
+        self,
+        restaurant_id: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Review], Optional[str]]:
+        """
+        Obtener una página de reseñas con paginación por cursor.
+
+        Returns:
+            (reseñas, cursor opaco de la siguiente página o None si no hay más)
+        """
+        pass
+
+    @abstractmethod
+    def iter_records(
+        self,
+        restaurant_id: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Recorrer reseñas (filtradas) en bloques de registros planos, sin crear entidades"""
+        pass
+
     @abstractmethod
     def save(self, review: Review) -> Review:
         """Guardar una reseña"""
@@ -49,3 +75,8 @@ class ReviewRepository(ABC):
         """Obtener estadísticas de sentimientos para un restaurante"""
         pass
 
+    @abstractmethod
+    def get_sentiment_stats_bulk(self, restaurant_ids: List[str]) -> Dict[str, dict]:
+        """Estadísticas de sentimientos de varios restaurantes (id -> mismas claves que get_sentiment_stats)"""
+        pass
+
@@ -3,16 +3,31 @@ Dependency Injection Container
 Contenedor IoC (Inversion of Control) para gestionar dependencias.
 """
 
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from src.domain.repositories import RestaurantRepository, UserRepository, ReviewRepository
-from src.infrastructure.repositories import CSVRestaurantRepository, MemoryUserRepository, CSVReviewRepository
-from src.ml.models import SentimentAnalysisModel
+from src.infrastructure.repositories import (
+    CatalogueDataSource,
+    CSVRestaurantRepository,
+    MemoryUserRepository,
+    CSVReviewRepository
+)
+
+# Los modelos ML (sklearn, NLTK) se importan al resolver la dependencia,
+# no al importar el contenedor, para acelerar el arranque de los workers.
+if TYPE_CHECKING:
+    from src.ml.models import SentimentAnalysisModel
+    from src.application.services.sentiment_batcher import SentimentMicroBatcher
+    from src.application.services.sentiment_online_updater import SentimentOnlineUpdater
 
 # Nuevas importaciones para distritos
 from src.domain.repositories.district_repository import DistrictRepository
 from src.infrastructure.repositories.csv_district_repository import CSVDistrictRepository
 from src.application.use_cases.district_use_cases import DistrictUseCases
 from src.application.services.district_service import DistrictService
+from src.shared.single_flight import SingleFlight
+
+# Catálogo compartido por los repositorios de restaurantes y distritos
+CATALOGUE_CSV_PATH = 'data/processed/restaurantes_sin_anomalias.csv'
 
 
 class Container:
@@ -35,13 +50,54 @@ class Container:
             Container._initialized = True
             print("Dependency Injection Container initialized")
 
+    def catalogue_source(self,
+                         csv_path: str = CATALOGUE_CSV_PATH) -> CatalogueDataSource:
+        """
+        Obtener la fuente única del catálogo (Singleton por ruta)
+
+        Los repositorios de restaurantes y distritos son vistas sobre ella:
+        un solo parseo, un solo conjunto de índices y una sola señal de recarga.
+        """
+        cache_key = f'catalogue_source:{csv_path}'
+        if cache_key not in self._dependencies:
+            source = CatalogueDataSource(csv_path)
+            self._enrich_catalogue(source)
+            self._dependencies[cache_key] = source
+        return self._dependencies[cache_key]
+
     def restaurant_repository(self,
-                            csv_path: str = 'data/processed/restaurantes_sin_anomalias.csv') -> RestaurantRepository:
+                            csv_path: str = CATALOGUE_CSV_PATH) -> RestaurantRepository:
         cache_key = f'restaurant_repository:{csv_path}'
         if cache_key not in self._dependencies:
-            self._dependencies[cache_key] = CSVRestaurantRepository(csv_path)
+            self._dependencies[cache_key] = CSVRestaurantRepository(
+                source=self.catalogue_source(csv_path)
+            )
         return self._dependencies[cache_key]
 
+    def _enrich_catalogue(self, source: CatalogueDataSource) -> None:
+        """
+        Precalcular predicted_stars y cluster_id en el catálogo.
+
+        Se suscribe la fuente al MLModelLoader para que un reemplazo
+        en caliente de un modelo recalcule solo su columna.
+        """
+        try:
+            from src.infrastructure.ml import (
+                CatalogueEnricher,
+                ml_model_loader,
+                get_clustering_model,
+                get_rating_model
+            )
+
+            enricher = CatalogueEnricher(
+                clustering_model=get_clustering_model(),
+                rating_model=get_rating_model()
+            )
+            source.attach_enricher(enricher)
+            ml_model_loader.subscribe(source.on_model_swapped)
+        except Exception as e:
+            print(f"Catalogue enrichment disabled: {e}")
+
     def user_repository(self) -> UserRepository:
         if 'user_repository' not in self._dependencies:
             self._dependencies['user_repository'] = MemoryUserRepository()
@@ -49,14 +105,24 @@ class Container:
 
     def review_repository(self,
                          csv_path: str = 'data/processed/modelo_limpio.csv') -> ReviewRepository:
-        """Obtener repositorio de reseñas (Singleton)"""
+        """
+        Obtener repositorio de reseñas (Singleton)
+
+        Con SENTIMENT_ONLINE_UPDATES=true las reseñas nuevas alimentan la
+        actualización incremental del modelo de sentimientos. Solo se notifican
+        las inserciones: mientras ninguna ruta inserte reseñas, no recibe nada.
+        """
         cache_key = f'review_repository:{csv_path}'
         if cache_key not in self._dependencies:
-            self._dependencies[cache_key] = CSVReviewRepository(csv_path)
+            repository = CSVReviewRepository(csv_path)
+            from src.application.services.sentiment_online_updater import online_updates_enabled
+            if online_updates_enabled():
+                repository.add_listener(self.sentiment_online_updater().submit)
+            self._dependencies[cache_key] = repository
         return self._dependencies[cache_key]
 
     def sentiment_model(self,
-                       model_path: str = 'data/models/sentiment_model.pkl') -> SentimentAnalysisModel:
+                       model_path: str = 'data/models/sentiment_model.pkl') -> 'SentimentAnalysisModel':
         """
         Obtener modelo de análisis de sentimientos (Singleton)
 
@@ -68,6 +134,8 @@ class Container:
         """
         cache_key = f'sentiment_model:{model_path}'
         if cache_key not in self._dependencies:
+            from src.ml.models import SentimentAnalysisModel
+
             model = SentimentAnalysisModel()
             try:
                 model.load(model_path)
@@ -95,12 +163,63 @@ class Container:
 
         return self._dependencies[cache_key]
 
+    def sentiment_batcher(self) -> 'SentimentMicroBatcher':
+        """
+        Obtener el micro-batcher del modelo de sentimientos (Singleton)
+
+        Configurable con SENTIMENT_BATCH_MAX_SIZE y SENTIMENT_BATCH_MAX_WAIT_MS.
+        """
+        if 'sentiment_batcher' not in self._dependencies:
+            from src.application.services.sentiment_batcher import SentimentMicroBatcher
+
+            self._dependencies['sentiment_batcher'] = SentimentMicroBatcher.from_env(
+                self.sentiment_model()
+            )
+        return self._dependencies['sentiment_batcher']
+
+    def sentiment_online_updater(self) -> 'SentimentOnlineUpdater':
+        """
+        Obtener el job de actualización incremental de sentimientos (Singleton)
+
+        Configurable con SENTIMENT_ONLINE_BATCH_SIZE, SENTIMENT_ONLINE_FLUSH_S y
+        SENTIMENT_ONLINE_SAVE_PATH. El modelo se carga con el primer lote.
+        """
+        if 'sentiment_online_updater' not in self._dependencies:
+            from src.application.services.sentiment_online_updater import SentimentOnlineUpdater
+
+            self._dependencies['sentiment_online_updater'] = SentimentOnlineUpdater.from_env(
+                lambda: self.sentiment_model()
+            )
+        return self._dependencies['sentiment_online_updater']
+
+    def existing_sentiment_online_updater(self) -> Optional['SentimentOnlineUpdater']:
+        """Job de actualización incremental si ya se creó (None si no; no lo crea)"""
+        return self._dependencies.get('sentiment_online_updater')
+
+    def single_flight(self) -> SingleFlight:
+        """Obtener el coalescedor de peticiones compartido (Singleton)"""
+        if 'single_flight' not in self._dependencies:
+            self._dependencies['single_flight'] = SingleFlight()
+        return self._dependencies['single_flight']
+
     def district_repository(self,
-                           csv_path: str = 'data/processed/restaurantes_limpio.csv') -> DistrictRepository:
-        """Obtener repositorio de distritos (Singleton)"""
-        cache_key = f'district_repository:{csv_path}'
+                           csv_path: Optional[str] = None) -> DistrictRepository:
+        """
+        Obtener repositorio de distritos (Singleton)
+
+        Por defecto es una vista sobre el catálogo compartido; con `csv_path`
+        se lee un CSV independiente.
+        """
+        cache_key = f'district_repository:{csv_path or CATALOGUE_CSV_PATH}'
         if cache_key not in self._dependencies:
-            self._dependencies[cache_key] = CSVDistrictRepository(csv_path)
+            if csv_path is None:
+                repository = CSVDistrictRepository(
+                    source=self.catalogue_source(),
+                    single_flight=self.single_flight()
+                )
+            else:
+                repository = CSVDistrictRepository(csv_path, single_flight=self.single_flight())
+            self._dependencies[cache_key] = repository
         return self._dependencies[cache_key]
 
     def district_use_cases(self) -> DistrictUseCases:
@@ -114,7 +233,10 @@ class Container:
         """Obtener servicio de distritos (Singleton)"""
         if 'district_service' not in self._dependencies:
             district_use_cases = self.district_use_cases()
-            self._dependencies['district_service'] = DistrictService(district_use_cases)
+            self._dependencies['district_service'] = DistrictService(
+                district_use_cases,
+                single_flight=self.single_flight()
+            )
         return self._dependencies['district_service']
 
     def clear(self) -> None:
@@ -132,7 +254,7 @@ class Container:
 _container = Container()
 
 # Funciones de acceso rápido para dependency injection
-def get_restaurant_repository(csv_path: str = 'data/processed/restaurantes_sin_anomalias.csv') -> RestaurantRepository:
+def get_restaurant_repository(csv_path: str = CATALOGUE_CSV_PATH) -> RestaurantRepository:
     """Obtener repositorio de restaurantes"""
     return _container.restaurant_repository(csv_path)
 
@@ -144,7 +266,7 @@ def get_review_repository(csv_path: str = 'data/processed/modelo_limpio.csv') ->
     """Obtener repositorio de reseñas"""
     return _container.review_repository(csv_path)
 
-def get_sentiment_model(model_path: str = 'data/models/sentiment_model.pkl') -> SentimentAnalysisModel:
+def get_sentiment_model(model_path: str = 'data/models/sentiment_model.pkl') -> 'SentimentAnalysisModel':
     """
     Obtener modelo de sentimientos optimizado
 
@@ -155,10 +277,30 @@ def get_sentiment_model(model_path: str = 'data/models/sentiment_model.pkl') ->
     """
     return _container.sentiment_model(model_path)
 
-def get_district_repository(csv_path: str = 'data/processed/restaurantes_limpio.csv') -> DistrictRepository:
+def get_sentiment_batcher() -> 'SentimentMicroBatcher':
+    """Obtener micro-batcher de sentimientos"""
+    return _container.sentiment_batcher()
+
+def get_sentiment_online_updater() -> 'SentimentOnlineUpdater':
+    """Obtener job de actualización incremental de sentimientos"""
+    return _container.sentiment_online_updater()
+
+def get_existing_sentiment_online_updater() -> Optional['SentimentOnlineUpdater']:
+    """Obtener el job de actualización incremental solo si ya existe"""
+    return _container.existing_sentiment_online_updater()
+
+def get_single_flight() -> SingleFlight:
+    """Obtener coalescedor de peticiones en vuelo"""
+    return _container.single_flight()
+
+def get_district_repository(csv_path: Optional[str] = None) -> DistrictRepository:
     """Obtener repositorio de distritos"""
     return _container.district_repository(csv_path)
 
+def get_catalogue_source() -> CatalogueDataSource:
+    """Obtener la fuente compartida del catálogo"""
+    return _container.catalogue_source()
+
 def get_district_service() -> DistrictService:
     """Obtener servicio de distritos"""
     return _container.district_service()
@@ -0,0 +1,308 @@
+"""
+Memory Report
+Contabilidad de memoria por componente del proceso.
+
+- DataFrames: `memory_usage(deep=True)` (incluye los objetos str de las
+  columnas object).
+- Arrays numpy / matrices sparse: `nbytes`.
+- Caches de objetos (entidades, índices, vocabularios): recorrido recursivo
+  con `sys.getsizeof`, entrando en contenedores, `__dict__`, `__slots__` y
+  el estado serializable de los estimadores sklearn (árboles del Random
+  Forest incluidos).
+
+Un objeto compartido se cuenta una sola vez, en el primer componente que lo
+referencia (ej. el DataFrame del catálogo se atribuye a `catalogue` y no a la
+vista de distritos). Solo se reportan componentes ya cargados: el reporte no
+fuerza la carga de datasets ni modelos.
+
+Opcionalmente incluye el top de sitios de asignación de tracemalloc, si está
+activo (PYTHONTRACEMALLOC=1 o `--tracemalloc` en el CLI).
+"""
+
+import os
+import sys
+import tracemalloc
+import types
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Tipos hoja: su getsizeof ya es el tamaño completo
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), range)
+
+# Código compartido, no datos del componente
+_SKIPPED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.MethodType,
+    types.BuiltinFunctionType, types.BuiltinMethodType
+)
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Memoria real de un DataFrame (índice y objetos de las columnas incluidos)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def deep_sizeof(obj: Any, seen: Optional[Dict[int, Any]] = None) -> int:
+    """
+    Tamaño en bytes de `obj` y de todo lo que alcanza.
+
+    Args:
+        obj: Objeto a medir
+        seen: Objetos ya contabilizados por id (compartirlo entre llamadas
+            evita contar dos veces los objetos compartidos). Guarda la
+            referencia para que el id de un temporal no se reutilice.
+    """
+    if seen is None:
+        seen = {}
+
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen[id(current)] = current
+
+        if isinstance(current, _ATOMIC_TYPES):
+            total += sys.getsizeof(current)
+        elif isinstance(current, pd.DataFrame):
+            total += frame_bytes(current)
+        elif isinstance(current, (pd.Series, pd.Index)):
+            total += int(current.memory_usage(deep=True))
+        elif isinstance(current, np.ndarray):
+            # Una vista de otro array solo suma su cabecera (el buffer se cuenta
+            # en el base); un buffer ajeno (ej. Tree de sklearn) suma nbytes
+            total += sys.getsizeof(current)
+            if isinstance(current.base, np.ndarray):
+                stack.append(current.base)
+            elif current.base is not None:
+                total += current.nbytes
+            if current.dtype == object:
+                stack.extend(current.ravel().tolist())
+        elif _is_sparse(current):
+            total += sum(
+                getattr(current, attr).nbytes
+                for attr in ('data', 'indices', 'indptr', 'row', 'col', 'offsets')
+                if isinstance(getattr(current, attr, None), np.ndarray)
+            )
+        elif isinstance(current, dict):
+            total += sys.getsizeof(current)
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(current)
+            stack.extend(current)
+        elif isinstance(current, _SKIPPED_TYPES):
+            continue
+        else:
+            total += sys.getsizeof(current)
+            stack.extend(_referents(current))
+    return total
+
+
+def _is_sparse(obj: Any) -> bool:
+    # Sin scipy importado no puede haber matrices sparse (y no se fuerza su import)
+    sparse = sys.modules.get('scipy.sparse')
+    return sparse is not None and sparse.issparse(obj)
+
+
+def _referents(obj: Any) -> List[Any]:
+    """Atributos de instancia de un objeto arbitrario."""
+    referents = []
+    state = getattr(obj, '__dict__', None)
+    if state is not None:
+        referents.append(state)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            if hasattr(obj, slot):
+                referents.append(getattr(obj, slot))
+    if state is None and not referents and hasattr(obj, '__getstate__'):
+        # Extensiones Cython de sklearn (Tree): el estado expone los arrays
+        try:
+            state = obj.__getstate__()
+        except Exception:
+            state = None
+        if isinstance(state, (dict, tuple, list)):
+            referents.append(state)
+    return referents
+
+
+# ========== Componentes ==========
+
+def _entry(component: str, kind: str, size: int, **details) -> Dict:
+    return {'component': component, 'kind': kind, 'bytes': int(size), 'mb': round(size / 1024 ** 2, 3), **details}
+
+
+def _catalogue_entries(source, seen: Dict[int, Any]) -> List[Dict]:
+    df = source.df
+    seen[id(df)] = df
+    return [
+        _entry('catalogue.df', 'dataframe', frame_bytes(df), rows=len(df), columns=len(df.columns)),
+        _entry(
+            'catalogue.indexes', 'objects',
+            deep_sizeof([source._id_index, source.district_keys, source.category_keys], seen)
+        ),
+    ]
+
+
+def _restaurant_entries(repository, seen: Dict[int, Any]) -> List[Dict]:
+    cache = repository._restaurants_cache
+    if cache is None:
+        return [_entry('restaurants._restaurants_cache', 'objects', 0, loaded=False)]
+    return [_entry('restaurants._restaurants_cache', 'objects', deep_sizeof(cache, seen), items=len(cache))]
+
+
+def _district_entries(repository, seen: Dict[int, Any]) -> List[Dict]:
+    entries = []
+    df = repository._df_cache
+    if df is not None and id(df) not in seen:
+        seen[id(df)] = df
+        entries.append(_entry('districts._df_cache', 'dataframe', frame_bytes(df), rows=len(df)))
+    stats = repository._stats_cache
+    entries.append(_entry(
+        'districts._stats_cache', 'objects',
+        deep_sizeof(stats, seen) if stats is not None else 0,
+        items=len(stats.districts) if stats is not None else 0
+    ))
+    return entries
+
+
+def _review_entries(repository, seen: Dict[int, Any]) -> List[Dict]:
+    df = repository._df
+    if df is None:
+        return [_entry('reviews.df', 'dataframe', 0, loaded=False)]
+    seen[id(df)] = df
+    return [
+        _entry('reviews.df', 'dataframe', frame_bytes(df), rows=len(df), columns=len(df.columns)),
+        _entry('reviews._position_indexes', 'objects', deep_sizeof(repository._position_indexes, seen)),
+    ]
+
+
+def _sentiment_entries(model, seen: Dict[int, Any]) -> List[Dict]:
+    entries = []
+    vectorizer = model.vectorizer
+    if vectorizer is not None:
+        vocabulary = getattr(vectorizer, 'vocabulary_', {})
+        entries.append(_entry(
+            'sentiment.vectorizer.vocabulary_', 'objects',
+            deep_sizeof(vocabulary, seen), terms=len(vocabulary)
+        ))
+        stop_words = getattr(vectorizer, 'stop_words_', None)
+        if stop_words:
+            # Términos descartados por min_df/max_df: solo sirven para inspección
+            entries.append(_entry(
+                'sentiment.vectorizer.stop_words_', 'objects',
+                deep_sizeof(stop_words, seen), terms=len(stop_words)
+            ))
+        entries.append(_entry('sentiment.vectorizer (resto)', 'model', deep_sizeof(vectorizer, seen)))
+    if model.classifier is not None:
+        entries.append(_entry('sentiment.classifier', 'model', deep_sizeof(model.classifier, seen)))
+    entries.append(_entry('sentiment.stem_table', 'objects', deep_sizeof(model.stem_table, seen), terms=len(model.stem_table)))
+    return entries
+
+
+def _ml_loader_entries(loader, seen: Dict[int, Any]) -> List[Dict]:
+    entries = []
+    clustering = loader._clustering_model
+    if clustering is not None:
+        entries.append(_entry('ml.clustering_model', 'model', deep_sizeof([clustering.model, getattr(clustering, 'scaler', None)], seen)))
+    rating = loader._rating_model
+    if rating is not None:
+        estimators = getattr(rating.model, 'estimators_', [])
+        entries.append(_entry('ml.rating_model', 'model', deep_sizeof(rating.model, seen), estimators=len(estimators)))
+    recommender = loader._recommender_system
+    if recommender is not None and recommender.restaurants_data is not None:
+        df = recommender.restaurants_data
+        seen[id(df)] = df
+        entries.append(_entry('ml.recommender.restaurants_data', 'dataframe', frame_bytes(df), rows=len(df)))
+    return entries
+
+
+def _collect_components(seen: Dict[int, Any]) -> List[Dict]:
+    """Recorrer los singletons del contenedor y del cargador de modelos."""
+    from src.infrastructure.container import _container
+    from src.infrastructure.ml.model_loader import ml_model_loader
+    from src.infrastructure.repositories import CatalogueDataSource, CSVRestaurantRepository, CSVReviewRepository
+    from src.infrastructure.repositories.csv_district_repository import CSVDistrictRepository
+
+    collectors = [
+        (CatalogueDataSource, _catalogue_entries),
+        (CSVRestaurantRepository, _restaurant_entries),
+        (CSVDistrictRepository, _district_entries),
+        (CSVReviewRepository, _review_entries),
+    ]
+    entries = []
+    dependencies = list(_container._dependencies.items())
+    for cls, collector in collectors:
+        for _, dependency in dependencies:
+            if isinstance(dependency, cls):
+                entries.extend(collector(dependency, seen))
+
+    for key, dependency in dependencies:
+        if key.startswith('sentiment_model:'):
+            entries.extend(_sentiment_entries(dependency, seen))
+
+    entries.extend(_ml_loader_entries(ml_model_loader, seen))
+    return entries
+
+
+def _process_memory() -> Dict:
+    try:
+        import psutil
+    except ImportError:
+        return {}
+    process = psutil.Process(os.getpid())
+    info = {'rss_mb': round(process.memory_info().rss / 1024 ** 2, 2)}
+    try:
+        info['uss_mb'] = round(process.memory_full_info().uss / 1024 ** 2, 2)
+    except (psutil.AccessDenied, AttributeError):
+        pass
+    return info
+
+
+def _tracemalloc_top(limit: int) -> Optional[Dict]:
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'traced_mb': round(current / 1024 ** 2, 2),
+        'peak_mb': round(peak / 1024 ** 2, 2),
+        'top': [
+            {
+                'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                'mb': round(stat.size / 1024 ** 2, 3),
+                'blocks': stat.count,
+            }
+            for stat in snapshot.statistics('lineno')[:limit]
+        ],
+    }
+
+
+def build_memory_report(tracemalloc_top: int = 0) -> Dict:
+    """
+    Reporte de memoria de los componentes cargados en este proceso.
+
+    Args:
+        tracemalloc_top: Cantidad de sitios de asignación a incluir (0 = no
+            incluir; requiere tracemalloc activo)
+    """
+    seen: Dict[int, Any] = {}
+    components = sorted(_collect_components(seen), key=lambda entry: entry['bytes'], reverse=True)
+    accounted = sum(entry['bytes'] for entry in components)
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'pid': os.getpid(),
+        'process': _process_memory(),
+        'accounted_mb': round(accounted / 1024 ** 2, 2),
+        'components': components,
+    }
+    if tracemalloc_top:
+        report['tracemalloc'] = _tracemalloc_top(tracemalloc_top)
+    return report
@@ -9,6 +9,7 @@ from .model_loader import (
     get_rating_model,
     get_recommender_system
 )
+from .catalogue_enricher import CatalogueEnricher
 
 __all__ = [
     'MLModelLoader',
@@ -16,4 +17,5 @@ __all__ = [
     'get_clustering_model',
     'get_rating_model',
     'get_recommender_system',
+    'CatalogueEnricher',
 ]
\ No newline at end of file
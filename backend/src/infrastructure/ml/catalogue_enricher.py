@@ -0,0 +1,117 @@
+"""
+Catalogue Enricher
+Enriquecimiento del catálogo de restaurantes con predicciones ML precalculadas.
+
+Las features de los modelos (lat, long, stars, reviews) son estáticas por
+restaurante, por lo que las predicciones se calculan una sola vez al cargar
+el catálogo (una llamada vectorizada por modelo) y se guardan como columnas.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class CatalogueEnricher:
+    """
+    Agrega columnas precalculadas al DataFrame del catálogo:
+
+    - predicted_stars: rating predicho por el RatingPredictorModel
+    - cluster_id: cluster asignado por el RestaurantClusteringModel
+
+    Cada columna depende de un solo modelo, de modo que al reemplazar un
+    modelo en caliente solo se recalcula la columna afectada.
+    """
+
+    PREDICTED_STARS_COLUMN = 'predicted_stars'
+    CLUSTER_COLUMN = 'cluster_id'
+
+    def __init__(self, clustering_model=None, rating_model=None):
+        """
+        Args:
+            clustering_model: RestaurantClusteringModel entrenado (opcional)
+            rating_model: RatingPredictorModel entrenado (opcional)
+        """
+        self.clustering_model = clustering_model
+        self.rating_model = rating_model
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula todas las columnas de enriquecimiento sobre el DataFrame (in-place).
+
+        Args:
+            df: DataFrame del catálogo de restaurantes
+
+        Returns:
+            El mismo DataFrame con las columnas agregadas
+        """
+        self.refresh_predicted_stars(df)
+        self.refresh_clusters(df)
+        return df
+
+    def refresh_predicted_stars(self, df: pd.DataFrame) -> None:
+        """Recalcula solo la columna predicted_stars (una predicción en lote)."""
+        df[self.PREDICTED_STARS_COLUMN] = self._batch_predict(
+            self.rating_model, df, dtype=np.float64
+        )
+
+    def refresh_clusters(self, df: pd.DataFrame) -> None:
+        """Recalcula solo la columna cluster_id (una predicción en lote)."""
+        df[self.CLUSTER_COLUMN] = self._batch_predict(
+            self.clustering_model, df, dtype='Int64'
+        )
+
+    def set_rating_model(self, model, df: Optional[pd.DataFrame] = None) -> None:
+        """Reemplaza el modelo de rating y recalcula su columna si se pasa el catálogo."""
+        self.rating_model = model
+        if df is not None:
+            self.refresh_predicted_stars(df)
+
+    def set_clustering_model(self, model, df: Optional[pd.DataFrame] = None) -> None:
+        """Reemplaza el modelo de clustering y recalcula su columna si se pasa el catálogo."""
+        self.clustering_model = model
+        if df is not None:
+            self.refresh_clusters(df)
+
+    def refresh(self, model_kind: str, model, df: pd.DataFrame) -> None:
+        """
+        Aplica el reemplazo de un modelo por tipo ('clustering' o 'rating_predictor').
+
+        Tipos desconocidos se ignoran (p. ej. el recommender_system no genera columnas).
+        """
+        if model_kind == 'clustering':
+            self.set_clustering_model(model, df)
+        elif model_kind == 'rating_predictor':
+            self.set_rating_model(model, df)
+
+    @staticmethod
+    def _batch_predict(model, df: pd.DataFrame, dtype) -> pd.Series:
+        """Predice para todo el catálogo en una sola llamada; NaN si no es posible."""
+        empty = pd.Series(pd.NA if dtype == 'Int64' else np.nan, index=df.index, dtype=dtype)
+
+        if model is None or not getattr(model, 'is_trained', False) or df.empty:
+            return empty
+        # Modelo cargado pero no utilizable (p. ej. clustering sin scaler):
+        # ya se avisó al cargarlo, la columna queda vacía sin más errores
+        if not getattr(model, 'can_predict', True):
+            return empty
+
+        feature_names = list(getattr(model, 'feature_names', []) or [])
+        if not feature_names or any(col not in df.columns for col in feature_names):
+            return empty
+
+        features = df[feature_names]
+        valid = features.notna().all(axis=1).to_numpy()
+        if not valid.any():
+            return empty
+
+        try:
+            predictions = model.predict(features[valid])
+        except Exception as e:
+            print(f"Error en enriquecimiento del catálogo ({model.model_name}): {e}")
+            return empty
+
+        result = empty.copy()
+        result[valid] = np.asarray(predictions)
+        return result
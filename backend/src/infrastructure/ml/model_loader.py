@@ -4,13 +4,15 @@ Cargador de modelos ML entrenados.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable, List, TYPE_CHECKING
 
-from src.ml.models import (
-    RestaurantClusteringModel,
-    RatingPredictorModel,
-    RestaurantRecommenderSystem
-)
+# Los modelos (y sklearn) se importan al cargarlos, no al importar este módulo
+if TYPE_CHECKING:
+    from src.ml.models import (
+        RestaurantClusteringModel,
+        RatingPredictorModel,
+        RestaurantRecommenderSystem
+    )
 
 
 class MLModelLoader:
@@ -35,9 +37,32 @@ class MLModelLoader:
             self._clustering_model = None
             self._rating_model = None
             self._recommender_system = None
+            self._listeners: List[Callable[[str, object], None]] = []
             MLModelLoader._initialized = True
 
-    def load_clustering_model(self) -> Optional[RestaurantClusteringModel]:
+    def subscribe(self, listener: Callable[[str, object], None]) -> None:
+        """
+        Registrar un listener que se notifica al reemplazar un modelo en caliente.
+
+        Args:
+            listener: Callable(model_kind, model) con model_kind en
+                'clustering', 'rating_predictor' o 'recommender_system'
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, object], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, model_kind: str, model) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(model_kind, model)
+            except Exception as e:
+                print(f"Error notificando cambio de modelo {model_kind}: {e}")
+
+    def load_clustering_model(self) -> Optional['RestaurantClusteringModel']:
         if self._clustering_model is not None:
             return self._clustering_model
 
@@ -48,6 +73,7 @@ class MLModelLoader:
             return None
 
         try:
+            from src.ml.models import RestaurantClusteringModel
             model = RestaurantClusteringModel()
             model.load(str(model_path))
             self._clustering_model = model
@@ -56,7 +82,7 @@ class MLModelLoader:
             print(f"Error cargando clustering model: {e}")
             return None
 
-    def load_rating_model(self) -> Optional[RatingPredictorModel]:
+    def load_rating_model(self) -> Optional['RatingPredictorModel']:
         if self._rating_model is not None:
             return self._rating_model
 
@@ -67,6 +93,7 @@ class MLModelLoader:
             return None
 
         try:
+            from src.ml.models import RatingPredictorModel
             model = RatingPredictorModel()
             model.load(str(model_path))
             self._rating_model = model
@@ -75,7 +102,7 @@ class MLModelLoader:
             print(f"Error cargando rating model: {e}")
             return None
 
-    def load_recommender_system(self) -> Optional[RestaurantRecommenderSystem]:
+    def load_recommender_system(self) -> Optional['RestaurantRecommenderSystem']:
         if self._recommender_system is not None:
             return self._recommender_system
 
@@ -86,6 +113,7 @@ class MLModelLoader:
             return None
 
         try:
+            from src.ml.models import RestaurantRecommenderSystem
             system = RestaurantRecommenderSystem()
             system.load(str(model_path))
             self._recommender_system = system
@@ -108,6 +136,35 @@ class MLModelLoader:
 
         return models
 
+    def swap_clustering_model(self, model: 'RestaurantClusteringModel') -> None:
+        """Reemplazar en caliente el clustering model y notificar a los listeners."""
+        self._clustering_model = model
+        self._notify('clustering', model)
+
+    def swap_rating_model(self, model: 'RatingPredictorModel') -> None:
+        """Reemplazar en caliente el rating model y notificar a los listeners."""
+        self._rating_model = model
+        self._notify('rating_predictor', model)
+
+    def reload_model(self, model_kind: str):
+        """
+        Recargar un modelo desde disco y notificar el reemplazo.
+
+        Args:
+            model_kind: 'clustering' o 'rating_predictor'
+        """
+        if model_kind == 'clustering':
+            self._clustering_model = None
+            model = self.load_clustering_model()
+        elif model_kind == 'rating_predictor':
+            self._rating_model = None
+            model = self.load_rating_model()
+        else:
+            raise ValueError(f"Tipo de modelo desconocido: {model_kind}")
+
+        self._notify(model_kind, model)
+        return model
+
     def clear_cache(self):
         self._clustering_model = None
         self._rating_model = None
@@ -118,13 +175,13 @@ class MLModelLoader:
 ml_model_loader = MLModelLoader()
 
 
-def get_clustering_model() -> Optional[RestaurantClusteringModel]:
+def get_clustering_model() -> Optional['RestaurantClusteringModel']:
     return ml_model_loader.load_clustering_model()
 
 
-def get_rating_model() -> Optional[RatingPredictorModel]:
+def get_rating_model() -> Optional['RatingPredictorModel']:
     return ml_model_loader.load_rating_model()
 
 
-def get_recommender_system() -> Optional[RestaurantRecommenderSystem]:
+def get_recommender_system() -> Optional['RestaurantRecommenderSystem']:
     return ml_model_loader.load_recommender_system()
@@ -3,11 +3,13 @@ Infrastructure Repositories Package
 Implementaciones concretas de los repositorios.
 """
 
+from .catalogue_source import CatalogueDataSource
 from .csv_restaurant_repository import CSVRestaurantRepository
 from .memory_user_repository import MemoryUserRepository
 from .csv_review_repository import CSVReviewRepository
 
 __all__ = [
+ 'CatalogueDataSource',
  'CSVRestaurantRepository',
  'MemoryUserRepository',
  'CSVReviewRepository',
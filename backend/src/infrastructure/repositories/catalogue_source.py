@@ -0,0 +1,160 @@
+"""
+Catalogue Data Source
+Fuente única del catálogo de restaurantes compartida por los repositorios.
+
+El CSV se parsea una sola vez y se mantiene un único conjunto de índices.
+CSVRestaurantRepository y CSVDistrictRepository son vistas sobre esta fuente:
+al recargar los datos (o recalcular columnas ML) se incrementa `version` y se
+notifica a los suscriptores para que invaliden sus caches derivados.
+"""
+
+import hashlib
+import io
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.shared.instrumentation import timed
+from .key_codes import KeyCodes
+
+
+CatalogueListener = Callable[['CatalogueDataSource'], None]
+
+
+class CatalogueDataSource:
+    """DataFrame del catálogo + índices + señal de recarga."""
+
+    REQUIRED_COLUMNS = ('id_place', 'title', 'category', 'district', 'lat', 'long', 'stars', 'reviews')
+
+    # Columnas de baja cardinalidad: dtype category + códigos de clave en minúsculas
+    CATEGORICAL_COLUMNS = ('district', 'category')
+
+    def __init__(self, csv_path: str = 'data/processed/restaurantes_sin_anomalias.csv'):
+        self.csv_path = Path(csv_path)
+
+        if not self.csv_path.is_absolute():
+            project_root = Path(__file__).parent.parent.parent.parent
+            self.csv_path = project_root / csv_path
+
+        self._df: Optional[pd.DataFrame] = None
+        self._id_index: Dict[str, int] = {}
+        self.district_keys: Optional[KeyCodes] = None
+        self.category_keys: Optional[KeyCodes] = None
+        self._enricher = None
+        self._listeners: List[CatalogueListener] = []
+        self.version = 0
+        self.content_hash = ''
+        self.last_modified: Optional[datetime] = None
+
+        self._load_data()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """DataFrame compartido (solo lectura para las vistas)."""
+        return self._df
+
+    @timed('csv_load.catalogue')
+    def _load_data(self) -> None:
+        """Parsea el CSV, aplica el enriquecimiento ML y construye los índices."""
+        if not self.csv_path.exists():
+            raise FileNotFoundError(
+                f"CSV file not found: {self.csv_path}\n"
+                f"Please run data wrangling first: python scripts/run_data_wrangling.py"
+            )
+
+        raw = self.csv_path.read_bytes()
+        df = pd.read_csv(io.BytesIO(raw))
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Columnas faltantes en CSV: {missing_columns}")
+
+        for column in self.CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype('category')
+
+        if self._enricher is not None:
+            self._enricher.enrich(df)
+
+        self._df = df
+        self.content_hash = hashlib.sha256(raw).hexdigest()
+        self.last_modified = datetime.fromtimestamp(self.csv_path.stat().st_mtime, tz=timezone.utc)
+        self._build_indexes()
+        print(f"Loaded {len(self._df)} restaurants from {self.csv_path}")
+
+    def _build_indexes(self) -> None:
+        """Índice por id y códigos de distrito/categoría (posiciones de fila)."""
+        df = self._df
+        self._id_index = {
+            str(place_id): position
+            for position, place_id in enumerate(df['id_place'])
+        }
+        self.district_keys = KeyCodes(df['district'])
+        self.category_keys = KeyCodes(df['category'])
+
+    @property
+    def dataset_version(self) -> str:
+        """
+        Versión del dataset: hash del contenido del CSV + contador de cambios.
+
+        Cambia al recargar datos o recalcular columnas ML; sirve como ETag.
+        """
+        return f"{self.content_hash[:16]}-{self.version}"
+
+    # ========== Consultas por índice ==========
+
+    def position_of(self, restaurant_id: str) -> Optional[int]:
+        """Posición de fila de un restaurante, o None si no existe."""
+        return self._id_index.get(restaurant_id)
+
+    def positions_by_district(self, district: str) -> np.ndarray:
+        """Posiciones de fila de un distrito (búsqueda sin distinguir mayúsculas)."""
+        return self.district_keys.positions_of(district)
+
+    def positions_by_category(self, category: str) -> np.ndarray:
+        """Posiciones de fila de una categoría (búsqueda sin distinguir mayúsculas)."""
+        return self.category_keys.positions_of(category)
+
+    # ========== Señal de recarga ==========
+
+    def subscribe(self, listener: CatalogueListener) -> None:
+        """Registrar un callback `listener(source)` que se invoca tras cada cambio de datos."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: CatalogueListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self) -> None:
+        self.version += 1
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Error notificando cambio de catálogo: {e}")
+
+    def reload(self) -> None:
+        """Vuelve a leer el CSV y notifica a las vistas."""
+        self._load_data()
+        self._notify()
+
+    # ========== Enriquecimiento ML ==========
+
+    def attach_enricher(self, enricher) -> None:
+        """
+        Asociar un CatalogueEnricher y calcular sus columnas sobre el catálogo.
+
+        Las columnas se recalculan en cada reload().
+        """
+        self._enricher = enricher
+        enricher.enrich(self._df)
+        self._notify()
+
+    def on_model_swapped(self, model_kind: str, model) -> None:
+        """Listener del MLModelLoader: recalcula solo la columna del modelo reemplazado."""
+        if self._enricher is None:
+            return
+        self._enricher.refresh(model_kind, model, self._df)
+        self._notify()
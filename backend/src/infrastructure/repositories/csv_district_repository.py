@@ -3,7 +3,9 @@ Implementación concreta del repositorio de distritos
 Accede a los datos reales del CSV de restaurantes
 """
 import pandas as pd
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import List, Optional, Mapping, Tuple
+from types import MappingProxyType
 from decimal import Decimal
 from pathlib import Path
 import asyncio
@@ -11,17 +13,52 @@ from functools import lru_cache
 
 from ...domain.entities.district import District
 from ...domain.repositories.district_repository import DistrictRepository
+from .catalogue_source import CatalogueDataSource
+from ...shared.instrumentation import timed
+from ...shared.single_flight import SingleFlight
+
+
+@dataclass(frozen=True)
+class DistrictStatisticsTable:
+    """
+    Vista materializada e inmutable de estadísticas por distrito.
+
+    Se calcula una sola vez al cargar los datos (conteo, rating promedio y
+    centroide) y todas las consultas del repositorio se sirven desde aquí.
+    """
+    districts: Tuple[District, ...]          # Orden alfabético por nombre
+    by_popularity: Tuple[District, ...]      # Más restaurantes primero
+    by_name: Mapping[str, District]          # Clave: nombre en minúsculas
 
 
 class CSVDistrictRepository(DistrictRepository):
     """
     Implementación del repositorio de distritos que lee desde archivos CSV
     Optimizado con cache para mejorar performance
+
+    Si se pasa un CatalogueDataSource, las estadísticas se derivan de las
+    mismas columnas en memoria que usa el repositorio de restaurantes (sin
+    volver a parsear el CSV) y se recalculan con cada recarga de la fuente.
     """
 
-    def __init__(self, data_path: str = "data/processed/restaurantes_limpio.csv"):
-        self.data_path = Path(data_path)
+    def __init__(self,
+                 data_path: str = "data/processed/restaurantes_limpio.csv",
+                 source: Optional[CatalogueDataSource] = None,
+                 single_flight: Optional[SingleFlight] = None):
+        self.source = source
+        self.data_path = source.csv_path if source is not None else Path(data_path)
         self._df_cache: Optional[pd.DataFrame] = None
+        self._stats_cache: Optional[DistrictStatisticsTable] = None
+        # Las primeras peticiones concurrentes comparten una sola carga
+        self._load_flight = single_flight if single_flight is not None else SingleFlight()
+        self._load_key = ('district_repository_load', id(self))
+
+        if source is not None:
+            source.subscribe(self._on_catalogue_changed)
+
+    def _on_catalogue_changed(self, source: CatalogueDataSource) -> None:
+        """Invalida las estadísticas cuando cambia el catálogo compartido."""
+        self.clear_cache()
 
     @property
     async def _df(self) -> pd.DataFrame:
@@ -29,14 +66,39 @@ class CSVDistrictRepository(DistrictRepository):
         Lazy loading del DataFrame con cache
         """
         if self._df_cache is None:
-            # Ejecutar la carga de CSV en un thread separado para no bloquear
-            loop = asyncio.get_event_loop()
-            self._df_cache = await loop.run_in_executor(
-                None,
-                self._load_restaurant_data
-            )
+            await self._load_flight.do(self._load_key, self._load)
         return self._df_cache
 
+    @property
+    async def _statistics(self) -> DistrictStatisticsTable:
+        """
+        Tabla de estadísticas por distrito (se calcula junto con la carga)
+        """
+        if self._stats_cache is None:
+            await self._load_flight.do(self._load_key, self._load)
+        return self._stats_cache
+
+    async def _load(self) -> None:
+        """
+        Carga el CSV y materializa las estadísticas en un thread separado
+        para no bloquear el event loop
+        """
+        if self.source is not None:
+            # Catálogo ya en memoria: solo se agregan las columnas compartidas
+            self._df_cache = self.source.df
+            self._stats_cache = self._build_statistics_table(self._df_cache)
+            return
+
+        # to_thread copia el contexto: las etapas quedan en la traza de la petición
+        df, stats = await asyncio.to_thread(self._load_and_aggregate)
+        self._df_cache = df
+        self._stats_cache = stats
+
+    @timed('repository.districts.load_and_aggregate')
+    def _load_and_aggregate(self) -> Tuple[pd.DataFrame, DistrictStatisticsTable]:
+        df = self._load_restaurant_data()
+        return df, self._build_statistics_table(df)
+
     def _load_restaurant_data(self) -> pd.DataFrame:
         """
         Carga los datos de restaurantes desde CSV
@@ -56,113 +118,70 @@ class CSVDistrictRepository(DistrictRepository):
         except Exception as e:
             raise Exception(f"Error al cargar datos de restaurantes: {e}")
 
-    async def get_all_districts(self) -> List[District]:
+    def _build_statistics_table(self, df: pd.DataFrame) -> DistrictStatisticsTable:
         """
-        Obtiene todos los distritos únicos del dataset
+        Calcula en una sola pasada (groupby) conteo, rating promedio y
+        centroide de cada distrito.
         """
-        df = await self._df
+        aggregations = {
+            'restaurant_count': ('stars', 'count'),
+            'avg_rating': ('stars', 'mean')
+        }
+        if 'lat' in df.columns and 'long' in df.columns:
+            aggregations['avg_latitude'] = ('lat', 'mean')
+            aggregations['avg_longitude'] = ('long', 'mean')
 
-        unique_districts = df['district'].unique()
-        districts = []
+        district_stats = df.groupby('district').agg(**aggregations)
 
-        for district_name in unique_districts:
-            if pd.isna(district_name):
-                continue
+        def to_decimal(value) -> Optional[Decimal]:
+            return None if pd.isna(value) else Decimal(str(value))
 
-            # Crear distrito básico sin estadísticas
-            district = District(
+        districts = tuple(
+            District(
                 name=district_name,
                 display_name=self._format_display_name(district_name),
-                restaurant_count=0  # Se calculará en get_districts_with_statistics
+                restaurant_count=int(row.restaurant_count),
+                average_rating=to_decimal(row.avg_rating),
+                latitude=to_decimal(getattr(row, 'avg_latitude', None)),
+                longitude=to_decimal(getattr(row, 'avg_longitude', None)),
+                description=self._get_district_description(district_name)
             )
-            districts.append(district)
+            for district_name, row in zip(district_stats.index, district_stats.itertuples(index=False))
+        )
 
-        return sorted(districts, key=lambda d: d.display_name)
+        return DistrictStatisticsTable(
+            districts=districts,
+            by_popularity=tuple(sorted(districts, key=lambda d: d.restaurant_count, reverse=True)),
+            by_name=MappingProxyType({d.name.lower(): d for d in districts})
+        )
+
+    async def get_all_districts(self) -> List[District]:
+        """
+        Obtiene todos los distritos únicos del dataset
+        """
+        stats = await self._statistics
+        return sorted(stats.districts, key=lambda d: d.display_name)
 
     async def get_district_by_name(self, name: str) -> Optional[District]:
         """
         Busca un distrito específico con estadísticas completas
         """
-        df = await self._df
-
-        # Filtrar restaurantes del distrito
-        district_data = df[df['district'].str.lower() == name.lower()]
-
-        if district_data.empty:
-            return None
-
-        # Calcular estadísticas
-        restaurant_count = len(district_data)
-        avg_rating = district_data['stars'].mean() if 'stars' in district_data.columns else None
-
-        # Coordenadas promedio (si existen en el dataset)
-        latitude = None
-        longitude = None
-        if 'lat' in district_data.columns and 'long' in district_data.columns:
-            latitude = Decimal(str(district_data['lat'].mean()))
-            longitude = Decimal(str(district_data['long'].mean()))
-
-        return District(
-            name=name,
-            display_name=self._format_display_name(name),
-            restaurant_count=restaurant_count,
-            average_rating=Decimal(str(avg_rating)) if avg_rating else None,
-            latitude=latitude,
-            longitude=longitude,
-            description=self._get_district_description(name)
-        )
+        stats = await self._statistics
+        return stats.by_name.get(name.lower())
 
     async def get_districts_with_statistics(self) -> List[District]:
         """
         Obtiene todos los distritos con estadísticas completas
         """
-        df = await self._df
-
-        # Agrupar por distrito y calcular estadísticas
-        district_stats = df.groupby('district').agg({
-            'stars': ['count', 'mean'],
-            'lat': 'mean',
-            'long': 'mean'
-        }).reset_index()
-
-        # Aplanar nombres de columnas
-        district_stats.columns = [
-            'district', 'restaurant_count', 'avg_rating', 'avg_latitude', 'avg_longitude'
-        ]
-
-        districts = []
-        for _, row in district_stats.iterrows():
-            district_name = row['district']
-            if pd.isna(district_name):
-                continue
-
-            district = District(
-                name=district_name,
-                display_name=self._format_display_name(district_name),
-                restaurant_count=int(row['restaurant_count']),
-                average_rating=Decimal(str(row['avg_rating'])) if not pd.isna(row['avg_rating']) else None,
-                latitude=Decimal(str(row['avg_latitude'])) if not pd.isna(row['avg_latitude']) else None,
-                longitude=Decimal(str(row['avg_longitude'])) if not pd.isna(row['avg_longitude']) else None,
-                description=self._get_district_description(district_name)
-            )
-            districts.append(district)
-
-        return districts
+        stats = await self._statistics
+        return list(stats.districts)
 
     async def get_popular_districts(self, limit: int = 5) -> List[District]:
         """
         Obtiene los distritos más populares por número de restaurantes
         """
-        districts = await self.get_districts_with_statistics()
-
-        # Ordenar por número de restaurantes descendente
-        popular_districts = sorted(
-            districts,
-            key=lambda d: d.restaurant_count,
-            reverse=True
-        )
-
-        return popular_districts[:limit]
+        stats = await self._statistics
+        return list(stats.by_popularity[:limit])
 
     def _format_display_name(self, district_name: str) -> str:
         """
@@ -199,7 +218,8 @@ class CSVDistrictRepository(DistrictRepository):
 
     def clear_cache(self):
         """
-        Limpia el cache del DataFrame para recargar datos frescos
+        Limpia el cache del DataFrame y de las estadísticas para recargar datos frescos
         """
         self._df_cache = None
+        self._stats_cache = None
         self._get_district_description.cache_clear()
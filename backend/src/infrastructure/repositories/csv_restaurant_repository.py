@@ -5,112 +5,195 @@ Implementacion que lee restaurantes desde archivos CSV.
 
 import pandas as pd
 import numpy as np
+from datetime import datetime
 from typing import List, Optional
-from pathlib import Path
 
 from src.domain.entities import Restaurant
 from src.domain.repositories import RestaurantRepository
+from src.shared.instrumentation import stage, timed
+from .catalogue_source import CatalogueDataSource
 
 
 class CSVRestaurantRepository(RestaurantRepository):
-    """Implementacion del RestaurantRepository que lee desde CSV."""
+    """
+    Implementacion del RestaurantRepository que lee desde CSV.
 
-    def __init__(self, csv_path: str = 'data/processed/restaurantes_sin_anomalias.csv'):
-        self.csv_path = Path(csv_path)
+    Es una vista sobre un CatalogueDataSource: el parseo, los índices y el
+    enriquecimiento ML viven en la fuente, compartida con otros repositorios.
+    """
 
-        if not self.csv_path.is_absolute():
-            project_root = Path(__file__).parent.parent.parent.parent
-            self.csv_path = project_root / csv_path
+    def __init__(self,
+                 csv_path: str = 'data/processed/restaurantes_sin_anomalias.csv',
+                 source: Optional[CatalogueDataSource] = None):
+        self.source = source if source is not None else CatalogueDataSource(csv_path)
+        self.csv_path = self.source.csv_path
 
-        self._df: Optional[pd.DataFrame] = None
         self._restaurants_cache: Optional[List[Restaurant]] = None
-        self._load_data()
-
-    def _load_data(self) -> None:
-        """Carga los datos desde el CSV."""
-        if not self.csv_path.exists():
-            raise FileNotFoundError(
-                f"CSV file not found: {self.csv_path}\n"
-                f"Please run data wrangling first: python scripts/run_data_wrangling.py"
-            )
+        self.source.subscribe(self._on_catalogue_changed)
+
+    @property
+    def _df(self) -> pd.DataFrame:
+        return self.source.df
+
+    def _on_catalogue_changed(self, source: CatalogueDataSource) -> None:
+        """Invalida las entidades cacheadas cuando cambia el catálogo."""
+        self._restaurants_cache = None
 
-        self._df = pd.read_csv(self.csv_path)
-        print(f"Loaded {len(self._df)} restaurants from {self.csv_path}")
-
-    def _row_to_entity(self, row: pd.Series) -> Restaurant:
-        """Convierte una fila del DataFrame a una entidad Restaurant."""
-        return Restaurant(
-            id=str(row['id_place']),
-            title=str(row['title']),
-            category=str(row['category']),
-            address=str(row['address']),
-            district=str(row['district']),
-            lat=float(row['lat']),
-            long=float(row['long']),
-            stars=float(row['stars']),
-            reviews=int(row['reviews']),
-            phone_number=str(row['phoneNumber']) if pd.notna(row.get('phoneNumber')) else None,
-            complete_phone_number=str(row['completePhoneNumber']) if pd.notna(row.get('completePhoneNumber')) else None,
-            url=str(row['url']) if pd.notna(row.get('url')) else None,
-            url_place=str(row['url_place']) if pd.notna(row.get('url_place')) else None,
-            domain=str(row['domain']) if pd.notna(row.get('domain')) else None,
+    def attach_enricher(self, enricher) -> None:
+        """Asociar un CatalogueEnricher a la fuente del catálogo."""
+        self.source.attach_enricher(enricher)
+
+    def on_model_swapped(self, model_kind: str, model) -> None:
+        """Listener del MLModelLoader: delega en la fuente del catálogo."""
+        self.source.on_model_swapped(model_kind, model)
+
+    @staticmethod
+    def _column(df: pd.DataFrame, column: str, cast) -> list:
+        """Columna como lista de valores Python (None para nulos o ausente)."""
+        if column not in df.columns:
+            return [None] * len(df)
+        values = df[column]
+        mask = values.notna().tolist()
+        return [cast(value) if present else None for value, present in zip(values.tolist(), mask)]
+
+    def _frame_to_entities(self, df: pd.DataFrame) -> List[Restaurant]:
+        """
+        Convierte filas del DataFrame a entidades Restaurant.
+
+        Se extrae cada columna una sola vez (sin iterrows) y se construyen
+        las entidades sin revalidar: los datos del catálogo ya pasaron por
+        el data wrangling. `created_at` es el mismo para toda la carga.
+        """
+        loaded_at = datetime.now()
+        columns = zip(
+            [str(value) for value in df['id_place'].tolist()],
+            [str(value) for value in df['title'].tolist()],
+            [str(value) for value in df['category'].tolist()],
+            [str(value) for value in df['address'].tolist()],
+            [str(value) for value in df['district'].tolist()],
+            df['lat'].astype(float).tolist(),
+            df['long'].astype(float).tolist(),
+            df['stars'].astype(float).tolist(),
+            df['reviews'].astype(int).tolist(),
+            self._column(df, 'phoneNumber', str),
+            self._column(df, 'completePhoneNumber', str),
+            self._column(df, 'url', str),
+            self._column(df, 'url_place', str),
+            self._column(df, 'domain', str),
+            self._column(df, 'predicted_stars', float),
+            self._column(df, 'cluster_id', int),
         )
+        return [
+            Restaurant(
+                id=id_place,
+                title=title,
+                category=category,
+                address=address,
+                district=district,
+                lat=lat,
+                long=long,
+                stars=stars,
+                reviews=reviews,
+                phone_number=phone_number,
+                complete_phone_number=complete_phone_number,
+                url=url,
+                url_place=url_place,
+                domain=domain,
+                predicted_stars=predicted_stars,
+                cluster_id=cluster_id,
+                created_at=loaded_at,
+                validate=False
+            )
+            for (id_place, title, category, address, district, lat, long, stars, reviews,
+                 phone_number, complete_phone_number, url, url_place, domain,
+                 predicted_stars, cluster_id) in columns
+        ]
 
     def _get_all_restaurants(self) -> List[Restaurant]:
         """Obtiene todos los restaurantes con cache."""
         if self._restaurants_cache is None:
-            self._restaurants_cache = [
-                self._row_to_entity(row)
-                for _, row in self._df.iterrows()
-            ]
+            with stage('repository.restaurants.build_entities'):
+                self._restaurants_cache = self._frame_to_entities(self._df)
         return self._restaurants_cache
 
     def find_all(self) -> List[Restaurant]:
         return self._get_all_restaurants()
 
+    def _at_positions(self, positions) -> List[Restaurant]:
+        restaurants = self._get_all_restaurants()
+        return [restaurants[position] for position in positions]
+
     def find_by_id(self, restaurant_id: str) -> Optional[Restaurant]:
-        result = self._df[self._df['id_place'] == restaurant_id]
-        if result.empty:
+        position = self.source.position_of(restaurant_id)
+        if position is None:
             return None
-        return self._row_to_entity(result.iloc[0])
+        return self._get_all_restaurants()[position]
 
     def find_by_district(self, district: str) -> List[Restaurant]:
-        filtered = self._df[self._df['district'].str.lower() == district.lower()]
-        return [self._row_to_entity(row) for _, row in filtered.iterrows()]
+        return self._at_positions(self.source.positions_by_district(district))
 
     def find_by_category(self, category: str) -> List[Restaurant]:
-        filtered = self._df[self._df['category'].str.lower() == category.lower()]
-        return [self._row_to_entity(row) for _, row in filtered.iterrows()]
+        return self._at_positions(self.source.positions_by_category(category))
+
+    def find_matching(
+        self,
+        category: Optional[str] = None,
+        district: Optional[str] = None,
+        min_rating: Optional[float] = None
+    ) -> List[Restaurant]:
+        """
+        Filtros combinados sobre vectores: las claves de categoría se evalúan
+        una vez por categoría distinta y las filas se comparan por código.
+        """
+        mask = np.ones(len(self._df), dtype=bool)
+
+        if category:
+            preferred = category.lower()
+            matching = self.source.category_keys.codes_where(
+                lambda key: preferred in key or key in preferred
+            )
+            mask &= self.source.category_keys.mask_for(matching)
 
+        if district:
+            code = self.source.district_keys.code_of(district)
+            if code < 0:
+                return []
+            mask &= self.source.district_keys.codes == code
+
+        if min_rating:
+            mask &= self._df['stars'].to_numpy() >= min_rating
+
+        return self._at_positions(np.flatnonzero(mask))
+
+    @timed('repository.restaurants.find_nearby')
     def find_nearby(self, lat: float, long: float, radius_km: float) -> List[Restaurant]:
         """Buscar restaurantes cercanos usando distancia euclidiana aproximada."""
-        def calculate_distance(row):
-            lat_diff = (row['lat'] - lat) * 111
-            long_diff = (row['long'] - long) * 111 * np.cos(np.radians(lat))
-            return np.sqrt(lat_diff ** 2 + long_diff ** 2)
+        lat_diff = (self._df['lat'].to_numpy() - lat) * 111
+        long_diff = (self._df['long'].to_numpy() - long) * 111 * np.cos(np.radians(lat))
+        distance = np.sqrt(lat_diff ** 2 + long_diff ** 2)
 
-        self._df['distance'] = self._df.apply(calculate_distance, axis=1)
-        nearby = self._df[self._df['distance'] <= radius_km].copy()
-        nearby = nearby.sort_values('distance')
+        positions = np.flatnonzero(distance <= radius_km)
+        positions = positions[np.argsort(distance[positions], kind='stable')]
 
-        return [self._row_to_entity(row) for _, row in nearby.iterrows()]
+        return self._at_positions(positions)
+
+    def _positions_sorted_desc(self, column: str, mask: np.ndarray) -> np.ndarray:
+        """Posiciones que cumplen `mask`, de mayor a menor `column`."""
+        positions = np.flatnonzero(mask)
+        values = self._df[column].to_numpy()[positions]
+        return positions[np.argsort(-values, kind='stable')]
 
     def find_by_rating(self, min_rating: float, max_rating: float = 5.0) -> List[Restaurant]:
-        filtered = self._df[
-            (self._df['stars'] >= min_rating) &
-            (self._df['stars'] <= max_rating)
-        ]
-        return [self._row_to_entity(row) for _, row in filtered.iterrows()]
+        stars = self._df['stars'].to_numpy()
+        return self._at_positions(np.flatnonzero((stars >= min_rating) & (stars <= max_rating)))
 
     def find_highly_rated(self, min_rating: float = 4.0) -> List[Restaurant]:
-        filtered = self._df[self._df['stars'] >= min_rating]
-        filtered = filtered.sort_values('stars', ascending=False)
-        return [self._row_to_entity(row) for _, row in filtered.iterrows()]
+        mask = self._df['stars'].to_numpy() >= min_rating
+        return self._at_positions(self._positions_sorted_desc('stars', mask))
 
     def find_popular(self, min_reviews: int = 50) -> List[Restaurant]:
-        filtered = self._df[self._df['reviews'] >= min_reviews]
-        filtered = filtered.sort_values('reviews', ascending=False)
-        return [self._row_to_entity(row) for _, row in filtered.iterrows()]
+        mask = self._df['reviews'].to_numpy() >= min_reviews
+        return self._at_positions(self._positions_sorted_desc('reviews', mask))
 
     def count(self) -> int:
         return len(self._df)
@@ -150,5 +233,4 @@ class CSVRestaurantRepository(RestaurantRepository):
             return []
 
     def reload(self) -> None:
-        self._restaurants_cache = None
-        self._load_data()
+        self.source.reload()
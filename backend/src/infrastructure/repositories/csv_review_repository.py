@@ -3,13 +3,18 @@ CSV Review Repository Implementation
 Implementación del repositorio de reseñas usando archivos CSV.
 """
 
+import base64
+import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from src.domain.repositories import ReviewRepository
 from src.domain.entities import Review, Sentiment
+from src.shared.instrumentation import timed
+from .key_codes import KeyCodes
 
 
 class CSVReviewRepository(ReviewRepository):
@@ -27,8 +32,13 @@ class CSVReviewRepository(ReviewRepository):
         """
         self.csv_path = Path(csv_path)
         self._df: Optional[pd.DataFrame] = None
+        # Códigos por restaurante/sentimiento (se construyen al usarse)
+        self._position_indexes: Dict[str, KeyCodes] = {}
+        # Se notifican las reseñas nuevas agregadas con save()
+        self._listeners: List[Callable[[Review], None]] = []
         self._load_data()
 
+    @timed('csv_load.reviews')
     def _load_data(self) -> None:
         """Cargar datos desde el archivo CSV"""
         if not self.csv_path.exists():
@@ -64,84 +74,264 @@ class CSVReviewRepository(ReviewRepository):
             if 'review_date' in self._df.columns:
                 self._df['review_date'] = pd.to_datetime(self._df['review_date'], errors='coerce')
 
+            self._encode_categorical_columns()
+
+            self._position_indexes = {}
             print(f" Reseñas cargadas: {len(self._df):,} registros desde {self.csv_path}")
             print(f" - Columna de texto: '{self.text_column}'")
 
         except Exception as e:
             raise Exception(f"Error cargando reseñas desde CSV: {e}")
 
-    def _row_to_entity(self, row: pd.Series) -> Review:
-        """
-        Convertir una fila del DataFrame a entidad Review.
+    # Etiqueta del CSV (en minúsculas) -> enum
+    SENTIMENT_BY_LABEL = {sentiment.value: sentiment for sentiment in Sentiment}
+    PROBABILITY_COLUMNS = ('prob_positivo', 'prob_neutro', 'prob_negativo')
 
-        Args:
-            row: Fila del DataFrame
+    @staticmethod
+    def _nullable(values: pd.Series) -> list:
+        """Columna como lista de valores Python con None en lugar de NaN."""
+        return values.astype(object).where(values.notna(), None).tolist()
 
-        Returns:
-            Entidad Review
+    # Columnas repetidas en cientos de miles de filas: dtype category
+    CATEGORICAL_COLUMNS = ('id_place', 'sentimiento')
+
+    def _encode_categorical_columns(self) -> None:
+        """Convertir id_place/sentimiento a category (un str por valor distinto)."""
+        for column in self.CATEGORICAL_COLUMNS:
+            if column in self._df.columns and not isinstance(self._df[column].dtype, pd.CategoricalDtype):
+                self._df[column] = self._df[column].astype('category')
+
+    def _frame_to_entities(self, df: pd.DataFrame) -> List[Review]:
         """
-        # Convertir sentimiento a enum si existe
-        sentiment = None
-        if 'sentimiento' in row and pd.notna(row['sentimiento']):
-            sentiment_str = str(row['sentimiento']).lower()
-            if sentiment_str in ['positivo', 'neutro', 'negativo']:
-                sentiment = Sentiment(sentiment_str)
-
-        # Extraer probabilidades si existen
-        sentiment_probs = None
-        if all(col in row for col in ['prob_positivo', 'prob_neutro', 'prob_negativo']):
-            sentiment_probs = {
-                'positivo': float(row['prob_positivo']) if pd.notna(row['prob_positivo']) else None,
-                'neutro': float(row['prob_neutro']) if pd.notna(row['prob_neutro']) else None,
-                'negativo': float(row['prob_negativo']) if pd.notna(row['prob_negativo']) else None
-            }
+        Convertir filas del DataFrame a entidades Review.
 
-        # Calcular confianza si existen probabilidades
-        sentiment_confidence = None
+        Cada columna se extrae una sola vez (sin iterrows) y las entidades se
+        construyen sin revalidar: los datos ya fueron limpiados al generar
+        el CSV.
 
-        if sentiment_probs and any(v is not None for v in sentiment_probs.values()):
-            sentiment_confidence = max(v for v in sentiment_probs.values() if v is not None)
+        Args:
+            df: Subconjunto del DataFrame de reseñas
 
-        # Obtener el texto del comentario (puede ser 'caption' o 'comment')
-        comment_text = str(row.get(self.text_column, row.get('comment', '')))
+        Returns:
+            Lista de entidades Review en el orden de las filas
+        """
+        n_rows = len(df)
+        if n_rows == 0:
+            return []
 
-        return Review(
-            id=str(row['id_review']),
-            id_place=str(row['id_place']),
-            comment=comment_text,
-            rating=int(row['rating']),
-            username=str(row['username']),
-            review_date=row.get('review_date', datetime.now()),
-            sentiment=sentiment,
-            sentiment_confidence=sentiment_confidence,
-            sentiment_probabilities=sentiment_probs,
-            processed_comment=row.get('comment_processed', None)
-        )
+        # Convertir sentimiento a enum si existe
+        if 'sentimiento' in df.columns:
+            labels = df['sentimiento'].astype(str).str.lower().map(self.SENTIMENT_BY_LABEL)
+            sentiments = self._nullable(labels)
+        else:
+            sentiments = [None] * n_rows
+
+        # Probabilidades y confianza (máxima probabilidad disponible)
+        if all(col in df.columns for col in self.PROBABILITY_COLUMNS):
+            probabilities = df[list(self.PROBABILITY_COLUMNS)].astype(float)
+            confidences = self._nullable(probabilities.max(axis=1))
+            probability_dicts = [
+                {
+                    'positivo': positivo,
+                    'neutro': neutro,
+                    'negativo': negativo
+                }
+                for positivo, neutro, negativo in zip(
+                    *(self._nullable(probabilities[col]) for col in self.PROBABILITY_COLUMNS)
+                )
+            ]
+        else:
+            confidences = [None] * n_rows
+            probability_dicts = [None] * n_rows
+
+        # Texto del comentario (puede ser 'caption' o 'comment')
+        text_column = self.text_column if self.text_column in df.columns else 'comment'
+        comments = [str(value) for value in df[text_column].tolist()] if text_column in df.columns else [''] * n_rows
+
+        review_dates = df['review_date'].tolist() if 'review_date' in df.columns else [datetime.now()] * n_rows
+        processed = df['comment_processed'].tolist() if 'comment_processed' in df.columns else [None] * n_rows
+
+        return [
+            Review(
+                id=review_id,
+                id_place=id_place,
+                comment=comment,
+                rating=rating,
+                username=username,
+                review_date=review_date,
+                sentiment=sentiment,
+                sentiment_confidence=confidence,
+                sentiment_probabilities=probabilities_dict,
+                processed_comment=processed_comment,
+                validate=False
+            )
+            for review_id, id_place, comment, rating, username, review_date,
+                sentiment, confidence, probabilities_dict, processed_comment in zip(
+                [str(value) for value in df['id_review'].tolist()],
+                [str(value) for value in df['id_place'].tolist()],
+                comments,
+                df['rating'].astype(int).tolist(),
+                [str(value) for value in df['username'].tolist()],
+                review_dates,
+                sentiments,
+                confidences,
+                probability_dicts,
+                processed
+            )
+        ]
 
     def find_by_id(self, review_id: str) -> Optional[Review]:
         """Buscar reseña por ID"""
         result = self._df[self._df['id_review'] == review_id]
         if result.empty:
             return None
-        return self._row_to_entity(result.iloc[0])
+        return self._frame_to_entities(result.iloc[:1])[0]
 
+    @timed('repository.reviews.find_by_restaurant')
     def find_by_restaurant(self, restaurant_id: str) -> List[Review]:
         """Buscar todas las reseñas de un restaurante"""
-        results = self._df[self._df['id_place'] == restaurant_id]
-        return [self._row_to_entity(row) for _, row in results.iterrows()]
+        positions = self._index_for('id_place').positions_of(restaurant_id)
+        return self._frame_to_entities(self._df.iloc[positions])
 
     def find_by_sentiment(self, sentiment: str) -> List[Review]:
         """Buscar reseñas por sentimiento"""
         if 'sentimiento' not in self._df.columns:
             return []
 
-        results = self._df[self._df['sentimiento'].str.lower() == sentiment.lower()]
-        return [self._row_to_entity(row) for _, row in results.iterrows()]
+        positions = self._index_for('sentimiento').positions_of(sentiment)
+        return self._frame_to_entities(self._df.iloc[positions])
 
     def find_all(self, limit: Optional[int] = None) -> List[Review]:
         """Obtener todas las reseñas"""
         df_subset = self._df.head(limit) if limit else self._df
-        return [self._row_to_entity(row) for _, row in df_subset.iterrows()]
+        return self._frame_to_entities(df_subset)
+
+    # ========== Paginación por cursor y exportación ==========
+
+    EXPORT_COLUMNS = ('id_review', 'id_place', 'rating', 'username', 'review_date', 'sentimiento')
+
+    def _index_for(self, column: str) -> KeyCodes:
+        """
+        Códigos enteros y posiciones de fila por valor de una columna.
+
+        Los ids de restaurante se indexan tal cual (distinguen mayúsculas);
+        el resto de columnas en minúsculas.
+        """
+        if column not in self._position_indexes:
+            self._position_indexes[column] = KeyCodes(
+                self._df[column], case_sensitive=(column == 'id_place')
+            )
+        return self._position_indexes[column]
+
+    def _filtered_positions(self, restaurant_id: Optional[str], sentiment: Optional[str]) -> np.ndarray:
+        """Posiciones (ordenadas) de las filas que cumplen los filtros."""
+        if restaurant_id is None and sentiment is None:
+            return np.arange(len(self._df))
+
+        if sentiment is not None:
+            if 'sentimiento' not in self._df.columns:
+                return np.empty(0, dtype=np.intp)
+            sentiment_keys = self._index_for('sentimiento')
+            if restaurant_id is None:
+                return sentiment_keys.positions_of(sentiment)
+
+        positions = self._index_for('id_place').positions_of(str(restaurant_id))
+        if sentiment is not None:
+            code = sentiment_keys.code_of(sentiment)
+            if code < 0:
+                # Sentimiento desconocido: -1 también es el código de los nulos
+                return np.empty(0, dtype=np.intp)
+            # Comparación de códigos sobre las filas del restaurante
+            positions = positions[sentiment_keys.codes[positions] == code]
+        return positions
+
+    @staticmethod
+    def _filter_key(restaurant_id: Optional[str], sentiment: Optional[str]) -> str:
+        return f"{restaurant_id or ''}|{(sentiment or '').lower()}"
+
+    @classmethod
+    def encode_cursor(cls, position: int, restaurant_id: Optional[str], sentiment: Optional[str]) -> str:
+        """Cursor opaco: posición de la siguiente fila + filtros con que se generó."""
+        payload = json.dumps({'p': position, 'f': cls._filter_key(restaurant_id, sentiment)})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, cursor: str, restaurant_id: Optional[str], sentiment: Optional[str]) -> int:
+        """Posición codificada en el cursor; ValueError si es inválido o de otros filtros."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            position = int(payload['p'])
+            filter_key = payload['f']
+        except Exception:
+            raise ValueError("Cursor inválido")
+
+        if position < 0 or filter_key != cls._filter_key(restaurant_id, sentiment):
+            raise ValueError("El cursor no corresponde a estos filtros")
+        return position
+
+    @timed('repository.reviews.find_page')
+    def find_page(
+        self,
+        restaurant_id: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Review], Optional[str]]:
+        """
+        Página de reseñas con cursor opaco.
+
+        El cursor guarda la posición de fila de la siguiente reseña; como
+        save() solo agrega filas al final, las páginas son estables ante
+        inserciones.
+        """
+        positions = self._filtered_positions(restaurant_id, sentiment)
+
+        start = 0
+        if cursor:
+            start = int(np.searchsorted(positions, self.decode_cursor(cursor, restaurant_id, sentiment)))
+
+        page_positions = positions[start:start + limit]
+        reviews = self._frame_to_entities(self._df.iloc[page_positions])
+
+        next_cursor = None
+        if start + limit < len(positions):
+            next_cursor = self.encode_cursor(int(positions[start + limit]), restaurant_id, sentiment)
+
+        return reviews, next_cursor
+
+    def iter_records(
+        self,
+        restaurant_id: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorrer reseñas en bloques de diccionarios con tipos nativos.
+
+        Solo se materializa un bloque a la vez (sin entidades Review).
+        """
+        positions = self._filtered_positions(restaurant_id, sentiment)
+        columns = [col for col in self.EXPORT_COLUMNS if col in self._df.columns]
+        columns.insert(2, self.text_column)
+
+        for start in range(0, len(positions), chunk_size):
+            chunk = self._df.iloc[positions[start:start + chunk_size]][columns]
+            if 'review_date' in chunk.columns:
+                chunk = chunk.assign(review_date=chunk['review_date'].map(
+                    lambda value: value.isoformat() if pd.notna(value) else None
+                ))
+            chunk = chunk.rename(columns={self.text_column: 'comment'})
+            yield chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+
+    def add_listener(self, listener: Callable[[Review], None]) -> None:
+        """
+        Registrar un callback para cada reseña nueva guardada con save().
+
+        Las actualizaciones de reseñas existentes no se notifican. El callback
+        corre en el thread del llamador: debe encolar, no procesar.
+        """
+        self._listeners.append(listener)
 
     def save(self, review: Review) -> Review:
         """
@@ -178,11 +368,24 @@ class CSVReviewRepository(ReviewRepository):
             # Actualizar
             for col, val in review_dict.items():
                 if col in self._df.columns:
+                    column = self._df[col]
+                    if isinstance(column.dtype, pd.CategoricalDtype) and val is not None \
+                            and val not in column.cat.categories:
+                        self._df[col] = column.cat.add_categories([val])
                     self._df.loc[existing_idx[0], col] = val
         else:
             # Agregar nueva fila
             new_row = pd.DataFrame([review_dict])
             self._df = pd.concat([self._df, new_row], ignore_index=True)
+            self._encode_categorical_columns()
+        self._position_indexes = {}
+
+        if existing_idx.empty:
+            for listener in self._listeners:
+                try:
+                    listener(review)
+                except Exception as e:
+                    print(f" Listener de reseñas falló: {e}")
 
         return review
 
@@ -198,57 +401,65 @@ class CSVReviewRepository(ReviewRepository):
         self._df.to_csv(path, index=False)
         print(f" Reseñas guardadas en: {path}")
 
+    @timed('repository.reviews.count_by_restaurant')
     def count_by_restaurant(self, restaurant_id: str) -> int:
         """Contar reseñas de un restaurante"""
-        return len(self._df[self._df['id_place'] == restaurant_id])
+        return len(self._index_for('id_place').positions_of(restaurant_id))
 
     def get_sentiment_stats(self, restaurant_id: str) -> dict:
         """Obtener estadísticas de sentimientos para un restaurante"""
-        if 'sentimiento' not in self._df.columns:
-            return {
-                'total': 0,
-                'sentiments': {},
-                'percentages': {}
-            }
-
-        reviews = self._df[self._df['id_place'] == restaurant_id]
-        total = len(reviews)
+        return self.get_sentiment_stats_bulk([restaurant_id])[restaurant_id]
 
-        if total == 0:
-            return {
-                'total': 0,
-                'sentiments': {},
-                'percentages': {}
-            }
+    @timed('repository.reviews.sentiment_stats')
+    def get_sentiment_stats_bulk(self, restaurant_ids: List[str]) -> Dict[str, dict]:
+        """
+        Estadísticas de sentimientos de varios restaurantes.
 
-        # Contar por sentimiento
-        sentiment_counts = reviews['sentimiento'].value_counts().to_dict()
+        Las filas se obtienen con el índice por restaurante (sin recorrer
+        todo el DataFrame) y los sentimientos se cuentan por código entero.
+        """
+        empty_stats = {'total': 0, 'sentiments': {}, 'percentages': {}}
+        stats = {restaurant_id: dict(empty_stats) for restaurant_id in restaurant_ids}
 
-        # Calcular porcentajes
-        sentiment_percentages = {
-            k: (v / total) * 100
-            for k, v in sentiment_counts.items()
-        }
+        if 'sentimiento' not in self._df.columns or not restaurant_ids:
+            return stats
 
-        # Confianza promedio si existe
-        avg_confidence = None
-        confidence_col = None
+        restaurant_keys = self._index_for('id_place')
+        sentiment_keys = self._index_for('sentimiento')
 
-        # Buscar columna de confianza (puede tener diferentes nombres)
+        # Confianza promedio si existe (puede tener diferentes nombres)
+        confidences = None
         for col in ['sentiment_confidence', 'sentimiento_confidence', 'confidence']:
-            if col in reviews.columns:
-                confidence_col = col
+            if col in self._df.columns:
+                confidences = pd.to_numeric(self._df[col], errors='coerce').to_numpy(dtype=float)
                 break
 
-        if confidence_col:
-            avg_confidence = reviews[confidence_col].mean()
+        for restaurant_id in stats:
+            positions = restaurant_keys.positions_of(restaurant_id)
+            total = len(positions)
+            if not total:
+                continue
 
-        return {
-            'total': total,
-            'sentiments': sentiment_counts,
-            'percentages': sentiment_percentages,
-            'avg_confidence': float(avg_confidence) if pd.notna(avg_confidence) else None
-        }
+            counts = sentiment_keys.counts(positions)
+            by_sentiment = {
+                sentiment_keys.keys[code]: int(count)
+                for code, count in enumerate(counts) if count
+            }
+
+            avg_confidence = None
+            if confidences is not None:
+                values = confidences[positions]
+                values = values[~np.isnan(values)]
+                avg_confidence = float(values.mean()) if len(values) else None
+
+            stats[restaurant_id] = {
+                'total': total,
+                'sentiments': by_sentiment,
+                'percentages': {k: (v / total) * 100 for k, v in by_sentiment.items()},
+                'avg_confidence': avg_confidence
+            }
+
+        return stats
 
     def reload(self) -> None:
         """Recargar datos desde el archivo CSV"""
@@ -0,0 +1,84 @@
+"""
+Key Codes
+Codificación entera de columnas de texto con claves normalizadas.
+
+Cada fila guarda el código (int8/int16/int32 según la cardinalidad) de su
+clave en minúsculas; los filtros se resuelven buscando el código de la clave
+una sola vez y comparando vectores de enteros, en lugar de `.str.lower() ==`
+sobre cada fila.
+"""
+
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class KeyCodes:
+    """Códigos enteros por fila + tabla clave -> código + posiciones por código."""
+
+    __slots__ = ('codes', 'keys', 'case_sensitive', '_code_by_key', '_order', '_bounds')
+
+    def __init__(self, values: pd.Series, case_sensitive: bool = False):
+        """
+        Args:
+            values: Columna de texto (object, str o category)
+            case_sensitive: Si False las claves se normalizan a minúsculas
+        """
+        self.case_sensitive = case_sensitive
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Se normalizan solo los valores distintos y se remapean los códigos
+            categories = values.cat.categories.astype(str)
+            if not case_sensitive:
+                categories = categories.str.lower()
+            key_codes, keys = pd.factorize(categories, sort=True)
+            codes = values.cat.codes.to_numpy()
+            self.codes: np.ndarray = np.where(codes >= 0, key_codes[codes], -1).astype(codes.dtype)
+            self.keys: List[str] = list(keys)
+        else:
+            # Nulos explícitos: con pandas < 3 astype(str) los convierte en 'nan'/'None'
+            keys = values.astype(str).where(values.notna())
+            if not case_sensitive:
+                keys = keys.str.lower()
+            categorical = pd.Categorical(keys)
+            self.codes = categorical.codes  # -1 = nulo
+            self.keys = list(categorical.categories)
+        self._code_by_key: Dict[str, int] = {key: code for code, key in enumerate(self.keys)}
+
+        # Posiciones agrupadas por código (orden estable: ascendentes en cada grupo)
+        self._order = np.argsort(self.codes, kind='stable')
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.keys))
+        first_valid = int(np.count_nonzero(self.codes < 0))
+        self._bounds = first_valid + np.concatenate(([0], np.cumsum(counts)))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def normalize(self, value: str) -> str:
+        return str(value) if self.case_sensitive else str(value).lower()
+
+    def code_of(self, value: str) -> int:
+        """Código de la clave de `value`, o -1 si no existe."""
+        return self._code_by_key.get(self.normalize(value), -1)
+
+    def positions_of_code(self, code: int) -> np.ndarray:
+        """Posiciones de fila (ascendentes) con el código dado."""
+        if code < 0:
+            return np.empty(0, dtype=np.intp)
+        return self._order[self._bounds[code]:self._bounds[code + 1]]
+
+    def positions_of(self, value: str) -> np.ndarray:
+        return self.positions_of_code(self.code_of(value))
+
+    def codes_where(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Códigos cuyas claves cumplen `predicate` (se evalúa una vez por clave)."""
+        return np.array([code for code, key in enumerate(self.keys) if predicate(key)], dtype=self.codes.dtype)
+
+    def mask_for(self, codes) -> np.ndarray:
+        """Máscara booleana de las filas con alguno de los `codes`."""
+        return np.isin(self.codes, codes)
+
+    def counts(self, positions: np.ndarray) -> np.ndarray:
+        """Conteo por código en un subconjunto de filas (ignora nulos)."""
+        subset = self.codes[positions]
+        return np.bincount(subset[subset >= 0], minlength=len(self.keys))
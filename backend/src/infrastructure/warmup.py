@@ -0,0 +1,272 @@
+"""
+Warm-up
+Precarga de datasets, índices, caches y modelos al arrancar el worker.
+
+Sin esta etapa, las primeras peticiones de cada worker pagan el trabajo
+perezoso: parseo de CSVs, carga de los .pkl, construcción de entidades e
+índices y la sobrecarga de la primera llamada a sklearn. El lifespan de la
+API ejecuta `run_warmup()` y /health reporta "ready" solo al terminar.
+
+Modo configurable con WARMUP_MODE:
+- blocking (por defecto): el servidor no acepta tráfico hasta terminar
+- background: acepta tráfico y /health responde 503 mientras calienta
+- off: sin warm-up (ready inmediato, comportamiento perezoso anterior)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+WARMUP_MODES = ('blocking', 'background', 'off')
+
+# Textos representativos para la primera predicción del modelo de sentimientos
+WARMUP_COMMENTS = [
+    "La comida estuvo excelente y el servicio muy amable",
+    "Pésimo servicio, la comida llegó fría",
+    "Normal, nada especial",
+]
+
+# Reseñas en la carpeta por defecto del contenedor
+REVIEWS_CSV_PATH = 'data/processed/modelo_limpio.csv'
+
+
+def warmup_mode_from_env() -> str:
+    """Modo de warm-up desde WARMUP_MODE (blocking/background/off)."""
+    mode = os.getenv('WARMUP_MODE', 'blocking').strip().lower()
+    return mode if mode in WARMUP_MODES else 'blocking'
+
+
+@dataclass
+class WarmupStep:
+    """Resultado de un paso del warm-up."""
+    name: str
+    status: str = 'pending'  # ok / skipped / error
+    duration_ms: float = 0.0
+    detail: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'duration_ms': round(self.duration_ms, 1),
+            'detail': self.detail
+        }
+
+
+@dataclass
+class WarmupState:
+    """Estado global del warm-up consultado por /health."""
+    status: str = 'pending'  # pending / running / ready
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    steps: List[WarmupStep] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == 'ready'
+
+    @property
+    def total_ms(self) -> float:
+        return sum(step.duration_ms for step in self.steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.status,
+            'ready': self.ready,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'total_ms': round(self.total_ms, 1),
+            'steps': [step.to_dict() for step in self.steps]
+        }
+
+
+warmup_state = WarmupState()
+_background_task: Optional[asyncio.Task] = None
+
+
+def get_warmup_state() -> WarmupState:
+    return warmup_state
+
+
+class _SkipStep(Exception):
+    """El recurso del paso no está disponible (no es un error del warm-up)."""
+
+
+# ========== Pasos ==========
+
+def _warm_catalogue() -> str:
+    from src.infrastructure.container import get_catalogue_source
+
+    # Parseo del CSV + carga de modelos de clustering/rating + columnas ML + índices
+    source = get_catalogue_source()
+    return f"{len(source.df)} restaurantes, versión {source.dataset_version}"
+
+
+def _warm_restaurant_repository() -> str:
+    from src.infrastructure.container import get_restaurant_repository
+
+    repository = get_restaurant_repository()
+    restaurants = repository.find_all()  # cache de entidades
+    categories = repository.get_categories()
+    districts = repository.get_districts()
+    return f"{len(restaurants)} entidades, {len(categories)} categorías, {len(districts)} distritos"
+
+
+async def _warm_districts() -> str:
+    from src.infrastructure.container import get_district_service
+
+    service = get_district_service()
+    dropdown = await service.get_districts_for_dropdown()  # tabla de estadísticas
+    await service.get_districts_statistics()
+    return f"{len(dropdown)} distritos"
+
+
+def _warm_reviews() -> str:
+    from src.infrastructure.container import get_review_repository
+
+    try:
+        repository = get_review_repository(REVIEWS_CSV_PATH)
+    except FileNotFoundError as e:
+        raise _SkipStep(str(e))
+
+    # Índices por restaurante y sentimiento (paginación y estadísticas)
+    reviews, _ = repository.find_page(limit=1)
+    if not reviews:
+        return "sin reseñas"
+    repository.get_sentiment_stats_bulk([reviews[0].id_place])
+    repository.find_page(sentiment='positivo', limit=1)
+    return "índices por restaurante y sentimiento"
+
+
+def _warm_sentiment_model() -> str:
+    from src.infrastructure.container import get_sentiment_model
+
+    model = get_sentiment_model()
+    if not model.is_trained:
+        raise _SkipStep("modelo de sentimientos no entrenado")
+
+    model.predict_batch(WARMUP_COMMENTS)
+    model.predict_single(WARMUP_COMMENTS[0])
+    return f"{len(WARMUP_COMMENTS)} predicciones"
+
+
+def _warm_ml_models() -> str:
+    from src.infrastructure.container import get_catalogue_source
+    from src.infrastructure.ml import (
+        CatalogueEnricher,
+        get_clustering_model,
+        get_rating_model,
+        get_recommender_system
+    )
+
+    clustering_model = get_clustering_model()
+    rating_model = get_rating_model()
+    recommender = get_recommender_system()
+
+    # Predicción de prueba de clustering/rating sobre una copia pequeña del catálogo
+    sample = get_catalogue_source().df.head(8).copy()
+    CatalogueEnricher(clustering_model=clustering_model, rating_model=rating_model).enrich(sample)
+
+    loaded = [
+        name for name, model in (
+            ('clustering', clustering_model),
+            ('rating', rating_model),
+            ('recommender', recommender)
+        ) if model is not None
+    ]
+    return f"modelos: {', '.join(loaded) or 'ninguno'}"
+
+
+def _warm_recommendations() -> str:
+    from src.application import RecommendationService, RecommendationRequestDTO
+    from src.infrastructure.container import get_catalogue_source, get_restaurant_repository
+
+    df = get_catalogue_source().df
+    request = RecommendationRequestDTO(
+        user_location={'lat': float(df['lat'].median()), 'long': float(df['long'].median())},
+        top_n=10
+    )
+    response = RecommendationService(get_restaurant_repository()).get_recommendations(request)
+    return f"{response.total_found} recomendaciones de prueba"
+
+
+WARMUP_STEPS: List[tuple] = [
+    ('catalogue', _warm_catalogue),
+    ('restaurant_repository', _warm_restaurant_repository),
+    ('districts', _warm_districts),
+    ('reviews', _warm_reviews),
+    ('sentiment_model', _warm_sentiment_model),
+    ('ml_models', _warm_ml_models),
+    ('recommendations', _warm_recommendations),
+]
+
+
+async def _run_step(name: str, func: Callable[[], Any]) -> WarmupStep:
+    step = WarmupStep(name)
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(func):
+            step.detail = await func()
+        else:
+            # Los pasos síncronos (pandas/sklearn) no bloquean el event loop
+            step.detail = await asyncio.get_running_loop().run_in_executor(None, func)
+        step.status = 'ok'
+    except _SkipStep as e:
+        step.status = 'skipped'
+        step.detail = str(e)
+    except Exception as e:
+        step.status = 'error'
+        step.detail = f"{type(e).__name__}: {e}"
+    step.duration_ms = (time.perf_counter() - start) * 1000
+    return step
+
+
+async def run_warmup(state: Optional[WarmupState] = None) -> WarmupState:
+    """
+    Ejecutar todos los pasos de warm-up en orden y registrar sus tiempos.
+
+    Un paso que falla no detiene los siguientes: el error queda en el
+    estado y el worker pasa a "ready" igualmente (las rutas afectadas
+    responden como lo harían sin warm-up).
+    """
+    state = state or warmup_state
+    state.status = 'running'
+    state.started_at = datetime.now()
+    state.steps = []
+
+    print("Warm-up: precargando datasets, índices y modelos...")
+    for name, func in WARMUP_STEPS:
+        step = await _run_step(name, func)
+        state.steps.append(step)
+        print(f" {step.name:24s} {step.status:8s} {step.duration_ms:9.1f} ms  {step.detail or ''}")
+
+    state.status = 'ready'
+    state.finished_at = datetime.now()
+    print(f"Warm-up completado en {state.total_ms:.0f} ms")
+    return state
+
+
+def start_warmup(mode: Optional[str] = None) -> Optional[Awaitable]:
+    """
+    Iniciar el warm-up según el modo.
+
+    Returns:
+        - blocking: corutina que el lifespan debe esperar
+        - background: None (se programa una tarea en el event loop)
+        - off: None (el estado pasa a ready de inmediato)
+    """
+    global _background_task
+
+    mode = mode or warmup_mode_from_env()
+    if mode == 'off':
+        warmup_state.status = 'ready'
+        return None
+    if mode == 'background':
+        # Se guarda la referencia para que la tarea no sea recolectada
+        _background_task = asyncio.get_running_loop().create_task(run_warmup())
+        return None
+    return run_warmup()
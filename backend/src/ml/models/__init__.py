@@ -1,13 +1,41 @@
 """
 ML Models Package
 Modelos de Machine Learning del sistema.
+
+Los modelos se importan de forma diferida (PEP 562): sklearn y NLTK solo se
+cargan cuando se accede a una clase, no al importar el paquete.
 """
 
-from .base_model import BaseMLModel
-from .clustering_model import RestaurantClusteringModel
-from .rating_predictor import RatingPredictorModel
-from .recommender_system import RestaurantRecommenderSystem
-from .sentiment_model import SentimentAnalysisModel
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_LAZY_MODELS = {
+    'BaseMLModel': '.base_model',
+    'RestaurantClusteringModel': '.clustering_model',
+    'RatingPredictorModel': '.rating_predictor',
+    'RestaurantRecommenderSystem': '.recommender_system',
+    'SentimentAnalysisModel': '.sentiment_model',
+}
+
+if TYPE_CHECKING:
+    from .base_model import BaseMLModel
+    from .clustering_model import RestaurantClusteringModel
+    from .rating_predictor import RatingPredictorModel
+    from .recommender_system import RestaurantRecommenderSystem
+    from .sentiment_model import SentimentAnalysisModel
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODELS:
+        value = getattr(import_module(_LAZY_MODELS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_MODELS))
+
 
 __all__ = [
     'BaseMLModel',
@@ -15,4 +43,4 @@ __all__ = [
     'RatingPredictorModel',
     'RestaurantRecommenderSystem',
     'SentimentAnalysisModel',
-]
\ No newline at end of file
+]
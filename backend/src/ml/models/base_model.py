@@ -91,14 +91,21 @@ class BaseMLModel(ABC):
             raise FileNotFoundError(f"Modelo no encontrado: {model_path}")
 
         model_data = joblib.load(model_path)
+        self._restore(model_data)
 
+        print(f"Modelo cargado: {model_path}")
+        return self
+
+    def _restore(self, model_data: Dict[str, Any]) -> None:
+        """Restaurar el estado desde el diccionario del artefacto ya deserializado."""
         self.model = model_data['model']
         self.metadata = model_data.get('metadata', {})
         self.is_trained = model_data.get('is_trained', False)
         self.model_name = model_data.get('model_name', self.model_name)
 
-        print(f"Modelo cargado: {model_path}")
-        return self
+        # Los artefactos guardan feature_names solo en metadata
+        if hasattr(self, 'feature_names') and not self.feature_names:
+            self.feature_names = list(self.metadata.get('feature_names', []))
 
     def get_metadata(self) -> Dict[str, Any]:
         """Obtener metadata del modelo."""
@@ -1,70 +1,216 @@
 """
 Clustering Model
 Modelo de K-Means para agrupar restaurantes similares.
+
+Para catálogos grandes (100k+ restaurantes) el modelo entrena con
+MiniBatchKMeans y estima la silhouette sobre una muestra aleatoria: KMeans
+completo y la silhouette exacta son O(N²) en tiempo y memoria. Ambos modos
+exponen `cluster_centers_`/`predict`, así que `predict` y
+`get_cluster_info` no cambian.
 """
 
+import time
+import tracemalloc
+
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn import config_context
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import silhouette_score
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from .base_model import BaseMLModel
 
 
+ALGORITHMS = ('auto', 'kmeans', 'minibatch')
+
+# Con algorithm='auto', desde este tamaño se usa MiniBatchKMeans
+MINIBATCH_THRESHOLD = 50000
+
+# Sobre este tamaño la silhouette se calcula con una muestra
+SILHOUETTE_SAMPLE_SIZE = 10000
+
+# Tope (MB) de cada bloque de distancias de la silhouette; el default de
+# sklearn (1 GB) domina el pico de memoria del entrenamiento
+SILHOUETTE_WORKING_MEMORY_MB = 64
+
+
+def make_kmeans(
+    n_clusters: int,
+    n_samples: int,
+    random_state: int = 42,
+    algorithm: str = 'auto',
+    batch_size: int = 4096
+):
+    """Estimador KMeans o MiniBatchKMeans según `algorithm` y el tamaño de los datos."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm debe ser uno de {ALGORITHMS}: {algorithm!r}")
+    if algorithm == 'minibatch' or (algorithm == 'auto' and n_samples >= MINIBATCH_THRESHOLD):
+        return MiniBatchKMeans(
+            n_clusters=n_clusters,
+            random_state=random_state,
+            batch_size=batch_size,
+            n_init=3,
+            max_iter=100
+        )
+    return KMeans(
+        n_clusters=n_clusters,
+        random_state=random_state,
+        n_init=10,
+        max_iter=300
+    )
+
+
+def silhouette_sample_for(n_samples: int, sample_size: Optional[int] = SILHOUETTE_SAMPLE_SIZE) -> Optional[int]:
+    """Tamaño de muestra efectivo para la silhouette (None = exacta sobre todos)."""
+    if sample_size is None or n_samples <= sample_size:
+        return None
+    return sample_size
+
+
+def sampled_silhouette(
+    X_scaled: np.ndarray,
+    labels: np.ndarray,
+    sample_size: Optional[int] = SILHOUETTE_SAMPLE_SIZE,
+    random_state: int = 42
+) -> float:
+    """Silhouette exacta hasta `sample_size` registros; por encima, sobre una muestra aleatoria."""
+    with config_context(working_memory=SILHOUETTE_WORKING_MEMORY_MB):
+        return float(silhouette_score(
+            X_scaled, labels,
+            sample_size=silhouette_sample_for(len(X_scaled), sample_size),
+            random_state=random_state
+        ))
+
+
 class RestaurantClusteringModel(BaseMLModel):
     """Modelo de clustering para agrupar restaurantes similares."""
 
-    def __init__(self, n_clusters: int = 5, random_state: int = 42):
+    def __init__(
+        self,
+        n_clusters: int = 5,
+        random_state: int = 42,
+        algorithm: str = 'auto',
+        batch_size: int = 4096,
+        silhouette_sample_size: Optional[int] = SILHOUETTE_SAMPLE_SIZE
+    ):
+        """
+        Args:
+            n_clusters: Número de clusters
+            random_state: Semilla de KMeans y del muestreo de la silhouette
+            algorithm: 'kmeans', 'minibatch' o 'auto' (MiniBatchKMeans desde
+                MINIBATCH_THRESHOLD registros)
+            batch_size: Tamaño de lote de MiniBatchKMeans
+            silhouette_sample_size: Registros usados para la silhouette
+                (None = todos)
+        """
         super().__init__(model_name="restaurant_clustering")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm debe ser uno de {ALGORITHMS}: {algorithm!r}")
         self.n_clusters = n_clusters
         self.random_state = random_state
+        self.algorithm = algorithm
+        self.batch_size = batch_size
+        self.silhouette_sample_size = silhouette_sample_size
         self.scaler = StandardScaler()
         self.feature_names = []
 
-    def train(self, X: pd.DataFrame, y=None) -> 'RestaurantClusteringModel':
+    def train(self, X: pd.DataFrame, y=None, measure_memory: bool = False) -> 'RestaurantClusteringModel':
+        """
+        Args:
+            X: Features de los restaurantes
+            y: No se usa (compatibilidad con BaseMLModel)
+            measure_memory: Medir el pico de memoria con tracemalloc. Repite
+                el ajuste en una pasada aparte (el tiempo registrado no
+                incluye el costo del trazado)
+        """
         print(f"Entrenando {self.model_name}...")
         print(f" Datos: {X.shape[0]} registros, {X.shape[1]} features")
         print(f" Clusters objetivo: {self.n_clusters}")
 
         self.feature_names = list(X.columns)
-        X_scaled = self.scaler.fit_transform(X)
 
-        self.model = KMeans(
-            n_clusters=self.n_clusters,
-            random_state=self.random_state,
-            n_init=10,
-            max_iter=300
-        )
-
-        self.model.fit(X_scaled)
-
-        labels = self.model.labels_
-        silhouette = silhouette_score(X_scaled, labels)
+        start = time.perf_counter()
+        labels, silhouette = self._fit(X)
+        training_time = time.perf_counter() - start
         inertia = self.model.inertia_
 
+        peak_memory_mb = self._measure_peak_memory(X) if measure_memory else None
+
+        silhouette_sample = silhouette_sample_for(X.shape[0], self.silhouette_sample_size)
         self.metadata = {
             'n_clusters': self.n_clusters,
+            'algorithm': 'minibatch' if isinstance(self.model, MiniBatchKMeans) else 'kmeans',
+            'batch_size': self.batch_size if isinstance(self.model, MiniBatchKMeans) else None,
             'silhouette_score': float(silhouette),
+            'silhouette_sample_size': silhouette_sample,
             'inertia': float(inertia),
             'n_samples': X.shape[0],
             'n_features': X.shape[1],
             'feature_names': self.feature_names,
             'cluster_sizes': {
                 int(i): int(count)
-                for i, count in enumerate(np.bincount(labels))
-            }
+                for i, count in enumerate(np.bincount(labels, minlength=self.n_clusters))
+            },
+            'training_time_s': round(training_time, 3),
+            'peak_memory_mb': peak_memory_mb
         }
 
         self.is_trained = True
 
-        print(f"Modelo entrenado exitosamente")
-        print(f" Silhouette Score: {silhouette:.3f}")
+        print(f"Modelo entrenado exitosamente ({self.metadata['algorithm']})")
+        print(f" Silhouette Score: {silhouette:.3f}"
+              + (f" (muestra {silhouette_sample})" if silhouette_sample else ""))
         print(f" Inertia: {inertia:.2f}")
         print(f" Tamanos de clusters: {self.metadata['cluster_sizes']}")
+        print(f" Tiempo: {training_time:.2f}s"
+              + (f"  Pico de memoria: {peak_memory_mb} MB" if peak_memory_mb is not None else ""))
 
         return self
 
+    def _fit(self, X: pd.DataFrame) -> Tuple[np.ndarray, float]:
+        """Escalar, ajustar el modelo y calcular la silhouette (labels, silhouette)."""
+        X_scaled = self.scaler.fit_transform(X)
+
+        self.model = make_kmeans(
+            self.n_clusters, X.shape[0],
+            random_state=self.random_state,
+            algorithm=self.algorithm,
+            batch_size=self.batch_size
+        )
+        self.model.fit(X_scaled)
+
+        labels = self.model.labels_
+        silhouette = sampled_silhouette(X_scaled, labels, self.silhouette_sample_size, self.random_state)
+        return labels, silhouette
+
+    def _measure_peak_memory(self, X: pd.DataFrame) -> Optional[float]:
+        """
+        Pico de memoria (MB) de un ajuste equivalente, medido con tracemalloc
+        sobre una copia sin entrenar del modelo.
+
+        Si tracemalloc ya está activo (p. ej. scripts/memory_report.py
+        --tracemalloc) no se mide, para no reiniciar el pico del llamador.
+        """
+        if tracemalloc.is_tracing():
+            print(" tracemalloc ya está activo: no se mide el pico de memoria del entrenamiento")
+            return None
+
+        probe = RestaurantClusteringModel(
+            n_clusters=self.n_clusters,
+            random_state=self.random_state,
+            algorithm=self.algorithm,
+            batch_size=self.batch_size,
+            silhouette_sample_size=self.silhouette_sample_size
+        )
+        tracemalloc.start()
+        try:
+            probe._fit(X)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return round(peak / 1024 ** 2, 2)
+
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         if not self.is_trained:
             raise ValueError("Modelo no entrenado. Ejecuta train() primero.")
@@ -75,6 +221,42 @@ class RestaurantClusteringModel(BaseMLModel):
 
         return clusters
 
+    def save(self, path: str) -> None:
+        """Guardar modelo incluyendo el scaler (necesario para predict)."""
+        import joblib
+        from pathlib import Path
+
+        model_path = Path(path)
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+
+        model_data = {
+            'model': self.model,
+            'scaler': self.scaler,
+            'metadata': self.metadata,
+            'is_trained': self.is_trained,
+            'model_name': self.model_name
+        }
+
+        joblib.dump(model_data, model_path)
+        print(f"Modelo guardado: {model_path}")
+
+    def _restore(self, model_data: Dict[str, Any]) -> None:
+        """Restaurar además scaler y n_clusters (el artefacto se deserializa una vez)."""
+        super()._restore(model_data)
+
+        if model_data.get('scaler') is not None:
+            self.scaler = model_data['scaler']
+        if not self.can_predict:
+            print(" Artefacto sin scaler ajustado: re-entrenar con ModelTrainer para habilitar predict()")
+
+        self.n_clusters = self.metadata.get('n_clusters', self.n_clusters)
+        self.algorithm = self.metadata.get('algorithm', self.algorithm)
+
+    @property
+    def can_predict(self) -> bool:
+        """Entrenado y con el scaler ajustado (artefactos antiguos no lo guardaban)."""
+        return self.is_trained and hasattr(self.scaler, 'mean_')
+
     def get_cluster_centers(self) -> np.ndarray:
         if not self.is_trained:
             raise ValueError("Modelo no entrenado.")
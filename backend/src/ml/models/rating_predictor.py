@@ -6,6 +6,7 @@ Modelo de Random Forest para predecir ratings de restaurantes.
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.base import clone
 from sklearn.model_selection import cross_val_score
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from typing import Dict, Any, Optional
@@ -19,19 +20,29 @@ class RatingPredictorModel(BaseMLModel):
         self,
         n_estimators: int = 100,
         max_depth: Optional[int] = 10,
-        random_state: int = 42
+        random_state: int = 42,
+        n_jobs: int = -1
     ):
         super().__init__(model_name="rating_predictor")
         self.n_estimators = n_estimators
         self.max_depth = max_depth
         self.random_state = random_state
+        self.n_jobs = n_jobs
         self.feature_names = []
 
     def train(
         self,
         X: pd.DataFrame,
-        y: pd.Series
+        y: pd.Series,
+        cv_rmse: Optional[float] = None
     ) -> 'RatingPredictorModel':
+        """
+        Args:
+            X: Features
+            y: Ratings
+            cv_rmse: RMSE de validación cruzada ya calculado (ej. por la
+                búsqueda de hiperparámetros); si se indica no se repite la CV
+        """
         print(f"Entrenando {self.model_name}...")
         print(f" Datos: {X.shape[0]} registros, {X.shape[1]} features")
         print(f" Target: ratings de {y.min():.1f} a {y.max():.1f}")
@@ -42,17 +53,20 @@ class RatingPredictorModel(BaseMLModel):
             n_estimators=self.n_estimators,
             max_depth=self.max_depth,
             random_state=self.random_state,
-            n_jobs=-1
+            n_jobs=self.n_jobs
         )
 
         self.model.fit(X, y)
 
-        cv_scores = cross_val_score(
-            self.model, X, y,
-            cv=5,
-            scoring='neg_mean_squared_error'
-        )
-        cv_rmse = np.sqrt(-cv_scores.mean())
+        if cv_rmse is None:
+            # Folds en paralelo; cada bosque de la CV en un solo núcleo
+            cv_scores = cross_val_score(
+                clone(self.model).set_params(n_jobs=1), X, y,
+                cv=5,
+                scoring='neg_mean_squared_error',
+                n_jobs=self.n_jobs
+            )
+            cv_rmse = np.sqrt(-cv_scores.mean())
 
         y_pred = self.model.predict(X)
         rmse = np.sqrt(mean_squared_error(y, y_pred))
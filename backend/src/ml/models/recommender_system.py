@@ -139,10 +139,18 @@ class RestaurantRecommenderSystem(BaseMLModel):
             if preferences['category'].lower() in restaurant['category'].lower():
                 category_score = 1.0
 
+        # Similitud de cluster usando la columna precalculada (sin predict por fila)
+        cluster_score = 0.5
+        reference_cluster = preferences.get('cluster_id')
+        restaurant_cluster = restaurant.get('cluster_id')
+        if reference_cluster is not None and pd.notna(restaurant_cluster):
+            cluster_score = 1.0 if int(restaurant_cluster) == int(reference_cluster) else 0.5
+
         final_score = (
             rating_score * self.weights['rating'] +
             popularity_score * self.weights['popularity'] +
             distance_score * self.weights['distance'] +
+            cluster_score * self.weights['cluster_similarity'] +
             category_score * self.weights['category_match']
         )
 
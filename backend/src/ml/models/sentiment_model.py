@@ -3,22 +3,20 @@ Sentiment Analysis Model
 Modelo de análisis de sentimientos usando Redes Bayesianas (Naive Bayes).
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, FrozenSet, TYPE_CHECKING
+import re
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-# ML
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import ComplementNB
-
-# NLP
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import SnowballStemmer
-
 from .base_model import BaseMLModel
+from src.shared.instrumentation import stage
+
+# sklearn y NLTK se importan dentro de los métodos que los usan, para que
+# construir o importar el modelo no cargue dependencias pesadas ni corpora.
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import ComplementNB
 
 
 class SentimentAnalysisModel(BaseMLModel):
@@ -33,39 +31,136 @@ class SentimentAnalysisModel(BaseMLModel):
     Utiliza:
     - TF-IDF para vectorización
     - Complement Naive Bayes para clasificación
-    - Preprocesamiento con NLTK
+    - Preprocesamiento con stopwords empaquetadas y stemming Snowball (NLTK),
+      sin descargas de corpora en tiempo de ejecución
     """
 
+    # Recurso empaquetado: stopwords de NLTK 'spanish' menos las palabras
+    # significativas. Evita descargas de corpora en tiempo de ejecución.
+    STOPWORDS_RESOURCE = Path(__file__).parent / 'resources' / 'stopwords_es.txt'
+
+    # Palabras significativas que NO se eliminan (importantes para sentimientos)
+    STOPWORDS_SIGNIFICATIVAS = frozenset({
+        "no", "ni", "nada", "muy", "poco", "mucho", "más", "menos",
+        "algo", "ya", "antes", "después", "hasta", "todo", "todos",
+        "como", "para", "sin", "con", "pero", "aunque"
+    })
+
+    # Fin de oración aproximado (sustituye a sent_tokenize/'punkt'): el
+    # tokenizador Treebank solo separa el punto final de cada oración
+    _SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
     def __init__(self):
         super().__init__("SentimentAnalysisModel")
 
         # Componentes del modelo
-        self.vectorizer: Optional[TfidfVectorizer] = None
-        self.classifier: Optional[ComplementNB] = None
+        self.vectorizer: Optional['TfidfVectorizer'] = None
+        self.classifier: Optional['ComplementNB'] = None
 
-        # Preprocesamiento
-        self.stemmer = SnowballStemmer('spanish')
-        self._setup_stopwords()
+        # Preprocesamiento (se inicializa en el primer uso)
+        self._stemmer = None
+        self._word_tokenizer = None
+        self._stopwords_custom: Optional[FrozenSet[str]] = None
+
+        # Tabla precalculada palabra -> raíz (opcional, vocabulario de entrenamiento)
+        self.stem_table: Dict[str, str] = {}
 
         # Clases de sentimiento
         self.sentiment_classes = ['negativo', 'neutro', 'positivo']
 
+    @property
+    def stemmer(self):
+        """Stemmer Snowball para español (carga diferida, no requiere corpora)"""
+        if self._stemmer is None:
+            from nltk.stem import SnowballStemmer
+            self._stemmer = SnowballStemmer('spanish')
+        return self._stemmer
+
+    @property
+    def word_tokenizer(self):
+        """Tokenizador Treebank de NLTK (el de word_tokenize; no requiere corpora)"""
+        if self._word_tokenizer is None:
+            from nltk.tokenize import NLTKWordTokenizer
+            self._word_tokenizer = NLTKWordTokenizer()
+        return self._word_tokenizer
+
+    @property
+    def stopwords_custom(self) -> FrozenSet[str]:
+        """Stopwords personalizadas (carga diferida desde el recurso empaquetado)"""
+        if self._stopwords_custom is None:
+            self._setup_stopwords()
+        return self._stopwords_custom
+
+    @stopwords_custom.setter
+    def stopwords_custom(self, value) -> None:
+        self._stopwords_custom = frozenset(value) if value is not None else None
+
     def _setup_stopwords(self):
-        """Configurar stopwords personalizadas para español"""
-        try:
-            stopwords_spanish = set(stopwords.words('spanish'))
-        except LookupError:
-            nltk.download('stopwords')
-            stopwords_spanish = set(stopwords.words('spanish'))
-
-        # Palabras significativas que NO se eliminan (importantes para sentimientos)
-        stopwords_significativas = {
-            "no", "ni", "nada", "muy", "poco", "mucho", "más", "menos",
-            "algo", "ya", "antes", "después", "hasta", "todo", "todos",
-            "como", "para", "sin", "con", "pero", "aunque"
-        }
+        """Configurar stopwords personalizadas para español desde el archivo empaquetado"""
+        self.stopwords_custom = self.load_bundled_stopwords() - self.STOPWORDS_SIGNIFICATIVAS
+
+    @classmethod
+    def load_bundled_stopwords(cls) -> FrozenSet[str]:
+        """
+        Leer el archivo de stopwords empaquetado (una palabra por línea, '#' comenta).
+
+        Returns:
+            Conjunto inmutable de stopwords
+        """
+        lines = cls.STOPWORDS_RESOURCE.read_text(encoding='utf-8').splitlines()
+        return frozenset(
+            line.strip() for line in lines
+            if line.strip() and not line.startswith('#')
+        )
 
-        self.stopwords_custom = stopwords_spanish - stopwords_significativas
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Tokenizar texto en minúsculas en palabras alfabéticas.
+
+        Reproduce word_tokenize(language='spanish') + isalpha sin el modelo
+        'punkt': los tokens con guiones, apóstrofos, dígitos o '¡'/'¿' pegados
+        ('bien-hecho', "l'ideal", '5estrellas', '¡excelente') se descartan
+        igual que antes. Solo difieren las abreviaturas que 'punkt' reconoce
+        ('sr.'), que aquí pueden tomarse como fin de oración.
+        """
+        tokenizer = self.word_tokenizer
+        return [
+            token
+            for sentence in self._SENTENCE_BREAK.split(str(text).lower())
+            for token in tokenizer.tokenize(sentence)
+            if token.isalpha()
+        ]
+
+    def stem(self, word: str) -> str:
+        """Raíz de una palabra, usando la tabla precalculada si la contiene."""
+        stemmed = self.stem_table.get(word)
+        if stemmed is None:
+            stemmed = self.stemmer.stem(word)
+        return stemmed
+
+    def build_stem_table(self, texts) -> Dict[str, str]:
+        """
+        Precalcular la tabla palabra -> raíz para el vocabulario de los textos.
+
+        Cada palabra distinta se procesa una sola vez con el stemmer.
+
+        Args:
+            texts: Iterable de textos (p. ej. el corpus de entrenamiento)
+
+        Returns:
+            Tabla de stemming (también queda en self.stem_table)
+        """
+        stopwords_custom = self.stopwords_custom
+        vocabulary = set()
+        for text in texts:
+            if isinstance(text, str) and text:
+                vocabulary.update(self.tokenize(text))
+
+        self.stem_table = {
+            word: self.stemmer.stem(word)
+            for word in sorted(vocabulary - stopwords_custom)
+        }
+        return self.stem_table
 
     def preprocess_text(self, text: str) -> str:
         """
@@ -80,21 +175,13 @@ class SentimentAnalysisModel(BaseMLModel):
         if pd.isna(text) or not text:
             return ""
 
-        # Convertir a minúsculas
-        text = str(text).lower()
-
-        # Tokenizar
-        try:
-            tokens = word_tokenize(text, language='spanish')
-        except LookupError:
-            nltk.download('punkt')
-            tokens = word_tokenize(text, language='spanish')
+        stopwords_custom = self.stopwords_custom
 
-        # Filtrar y aplicar stemming
+        # Tokenizar, filtrar y aplicar stemming
         tokens = [
-            self.stemmer.stem(word)
-            for word in tokens
-            if word.isalpha() and word not in self.stopwords_custom
+            self.stem(word)
+            for word in self.tokenize(text)
+            if word not in stopwords_custom
         ]
 
         return " ".join(tokens)
@@ -102,7 +189,8 @@ class SentimentAnalysisModel(BaseMLModel):
     def train(self, X: pd.Series, y: pd.Series,
               max_features: int = 5000,
               ngram_range: tuple = (1, 2),
-              alpha: float = 1.0) -> 'SentimentAnalysisModel':
+              alpha: float = 1.0,
+              use_stem_table: bool = True) -> 'SentimentAnalysisModel':
         """
         Entrenar modelo de análisis de sentimientos.
 
@@ -112,6 +200,8 @@ class SentimentAnalysisModel(BaseMLModel):
             max_features: Número máximo de características TF-IDF
             ngram_range: Rango de n-gramas (unigramas, bigramas, etc.)
             alpha: Parámetro de suavizado de Laplace
+            use_stem_table: Precalcular la tabla de stemming del vocabulario
+                y guardarla en el artefacto
 
         Returns:
             self: Modelo entrenado
@@ -122,9 +212,15 @@ class SentimentAnalysisModel(BaseMLModel):
 
         # 1. Preprocesar textos
         print("\n[1/4] Preprocesando textos...")
+        if use_stem_table:
+            self.build_stem_table(X)
+            print(f" Tabla de stemming: {len(self.stem_table):,} palabras")
         X_processed = X.apply(self.preprocess_text)
         print(f" {len(X_processed)} comentarios preprocesados")
 
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import ComplementNB
+
         # 2. Vectorización TF-IDF
         print("\n[2/4] Vectorización TF-IDF...")
         self.vectorizer = TfidfVectorizer(
@@ -192,42 +288,133 @@ class SentimentAnalysisModel(BaseMLModel):
         Returns:
             Diccionario con predicción completa
         """
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Predecir sentimientos para múltiples comentarios.
+
+        Vectorizado: una sola transformación TF-IDF (matriz dispersa) y una
+        sola llamada a predict_proba para todo el lote.
+
+        Args:
+            texts: Lista de comentarios
+
+        Returns:
+            Lista de predicciones
+        """
         if not self.is_trained:
             raise ValueError("El modelo no ha sido entrenado. Llama a train() primero.")
 
+        if not texts:
+            return []
+
         # NOTA: El vectorizador TF-IDF ya hace su propio preprocesamiento
         # No usamos preprocess_text() porque el stemming puede dañar las palabras clave
         # El modelo fue entrenado con el texto directamente pasado al TF-IDF
 
         # Vectorizar directamente (el TF-IDF hace lowercase y tokenización internamente)
-        text_vector = self.vectorizer.transform([text])
-
-        # Predecir
-        sentiment = self.classifier.predict(text_vector)[0]
-        probabilities = self.classifier.predict_proba(text_vector)[0]
+        with stage('sentiment.tfidf_transform'):
+            text_vectors = self.vectorizer.transform(texts)
+
+        # Predecir: la clase es el argmax de las probabilidades (voting='soft')
+        with stage('sentiment.predict_proba'):
+            probabilities = self.classifier.predict_proba(text_vectors)
+        classes = [str(c) for c in self.classifier.classes_]
+        best = probabilities.argmax(axis=1)
+
+        return [
+            {
+                'text_original': text,
+                'text_processed': text.lower(),
+                'sentiment': classes[best[i]],
+                'confidence': float(row[best[i]]),
+                'probabilities': dict(zip(classes, row.tolist()))
+            }
+            for i, (text, row) in enumerate(zip(texts, probabilities))
+        ]
 
-        # Crear diccionario de probabilidades
-        prob_dict = dict(zip(self.classifier.classes_, probabilities))
+    def partial_update(self, texts: List[str], labels: List[str]) -> Dict[str, Any]:
+        """
+        Incorporar reseñas etiquetadas sin reentrenar sobre todo el corpus.
 
-        return {
-            'text_original': text,
-            'text_processed': text.lower(),
-            'sentiment': sentiment,
-            'confidence': float(max(probabilities)),
-            'probabilities': {k: float(v) for k, v in prob_dict.items()}
-        }
+        El vocabulario y los pesos idf del vectorizador quedan congelados (los
+        términos nuevos se ignoran hasta el próximo train()). Los
+        clasificadores con partial_fit (ComplementNB, SGDClassifier) suman el
+        lote a sus conteos/pesos; en un VotingClassifier solo se actualizan
+        los estimadores que lo admiten y el resto (p. ej. LogisticRegression)
+        sigue igual hasta el reentrenamiento completo.
 
-    def predict_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """
-        Predecir sentimientos para múltiples comentarios.
+        El lote se aplica sobre una copia del clasificador que luego reemplaza
+        a la actual: una predicción concurrente ve el modelo anterior o el
+        nuevo, nunca uno a medio actualizar.
 
         Args:
-            texts: Lista de comentarios
+            texts: Comentarios (mismo texto crudo que recibe predict_batch)
+            labels: Sentimiento de cada comentario
 
         Returns:
-            Lista de predicciones
+            Resumen de la actualización
         """
-        return [self.predict_single(text) for text in texts]
+        import copy
+        import time
+        from datetime import datetime
+        from sklearn.ensemble import VotingClassifier
+
+        if not self.is_trained:
+            raise ValueError("El modelo no ha sido entrenado. Llama a train() primero.")
+        if len(texts) != len(labels):
+            raise ValueError("texts y labels deben tener la misma longitud")
+        if not texts:
+            return {'samples': 0, 'updated_estimators': [], 'frozen_estimators': []}
+
+        unknown = set(labels) - {str(c) for c in self.classifier.classes_}
+        if unknown:
+            raise ValueError(f"Etiquetas desconocidas para el modelo: {sorted(unknown)}")
+
+        start = time.perf_counter()
+        X = self.vectorizer.transform(texts)
+        y = np.asarray(labels)
+        classifier = copy.deepcopy(self.classifier)
+
+        if isinstance(classifier, VotingClassifier):
+            # Los estimadores internos se entrenaron con las etiquetas codificadas
+            y_encoded = classifier.le_.transform(y)
+            updated, frozen = [], []
+            for name, estimator in classifier.named_estimators_.items():
+                if hasattr(estimator, 'partial_fit'):
+                    estimator.partial_fit(X, y_encoded)
+                    updated.append(name)
+                else:
+                    frozen.append(name)
+            if not updated:
+                raise ValueError("Ningún estimador del ensemble admite partial_fit; usa train()")
+        elif hasattr(classifier, 'partial_fit'):
+            classifier.partial_fit(X, y)
+            updated, frozen = [type(classifier).__name__], []
+        else:
+            raise ValueError(f"{type(classifier).__name__} no admite partial_fit; usa train()")
+
+        incremental = dict(self.metadata.get('incremental', {}))
+        incremental.update({
+            'batches': incremental.get('batches', 0) + 1,
+            'samples': incremental.get('samples', 0) + len(texts),
+            'last_update': datetime.now().isoformat(),
+            'updated_estimators': updated,
+            'frozen_estimators': frozen,
+        })
+        metadata = dict(self.metadata)
+        metadata['incremental'] = incremental
+
+        self.classifier = classifier
+        self.metadata = metadata
+
+        return {
+            'samples': len(texts),
+            'updated_estimators': updated,
+            'frozen_estimators': frozen,
+            'seconds': round(time.perf_counter() - start, 4),
+        }
 
     def evaluate(self, X_test: pd.Series, y_test: pd.Series) -> Dict[str, Any]:
         """
@@ -396,7 +583,8 @@ class SentimentAnalysisModel(BaseMLModel):
             'metadata': self.metadata,
             'is_trained': self.is_trained,
             'model_name': self.model_name,
-            'stopwords_custom': self.stopwords_custom
+            'stopwords_custom': frozenset(self.stopwords_custom),
+            'stem_table': self.stem_table
         }
 
         joblib.dump(model_data, model_path)
@@ -425,7 +613,9 @@ class SentimentAnalysisModel(BaseMLModel):
         self.metadata = model_data['metadata']
         self.is_trained = model_data['is_trained']
         self.model_name = model_data['model_name']
-        self.stopwords_custom = model_data.get('stopwords_custom', self.stopwords_custom)
+        if model_data.get('stopwords_custom') is not None:
+            self.stopwords_custom = model_data['stopwords_custom']
+        self.stem_table = model_data.get('stem_table') or {}
 
         print(f" Modelo cargado: {model_path}")
         print(f" Vocabulario: {len(self.vectorizer.vocabulary_):,} términos")
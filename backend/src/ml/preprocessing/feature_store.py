@@ -0,0 +1,244 @@
+"""
+Text Feature Store
+Cache en disco de las features de texto para los experimentos de sentimientos.
+
+Los scripts de reentrenamiento repiten siempre los mismos pasos antes de
+probar clasificadores: split estratificado, preprocesamiento y
+`fit_transform` del TF-IDF. El store guarda el resultado una vez por
+combinación de datos + vectorizador + split, y las corridas siguientes lo
+cargan en segundos:
+
+    data/cache/features/<clave>/
+        X_train.npz, X_test.npz   matrices TF-IDF (scipy.sparse.save_npz)
+        labels.npz                y_train, y_test
+        texts.joblib              textos del split (train, test)
+        vectorizer.joblib         vectorizador ajustado
+        meta.json                 parámetros, formas y tiempos
+
+La clave es un hash de los textos y etiquetas (no de la ruta del CSV: un
+dataset derivado en memoria también se cachea), de `get_params()` del
+vectorizador y del split. Los textos deben llegar ya preprocesados: el store
+no aplica funciones propias, cuyo cambio de implementación no se reflejaría
+en la clave. Los parámetros callables del vectorizador (tokenizer,
+preprocessor) se identifican por nombre y hash de su código fuente; un cambio
+en funciones que estos llamen no se detecta y requiere subir FORMAT_VERSION.
+"""
+
+import hashlib
+import inspect
+import json
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Cambiar al modificar el formato de los archivos (invalida el cache)
+FORMAT_VERSION = 2
+
+DEFAULT_STORE_DIR = 'data/cache/features'
+
+
+@dataclass
+class FeatureSet:
+    """Features de un split train/test listas para entrenar clasificadores."""
+
+    key: str
+    X_train: sp.csr_matrix
+    X_test: sp.csr_matrix
+    y_train: np.ndarray
+    y_test: np.ndarray
+    texts_train: List[str]
+    texts_test: List[str]
+    vectorizer: Any
+    from_cache: bool
+    seconds: float
+
+
+def _param_repr(value: Any) -> Any:
+    """Representación estable de un parámetro del vectorizador para la clave."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_param_repr(item) for item in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(k): _param_repr(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if callable(value):
+        return _callable_repr(value)
+    return repr(value)
+
+
+def _callable_repr(func: Any) -> str:
+    """Nombre + hash del código de un callable (cambia si cambia su cuerpo)."""
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    try:
+        code = inspect.getsource(func).encode('utf-8')
+    except (OSError, TypeError):
+        func_code = getattr(func, '__code__', None)
+        if func_code is None:
+            # Builtins y objetos sin código Python: solo el nombre
+            return name
+        code = func_code.co_code + repr(func_code.co_consts).encode('utf-8')
+    return f"{name}#{hashlib.sha256(code).hexdigest()[:16]}"
+
+
+def data_fingerprint(texts: pd.Series, labels: pd.Series) -> str:
+    """Hash del contenido (textos, etiquetas y su orden), vectorizado con pandas."""
+    frame = pd.DataFrame({
+        'text': texts.astype(object).where(texts.notna(), '').astype(str).to_numpy(),
+        'label': labels.astype(str).to_numpy(),
+    })
+    row_hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+class TextFeatureStore:
+    """Cache de features TF-IDF por clave de datos + vectorizador + split."""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    def key_for(
+        self,
+        texts: pd.Series,
+        labels: pd.Series,
+        vectorizer,
+        test_size: float,
+        random_state: int,
+        stratify: bool
+    ) -> str:
+        spec = {
+            'format': FORMAT_VERSION,
+            'data': data_fingerprint(texts, labels),
+            'vectorizer': type(vectorizer).__name__,
+            'params': _param_repr(vectorizer.get_params()),
+            'split': {'test_size': test_size, 'random_state': random_state, 'stratify': stratify},
+        }
+        digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+        return digest[:24]
+
+    def get_or_build(
+        self,
+        texts: pd.Series,
+        labels: pd.Series,
+        vectorizer,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        stratify: bool = True
+    ) -> FeatureSet:
+        """
+        Cargar las features del cache o calcularlas y guardarlas.
+
+        Equivale a `train_test_split(texts, labels, test_size, random_state,
+        stratify=labels)` + `vectorizer.fit_transform(train)` +
+        `vectorizer.transform(test)`.
+
+        Args:
+            texts: Comentarios (ya preprocesados)
+            labels: Sentimientos
+            vectorizer: Vectorizador sin ajustar (define los parámetros de la clave)
+            test_size: Proporción de test
+            random_state: Semilla del split
+            stratify: Estratificar el split por etiqueta
+        """
+        start = time.perf_counter()
+        key = self.key_for(texts, labels, vectorizer, test_size, random_state, stratify)
+        entry = self.root / key
+
+        if (entry / 'meta.json').exists():
+            try:
+                features = self._load(key, entry)
+                features.seconds = time.perf_counter() - start
+                print(f" Features cargadas del cache ({key}) en {features.seconds:.2f}s")
+                return features
+            except Exception as e:
+                print(f" Cache de features inválido ({key}): {e}. Se recalcula.")
+                shutil.rmtree(entry, ignore_errors=True)
+
+        features = self._build(key, texts, labels, vectorizer, test_size, random_state, stratify)
+        features.seconds = time.perf_counter() - start
+        self._save(entry, features, test_size, random_state, stratify)
+        print(f" Features calculadas en {features.seconds:.2f}s y guardadas en cache ({key})")
+        return features
+
+    def _build(self, key, texts, labels, vectorizer, test_size, random_state, stratify) -> FeatureSet:
+        from sklearn.model_selection import train_test_split
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            texts, labels,
+            test_size=test_size,
+            random_state=random_state,
+            stratify=labels if stratify else None
+        )
+        return FeatureSet(
+            key=key,
+            X_train=sp.csr_matrix(vectorizer.fit_transform(X_train)),
+            X_test=sp.csr_matrix(vectorizer.transform(X_test)),
+            y_train=np.asarray(y_train),
+            y_test=np.asarray(y_test),
+            texts_train=X_train.tolist(),
+            texts_test=X_test.tolist(),
+            vectorizer=vectorizer,
+            from_cache=False,
+            seconds=0.0
+        )
+
+    def _save(self, entry: Path, features: FeatureSet, test_size, random_state, stratify) -> None:
+        # Se escribe en un directorio temporal y se renombra: una corrida
+        # interrumpida no deja una entrada a medias
+        tmp = entry.with_name(f"{entry.name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        sp.save_npz(tmp / 'X_train.npz', features.X_train)
+        sp.save_npz(tmp / 'X_test.npz', features.X_test)
+        np.savez(tmp / 'labels.npz', y_train=features.y_train.astype(str), y_test=features.y_test.astype(str))
+        joblib.dump({'train': features.texts_train, 'test': features.texts_test}, tmp / 'texts.joblib', compress=3)
+        joblib.dump(features.vectorizer, tmp / 'vectorizer.joblib')
+        meta = {
+            'key': features.key,
+            'format': FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'vectorizer': type(features.vectorizer).__name__,
+            'params': _param_repr(features.vectorizer.get_params()),
+            'split': {'test_size': test_size, 'random_state': random_state, 'stratify': stratify},
+            'shape_train': list(features.X_train.shape),
+            'shape_test': list(features.X_test.shape),
+            'build_seconds': round(features.seconds, 3),
+        }
+        (tmp / 'meta.json').write_text(json.dumps(meta, indent=2, ensure_ascii=False) + '\n')
+
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp.rename(entry)
+
+    def _load(self, key: str, entry: Path) -> FeatureSet:
+        labels = np.load(entry / 'labels.npz')
+        texts = joblib.load(entry / 'texts.joblib')
+        return FeatureSet(
+            key=key,
+            X_train=sp.load_npz(entry / 'X_train.npz').tocsr(),
+            X_test=sp.load_npz(entry / 'X_test.npz').tocsr(),
+            y_train=labels['y_train'].astype(object),
+            y_test=labels['y_test'].astype(object),
+            texts_train=texts['train'],
+            texts_test=texts['test'],
+            vectorizer=joblib.load(entry / 'vectorizer.joblib'),
+            from_cache=True,
+            seconds=0.0
+        )
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Metadata de las entradas guardadas (para inspección/limpieza)."""
+        if not self.root.exists():
+            return []
+        return [
+            json.loads(meta.read_text())
+            for meta in sorted(self.root.glob('*/meta.json'))
+        ]
@@ -0,0 +1,321 @@
+"""
+Hyperparameter Search
+Búsqueda paralela de hiperparámetros para el pipeline de entrenamiento.
+
+- Clustering: k elegido por silhouette, con el mismo estimador y la misma
+  silhouette muestreada que RestaurantClusteringModel (MiniBatchKMeans y
+  muestra aleatoria en catálogos grandes).
+- Rating predictor: grilla `n_estimators` x `max_depth` evaluada con K-fold
+  (mismos folds que `cross_val_score(cv=5)`, sin barajar).
+- Clasificadores de sentimientos: `fit_candidates` ajusta y puntúa en
+  paralelo los candidatos que comparan los scripts de reentrenamiento.
+
+Cada candidato es una tarea de joblib (procesos, `n_jobs`); dentro de la
+tarea el estimador usa n_jobs=1 y loky limita los hilos OpenMP/BLAS de cada
+worker, así los núcleos no se sobre-suscriben. Las particiones de CV se
+calculan una sola vez y se comparten entre candidatos, y el resultado de cada
+(fold, hiperparámetros) se cachea en disco con joblib.Memory: la clave
+incluye el hash de los datos, así que un reentrenamiento sobre datos sin
+cambios reutiliza los folds ya ajustados y uno sobre datos nuevos no.
+"""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from joblib import Memory, Parallel, delayed, effective_n_jobs
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+from src.ml.models.clustering_model import (
+    SILHOUETTE_SAMPLE_SIZE,
+    make_kmeans,
+    sampled_silhouette,
+    silhouette_sample_for
+)
+
+
+DEFAULT_K_VALUES: Tuple[int, ...] = tuple(range(3, 11))
+
+DEFAULT_FOREST_GRID: Dict[str, Tuple] = {
+    'n_estimators': (100, 200, 400),
+    'max_depth': (6, 10, 16, None),
+}
+
+
+@dataclass
+class CandidateResult:
+    """Resultado de un candidato de la búsqueda."""
+
+    params: Dict[str, Any]
+    score: float
+    metrics: Dict[str, float]
+    wall_clock_s: float
+    cached_folds: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'params': self.params,
+            'score': round(self.score, 6),
+            'metrics': {key: round(value, 6) for key, value in self.metrics.items()},
+            'wall_clock_s': round(self.wall_clock_s, 3),
+            'cached_folds': self.cached_folds,
+        }
+
+
+@dataclass
+class SearchResult:
+    """Candidatos evaluados y el mejor según `metric`."""
+
+    metric: str
+    greater_is_better: bool
+    candidates: List[CandidateResult] = field(default_factory=list)
+    wall_clock_s: float = 0.0
+    n_jobs: int = 1
+
+    @property
+    def best(self) -> CandidateResult:
+        key = (lambda c: c.score) if self.greater_is_better else (lambda c: -c.score)
+        return max(self.candidates, key=key)
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumen corto para la metadata del modelo guardado."""
+        return {
+            'metric': self.metric,
+            'best_params': self.best.params,
+            'best_score': round(self.best.score, 6),
+            'n_candidates': len(self.candidates),
+            'wall_clock_s': round(self.wall_clock_s, 3),
+            'n_jobs': self.n_jobs,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            'candidates': [candidate.to_dict() for candidate in self.candidates],
+        }
+
+
+def _memory(cache_dir: Optional[Path]) -> Memory:
+    # location=None desactiva el cache (las funciones se ejecutan siempre)
+    return Memory(location=str(cache_dir) if cache_dir is not None else None, verbose=0)
+
+
+# ========== Clustering ==========
+
+def _evaluate_k(
+    X_scaled: np.ndarray,
+    n_clusters: int,
+    random_state: int,
+    algorithm: str,
+    batch_size: int,
+    sample_size: Optional[int]
+) -> CandidateResult:
+    start = time.perf_counter()
+    model = make_kmeans(n_clusters, len(X_scaled), random_state, algorithm, batch_size)
+    labels = model.fit_predict(X_scaled)
+    silhouette = sampled_silhouette(X_scaled, labels, sample_size, random_state)
+    return CandidateResult(
+        params={'n_clusters': n_clusters},
+        score=float(silhouette),
+        metrics={'silhouette_score': float(silhouette), 'inertia': float(model.inertia_)},
+        wall_clock_s=time.perf_counter() - start,
+    )
+
+
+def search_n_clusters(
+    X_scaled: np.ndarray,
+    k_values: Sequence[int] = DEFAULT_K_VALUES,
+    n_jobs: int = -1,
+    random_state: int = 42,
+    algorithm: str = 'auto',
+    batch_size: int = 4096,
+    silhouette_sample_size: Optional[int] = SILHOUETTE_SAMPLE_SIZE
+) -> SearchResult:
+    """
+    Evaluar KMeans para cada k en paralelo y elegir el de mayor silhouette.
+
+    Args:
+        X_scaled: Features ya escaladas (mismo StandardScaler que el modelo)
+        k_values: Valores de k a evaluar
+        n_jobs: Procesos de joblib (-1 = todos los núcleos)
+        random_state: Semilla de KMeans y del muestreo de la silhouette
+        algorithm: 'kmeans', 'minibatch' o 'auto' (ver make_kmeans)
+        batch_size: Tamaño de lote de MiniBatchKMeans
+        silhouette_sample_size: Tamaño de muestra para la silhouette cuando
+            hay más registros que esto
+    """
+    k_values = [k for k in k_values if 2 <= k < len(X_scaled)]
+    if not k_values:
+        raise ValueError("No hay valores de k válidos para los datos")
+    sample_size = silhouette_sample_for(len(X_scaled), silhouette_sample_size)
+
+    start = time.perf_counter()
+    candidates = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_k)(X_scaled, k, random_state, algorithm, batch_size, sample_size)
+        for k in k_values
+    )
+    return SearchResult(
+        metric='silhouette_score' if sample_size is None else f'silhouette_score (muestra {sample_size})',
+        greater_is_better=True,
+        candidates=list(candidates),
+        wall_clock_s=time.perf_counter() - start,
+        n_jobs=effective_n_jobs(n_jobs),
+    )
+
+
+# ========== Random Forest ==========
+
+def _fit_forest_fold(
+    X: np.ndarray,
+    y: np.ndarray,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    params: Dict[str, Any],
+    random_state: int
+) -> float:
+    """MSE de validación de un fold (función cacheada por joblib.Memory)."""
+    model = RandomForestRegressor(random_state=random_state, n_jobs=1, **params)
+    model.fit(X[train_index], y[train_index])
+    return float(mean_squared_error(y[test_index], model.predict(X[test_index])))
+
+
+def _evaluate_forest(
+    fit_fold,
+    X: np.ndarray,
+    y: np.ndarray,
+    folds: List[Tuple[np.ndarray, np.ndarray]],
+    params: Dict[str, Any],
+    random_state: int
+) -> CandidateResult:
+    start = time.perf_counter()
+    fold_mse = []
+    cached = 0
+    for train_index, test_index in folds:
+        if fit_fold.check_call_in_cache(X, y, train_index, test_index, params, random_state):
+            cached += 1
+        fold_mse.append(fit_fold(X, y, train_index, test_index, params, random_state))
+    cv_rmse = float(np.sqrt(np.mean(fold_mse)))
+    return CandidateResult(
+        params=params,
+        score=cv_rmse,
+        metrics={'cv_rmse': cv_rmse, 'cv_rmse_std': float(np.std(np.sqrt(fold_mse)))},
+        wall_clock_s=time.perf_counter() - start,
+        cached_folds=cached,
+    )
+
+
+def search_forest_params(
+    X: np.ndarray,
+    y: np.ndarray,
+    param_grid: Optional[Dict[str, Sequence]] = None,
+    cv: int = 5,
+    n_jobs: int = -1,
+    random_state: int = 42,
+    cache_dir: Optional[Path] = None
+) -> SearchResult:
+    """
+    Evaluar la grilla de hiperparámetros del Random Forest con K-fold.
+
+    Args:
+        X: Features
+        y: Target
+        param_grid: Valores por hiperparámetro (`n_estimators`, `max_depth`)
+        cv: Número de folds
+        n_jobs: Procesos de joblib (-1 = todos los núcleos)
+        random_state: Semilla del Random Forest
+        cache_dir: Directorio del cache de folds (None = sin cache)
+    """
+    grid = {**DEFAULT_FOREST_GRID, **(param_grid or {})}
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    # Particiones calculadas una vez y compartidas por todos los candidatos
+    folds = list(KFold(n_splits=cv).split(X))
+    fit_fold = _memory(cache_dir).cache(_fit_forest_fold)
+
+    candidates_params = [
+        {'n_estimators': int(n_estimators), 'max_depth': None if max_depth is None else int(max_depth)}
+        for n_estimators in grid['n_estimators']
+        for max_depth in grid['max_depth']
+    ]
+
+    start = time.perf_counter()
+    candidates = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_forest)(fit_fold, X, y, folds, params, random_state)
+        for params in candidates_params
+    )
+    return SearchResult(
+        metric='cv_rmse',
+        greater_is_better=False,
+        candidates=list(candidates),
+        wall_clock_s=time.perf_counter() - start,
+        n_jobs=effective_n_jobs(n_jobs),
+    )
+
+
+# ========== Clasificadores candidatos ==========
+
+def _fit_candidate(
+    name: str,
+    estimator,
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    allow_failure: bool
+) -> Tuple[str, Any, float, float, Optional[str]]:
+    start = time.perf_counter()
+    try:
+        estimator.fit(X_train, y_train)
+        score = float(estimator.score(X_test, y_test))
+    except Exception as e:
+        if not allow_failure:
+            raise
+        return name, None, float('nan'), time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return name, estimator, score, time.perf_counter() - start, None
+
+
+def fit_candidates(
+    candidates: Dict[str, Any],
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    n_jobs: int = -1,
+    allow_failure: Sequence[str] = ()
+) -> Dict[str, Tuple[Any, float, float]]:
+    """
+    Ajustar y puntuar (accuracy en test) clasificadores candidatos en paralelo.
+
+    Cada candidato es una tarea de joblib; un VotingClassifier candidato
+    ajusta sus estimadores en serie dentro de su tarea (n_jobs=None).
+
+    Args:
+        candidates: Nombre -> estimador sin ajustar
+        X_train, y_train: Datos de entrenamiento (p. ej. matriz TF-IDF)
+        X_test, y_test: Datos de evaluación
+        n_jobs: Procesos de joblib (-1 = todos los núcleos)
+        allow_failure: Candidatos opcionales: si su ajuste falla se informa y
+            se omiten del resultado (el error de cualquier otro se propaga)
+
+    Returns:
+        Nombre -> (estimador ajustado, accuracy, segundos), en el orden de
+        `candidates` y sin los candidatos opcionales que fallaron
+    """
+    optional = set(allow_failure)
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_candidate)(name, estimator, X_train, y_train, X_test, y_test, name in optional)
+        for name, estimator in candidates.items()
+    )
+
+    fitted = {}
+    for name, estimator, score, seconds, error in results:
+        if error is not None:
+            print(f" Candidato '{name}' omitido: {error}")
+            continue
+        fitted[name] = (estimator, score, seconds)
+    return fitted
@@ -1,19 +1,31 @@
 """
 Model Training Pipeline
 Pipeline para entrenar todos los modelos ML.
+
+Con `train_all(search=True)` el k del clustering y los hiperparámetros del
+Random Forest se eligen con una búsqueda paralela (ver hyperparameter_search)
+en lugar de usar los valores fijos.
 """
 
+import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
 
 from src.ml.models import (
     RestaurantClusteringModel,
     RatingPredictorModel,
     RestaurantRecommenderSystem
 )
+from .hyperparameter_search import (
+    DEFAULT_K_VALUES,
+    SearchResult,
+    search_forest_params,
+    search_n_clusters
+)
 
 
 class ModelTrainer:
@@ -22,16 +34,40 @@ class ModelTrainer:
     def __init__(
         self,
         data_path: str = 'data/processed/restaurantes_sin_anomalias.csv',
-        models_dir: str = 'data/models'
+        models_dir: str = 'data/models',
+        n_jobs: int = -1,
+        cache_dir: Optional[str] = 'data/cache/training',
+        clustering_algorithm: str = 'auto',
+        clustering_batch_size: int = 4096,
+        measure_memory: bool = False
     ):
+        """
+        Args:
+            data_path: CSV de restaurantes procesado
+            models_dir: Directorio donde se guardan los modelos
+            n_jobs: Procesos para la búsqueda de hiperparámetros y la CV
+                (-1 = todos los núcleos)
+            cache_dir: Cache de folds de la búsqueda (None = sin cache)
+            clustering_algorithm: 'kmeans', 'minibatch' o 'auto' (MiniBatchKMeans
+                en catálogos grandes)
+            clustering_batch_size: Tamaño de lote de MiniBatchKMeans
+            measure_memory: Registrar el pico de memoria del clustering
+                (pasada extra con tracemalloc)
+        """
         self.data_path = Path(data_path)
         self.models_dir = Path(models_dir)
         self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.n_jobs = n_jobs
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.clustering_algorithm = clustering_algorithm
+        self.clustering_batch_size = clustering_batch_size
+        self.measure_memory = measure_memory
 
         self.df = None
         self.clustering_model = None
         self.rating_model = None
         self.recommender_system = None
+        self.search_results: Dict[str, SearchResult] = {}
 
     def load_data(self) -> pd.DataFrame:
         print("=" * 70)
@@ -73,14 +109,21 @@ class ModelTrainer:
     def train_clustering_model(
         self,
         features: pd.DataFrame,
-        n_clusters: int = 6
+        n_clusters: int = 6,
+        search: Optional[SearchResult] = None
     ) -> RestaurantClusteringModel:
         print("\n" + "=" * 70)
         print("ENTRENANDO CLUSTERING MODEL")
         print("=" * 70)
 
-        model = RestaurantClusteringModel(n_clusters=n_clusters)
-        model.train(features)
+        model = RestaurantClusteringModel(
+            n_clusters=n_clusters,
+            algorithm=self.clustering_algorithm,
+            batch_size=self.clustering_batch_size
+        )
+        model.train(features, measure_memory=self.measure_memory)
+        if search is not None:
+            model.metadata['search'] = search.summary()
 
         save_path = self.models_dir / 'clustering_model.pkl'
         model.save(str(save_path))
@@ -91,14 +134,22 @@ class ModelTrainer:
     def train_rating_model(
         self,
         features: pd.DataFrame,
-        target: pd.Series
+        target: pd.Series,
+        n_estimators: int = 100,
+        max_depth: Optional[int] = 10,
+        search: Optional[SearchResult] = None
     ) -> RatingPredictorModel:
         print("\n" + "=" * 70)
         print("ENTRENANDO RATING PREDICTOR")
         print("=" * 70)
 
-        model = RatingPredictorModel(n_estimators=100, max_depth=10)
-        model.train(features, target)
+        model = RatingPredictorModel(n_estimators=n_estimators, max_depth=max_depth, n_jobs=self.n_jobs)
+        if search is not None:
+            # La CV del mejor candidato ya se hizo en la búsqueda
+            model.train(features, target, cv_rmse=search.best.score)
+            model.metadata['search'] = search.summary()
+        else:
+            model.train(features, target)
 
         save_path = self.models_dir / 'rating_predictor.pkl'
         model.save(str(save_path))
@@ -106,6 +157,76 @@ class ModelTrainer:
         self.rating_model = model
         return model
 
+    def search_clustering_model(
+        self,
+        features: pd.DataFrame,
+        k_values: Sequence[int] = DEFAULT_K_VALUES
+    ) -> RestaurantClusteringModel:
+        """Elegir k por silhouette en paralelo y entrenar/guardar el mejor."""
+        print("\n" + "=" * 70)
+        print("BUSCANDO K PARA CLUSTERING")
+        print("=" * 70)
+
+        X_scaled = StandardScaler().fit_transform(features)
+        result = search_n_clusters(
+            X_scaled, k_values,
+            n_jobs=self.n_jobs,
+            algorithm=self.clustering_algorithm,
+            batch_size=self.clustering_batch_size
+        )
+        self._print_search(result)
+        self.search_results['clustering'] = result
+
+        return self.train_clustering_model(
+            features, n_clusters=result.best.params['n_clusters'], search=result
+        )
+
+    def search_rating_model(
+        self,
+        features: pd.DataFrame,
+        target: pd.Series,
+        param_grid: Optional[Dict[str, Sequence]] = None
+    ) -> RatingPredictorModel:
+        """Elegir n_estimators/max_depth por RMSE de CV y entrenar/guardar el mejor."""
+        print("\n" + "=" * 70)
+        print("BUSCANDO HIPERPARAMETROS PARA RATING PREDICTOR")
+        print("=" * 70)
+
+        result = search_forest_params(
+            features.to_numpy(), target.to_numpy(),
+            param_grid=param_grid,
+            n_jobs=self.n_jobs,
+            cache_dir=self.cache_dir
+        )
+        self._print_search(result)
+        self.search_results['rating'] = result
+
+        best = result.best.params
+        return self.train_rating_model(
+            features, target,
+            n_estimators=best['n_estimators'],
+            max_depth=best['max_depth'],
+            search=result
+        )
+
+    def _print_search(self, result: SearchResult) -> None:
+        print(f"Candidatos: {len(result.candidates)}  n_jobs: {result.n_jobs}  "
+              f"tiempo total: {result.wall_clock_s:.2f}s")
+        for candidate in result.candidates:
+            marker = '*' if candidate is result.best else ' '
+            cached = f"  ({candidate.cached_folds} folds en cache)" if candidate.cached_folds else ""
+            print(f" {marker} {candidate.params}  {result.metric}={candidate.score:.4f}  "
+                  f"{candidate.wall_clock_s:.2f}s{cached}")
+        print(f"Mejor: {result.best.params}")
+
+    def save_search_report(self) -> Path:
+        """Guardar los candidatos y tiempos de la última búsqueda en JSON."""
+        report_path = self.models_dir / 'search_report.json'
+        report = {name: result.to_dict() for name, result in self.search_results.items()}
+        report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+        print(f"Reporte de búsqueda guardado: {report_path}")
+        return report_path
+
     def build_recommender_system(self) -> RestaurantRecommenderSystem:
         print("\n" + "=" * 70)
         print("CONSTRUYENDO RECOMMENDER SYSTEM")
@@ -124,7 +245,21 @@ class ModelTrainer:
         self.recommender_system = system
         return system
 
-    def train_all(self) -> Dict[str, Any]:
+    def train_all(
+        self,
+        search: bool = False,
+        k_values: Sequence[int] = DEFAULT_K_VALUES,
+        param_grid: Optional[Dict[str, Sequence]] = None
+    ) -> Dict[str, Any]:
+        """
+        Entrenar y guardar todos los modelos.
+
+        Args:
+            search: Elegir k e hiperparámetros del Random Forest con búsqueda
+                paralela en lugar de los valores fijos
+            k_values: Valores de k a evaluar (solo con search)
+            param_grid: Grilla `n_estimators`/`max_depth` (solo con search)
+        """
         print("\n" + "=" * 70)
         print("ENTRENAMIENTO COMPLETO DE MODELOS ML")
         print("=" * 70)
@@ -132,8 +267,13 @@ class ModelTrainer:
         self.load_data()
         features = self.prepare_features()
 
-        self.train_clustering_model(features['clustering_features'])
-        self.train_rating_model(features['rating_features'], features['rating_target'])
+        if search:
+            self.search_clustering_model(features['clustering_features'], k_values)
+            self.search_rating_model(features['rating_features'], features['rating_target'], param_grid)
+            self.save_search_report()
+        else:
+            self.train_clustering_model(features['clustering_features'])
+            self.train_rating_model(features['rating_features'], features['rating_target'])
         self.build_recommender_system()
 
         print("\n" + "=" * 70)
@@ -3,12 +3,13 @@ API endpoints para gestión de distritos de Lima
 Capa de presentación siguiendo Clean Architecture
 """
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 import logging
 
 from ...application.services.district_service import DistrictService
 from ...infrastructure.container import Container
+from .http_cache import check_catalogue_cache
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +98,8 @@ async def get_district_service() -> DistrictService:
     description="Retorna la lista completa de distritos de Lima disponibles para el dropdown del frontend, ordenados por popularidad (número de restaurantes)"
 )
 async def get_districts_list(
+    request: Request,
+    response: Response,
     district_service: DistrictService = Depends(get_district_service)
 ) -> List[DistrictDropdownItem]:
     """
@@ -108,6 +111,10 @@ async def get_districts_list(
     """
     logger.info("Solicitando lista de distritos para dropdown")
 
+    not_modified = check_catalogue_cache(request, response)
+    if not_modified is not None:
+        return not_modified
+
     districts_data = await district_service.get_districts_for_dropdown()
 
     # Convertir a modelo Pydantic para validación
@@ -125,6 +132,8 @@ async def get_districts_list(
 )
 async def get_district_details(
     district_name: str,
+    request: Request,
+    response: Response,
     district_service: DistrictService = Depends(get_district_service)
 ) -> DistrictResponse:
     """
@@ -136,6 +145,10 @@ async def get_district_details(
     """
     logger.info(f"Solicitando información del distrito: {district_name}")
 
+    not_modified = check_catalogue_cache(request, response)
+    if not_modified is not None:
+        return not_modified
+
     district_info = await district_service.get_district_info(district_name)
 
     return DistrictResponse(**district_info)
@@ -148,6 +161,8 @@ async def get_district_details(
     description="Retorna distritos recomendados según criterios específicos de filtrado"
 )
 async def get_recommended_districts(
+    request: Request,
+    response: Response,
     tourist_zone_only: bool = Query(
         False,
         description="Solo incluir zonas turísticas (Miraflores, Barranco, San Isidro)"
@@ -176,6 +191,10 @@ async def get_recommended_districts(
     """
     logger.info(f"Solicitando distritos recomendados: tourist_zone={tourist_zone_only}, min_rating={min_rating}")
 
+    not_modified = check_catalogue_cache(request, response)
+    if not_modified is not None:
+        return not_modified
+
     recommendations = await district_service.get_recommended_districts(
         tourist_zone_only=tourist_zone_only,
         min_rating=min_rating,
@@ -196,6 +215,8 @@ async def get_recommended_districts(
     description="Retorna estadísticas completas de todos los distritos incluyendo métricas agregadas"
 )
 async def get_districts_statistics(
+    request: Request,
+    response: Response,
     district_service: DistrictService = Depends(get_district_service)
 ) -> DistrictStatisticsResponse:
     """
@@ -208,6 +229,10 @@ async def get_districts_statistics(
     """
     logger.info("Generando estadísticas completas de distritos")
 
+    not_modified = check_catalogue_cache(request, response)
+    if not_modified is not None:
+        return not_modified
+
     stats_data = await district_service.get_districts_statistics()
 
     return DistrictStatisticsResponse(
@@ -0,0 +1,85 @@
+"""
+HTTP Cache
+ETag / Last-Modified / Cache-Control para endpoints derivados del catálogo.
+
+Las listas de categorías y distritos y las estadísticas por distrito son
+funciones puras del dataset cargado. Su ETag es la versión del dataset
+(hash del CSV + contador de recargas), por lo que un `If-None-Match` que
+coincide se responde con 304 antes de ejecutar el endpoint.
+
+El 304 lleva el mismo validador que el 200 que revalida: si el cliente
+acepta gzip/br el middleware de compresión envía el 200 con ETag débil, así
+que el ETag también se emite débil aquí (y siempre con Vary: Accept-Encoding).
+"""
+
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from src.infrastructure.container import get_catalogue_source
+from src.presentation.api.middleware.compression import choose_encoding
+
+
+# Los navegadores reutilizan la respuesta 60 s y luego revalidan con el ETag
+CATALOGUE_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+
+def _http_date(value: datetime) -> str:
+    return formatdate(value.timestamp(), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Comparación débil (RFC 7232): el middleware de compresión envía W/"..."
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified tiene resolución de segundos
+    return int(last_modified.timestamp()) <= int(since.timestamp())
+
+
+def check_catalogue_cache(request: Request, response: Response) -> Optional[Response]:
+    """
+    Validar la petición contra la versión del catálogo.
+
+    Debe llamarse al inicio del endpoint. Si el cliente ya tiene la versión
+    actual retorna una respuesta 304 lista para devolver; si no, agrega los
+    headers de cache a `response` y retorna None para continuar.
+
+    Args:
+        request: Petición entrante
+        response: Response inyectada por FastAPI para el camino normal
+
+    Returns:
+        Response 304 o None
+    """
+    source = get_catalogue_source()
+    etag = f'"{source.dataset_version}"'
+    sent_etag = etag if choose_encoding(request.headers.get('accept-encoding', '')) is None else f'W/{etag}'
+    headers = {'ETag': sent_etag, 'Cache-Control': CATALOGUE_CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+    if source.last_modified is not None:
+        headers['Last-Modified'] = _http_date(source.last_modified)
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get('if-modified-since')
+        not_modified = (
+            if_modified_since is not None and
+            source.last_modified is not None and
+            _not_modified_since(if_modified_since, source.last_modified)
+        )
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
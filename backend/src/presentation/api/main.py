@@ -3,7 +3,9 @@ FastAPI Application Main
 Punto de entrada de la aplicación REST API.
 """
 
-from fastapi import FastAPI
+import os
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
@@ -12,6 +14,13 @@ from pathlib import Path
 # Importar routers
 from src.presentation.api.routes import recommendations, health, sentiment
 from src.presentation.api.district_router import router as district_router
+from src.presentation.api.middleware.compression import (
+    CompressionMiddleware,
+    compression_settings_from_env
+)
+from src.presentation.api.middleware.metrics import MetricsMiddleware
+from src.presentation.api.middleware.profiling import ProfilingMiddleware
+from src.shared.profiling import get_sampler, profiling_enabled, sampler_enabled
 
 # Metadata de la API
 API_TITLE = "Restaurant Recommender API"
@@ -58,14 +67,31 @@ async def lifespan(app: FastAPI):
     print("Starting Restaurant Recommender API...")
     print("=" * 70)
 
-    # Aquí puedes cargar modelos ML, conectar a DB, etc.
     from src.infrastructure import container
     _ = container
     print("Dependency Container initialized")
     print(f"API Version: {API_VERSION}")
 
+    # Warm-up: datasets, índices, caches y primera predicción de cada modelo
+    from src.infrastructure.warmup import start_warmup
+    pending_warmup = start_warmup()
+    if pending_warmup is not None:
+        await pending_warmup
+
+    # Muestreo continuo de stacks (PROFILING_SAMPLER=true)
+    if sampler_enabled():
+        get_sampler().start()
+
     yield
 
+    get_sampler().stop()
+
+    # Aplicar las reseñas pendientes de la actualización incremental
+    from src.infrastructure.container import get_existing_sentiment_online_updater
+    updater = get_existing_sentiment_online_updater()
+    if updater is not None:
+        updater.close()
+
     # Shutdown
     print("\n" + "=" * 70)
     print("Shutting down Restaurant Recommender API...")
@@ -83,6 +109,10 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Profiling bajo demanda (el más interno: perfila solo la app)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -92,6 +122,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresión gzip/brotli de respuestas JSON grandes
+app.add_middleware(CompressionMiddleware, **compression_settings_from_env())
+
+# Métricas Prometheus (el más externo: incluye el tiempo de compresión)
+METRICS_ENABLED = os.getenv('ENABLE_METRICS', 'true').strip().lower() in ('1', 'true', 'yes')
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 # =========================================================================
 # ROOT ENDPOINT
@@ -112,6 +150,27 @@ async def root():
     }
 
 
+@app.get("/health", tags=["Root"])
+async def readiness():
+    """
+    Readiness probe: 200 con status "ready" cuando terminó el warm-up,
+    503 con status "warming_up" mientras tanto.
+    """
+    from src.presentation.api.routes.health import readiness_response
+    return readiness_response()
+
+
+if METRICS_ENABLED:
+    @app.get("/metrics", tags=["Root"], include_in_schema=False)
+    async def metrics():
+        """
+        Métricas en formato Prometheus: latencia y conteo por ruta
+        (http_request_*) y duración por etapa interna (app_stage_*).
+        """
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # =========================================================================
 # INCLUIR ROUTERS (después de crearlos)
 # =========================================================================
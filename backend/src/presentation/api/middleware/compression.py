@@ -0,0 +1,184 @@
+"""
+Compression Middleware
+Compresión gzip/brotli de respuestas JSON por encima de un tamaño mínimo.
+
+- Solo se comprimen cuerpos JSON completos (no streaming) mayores que
+  `minimum_size`; los pequeños no compensan el costo de CPU.
+- Se elige brotli si el cliente lo acepta y el paquete `brotli` está
+  instalado; si no, gzip.
+- Toda respuesta de un tipo comprimible (y todo 304) lleva
+  `Vary: Accept-Encoding`, se comprima o no: la misma URL tiene
+  representaciones distintas según el header.
+- Si el cliente acepta gzip/br, el ETag fuerte de un tipo comprimible pasa a
+  débil (W/) aunque el cuerpo sea pequeño y no se comprima: así el 200 y el
+  304 que lo revalida (ver http_cache) llevan el mismo validador.
+"""
+
+import gzip
+import os
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional
+    brotli = None
+
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+JSON_CONTENT_TYPES = ('application/json',)
+
+
+def compression_settings_from_env() -> Dict:
+    """
+    Configuración desde variables de entorno:
+
+    - COMPRESSION_MIN_SIZE (bytes, por defecto 1024)
+    - COMPRESSION_GZIP_LEVEL (1-9, por defecto 6)
+    - COMPRESSION_BROTLI_QUALITY (0-11, por defecto 4)
+    """
+    return {
+        'minimum_size': int(os.getenv('COMPRESSION_MIN_SIZE', DEFAULT_MINIMUM_SIZE)),
+        'gzip_level': int(os.getenv('COMPRESSION_GZIP_LEVEL', DEFAULT_GZIP_LEVEL)),
+        'brotli_quality': int(os.getenv('COMPRESSION_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY)),
+    }
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = DEFAULT_GZIP_LEVEL,
+             brotli_quality: int = DEFAULT_BROTLI_QUALITY) -> bytes:
+    """Comprime un cuerpo con 'gzip' o 'br'."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Elegir codificación según Accept-Encoding ('br' > 'gzip').
+
+    Respeta q=0 como rechazo explícito.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def _vary_on_accept_encoding(headers: MutableHeaders) -> None:
+    """Agregar Accept-Encoding a Vary sin duplicarlo (el endpoint puede traerlo)."""
+    current = [value.strip().lower() for value in headers.get('vary', '').split(',')]
+    if 'accept-encoding' not in current and '*' not in current:
+        headers.add_vary_header('Accept-Encoding')
+
+
+class CompressionMiddleware:
+    """Middleware ASGI de compresión para respuestas JSON."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+        content_types: Tuple[str, ...] = JSON_CONTENT_TYPES
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = content_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Intercepta start/body de una respuesta y la comprime si corresponde."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            headers = MutableHeaders(raw=message['headers'])
+            if message['status'] == 304:
+                # Sin Content-Type: el validador ya viene ajustado (http_cache)
+                _vary_on_accept_encoding(headers)
+                self._passthrough = True
+                await self._send(message)
+                return
+
+            content_type = headers.get('content-type', '').split(';')[0].strip()
+            if content_type not in self.middleware.content_types or 'content-encoding' in headers:
+                self._passthrough = True
+                await self._send(message)
+                return
+
+            _vary_on_accept_encoding(headers)
+            if self.encoding is None:
+                self._passthrough = True
+                await self._send(message)
+                return
+
+            etag = headers.get('etag')
+            if etag and not etag.startswith('W/'):
+                headers['ETag'] = f'W/{etag}'
+            self._start = message
+            return
+
+        if message['type'] != 'http.response.body' or self._passthrough:
+            await self._send(message)
+            return
+
+        start, self._start = self._start, None
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        # Respuestas en streaming o pequeñas: se envían sin comprimir
+        if start is None or more_body or len(body) < self.middleware.minimum_size:
+            self._passthrough = True
+            if start is not None:
+                await self._send(start)
+            await self._send(message)
+            return
+
+        compressed = compress(
+            body,
+            self.encoding,
+            gzip_level=self.middleware.gzip_level,
+            brotli_quality=self.middleware.brotli_quality
+        )
+
+        headers = MutableHeaders(raw=start['headers'])
+        headers['Content-Encoding'] = self.encoding
+        headers['Content-Length'] = str(len(compressed))
+
+        await self._send(start)
+        await self._send({'type': 'http.response.body', 'body': compressed})
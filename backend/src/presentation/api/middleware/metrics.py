@@ -0,0 +1,113 @@
+"""
+Metrics Middleware
+Métricas HTTP en formato Prometheus y desglose de etapas por petición.
+
+- http_requests_total{method, route, status}
+- http_request_duration_seconds{method, route}
+
+`route` es la plantilla de la ruta (/api/v1/sentiment/restaurant/{restaurant_id}),
+no el path concreto, para acotar la cardinalidad de las series.
+
+En modo debug (DEBUG=true) cada respuesta incluye el header Server-Timing
+con las etapas instrumentadas de esa petición (visible en las DevTools del
+navegador) y el tiempo total.
+"""
+
+import os
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.shared.instrumentation import begin_request_trace, current_trace, end_request_trace
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # prometheus-client es opcional
+    Counter = Histogram = None
+
+
+if Histogram is not None:
+    HTTP_REQUESTS = Counter(
+        'http_requests_total',
+        'Peticiones HTTP por ruta y status',
+        ['method', 'route', 'status']
+    )
+    HTTP_DURATION = Histogram(
+        'http_request_duration_seconds',
+        'Latencia de peticiones HTTP (hasta el inicio de la respuesta)',
+        ['method', 'route'],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    )
+else:
+    HTTP_REQUESTS = HTTP_DURATION = None
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+def debug_mode_from_env() -> bool:
+    """Modo debug desde DEBUG (true/1/yes)."""
+    return os.getenv('DEBUG', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def _route_template(scope: Scope) -> str:
+    """Plantilla de la ruta que atiende la petición."""
+    router = getattr(scope.get('app'), 'router', None)
+    for route in getattr(router, 'routes', ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, 'path', UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+def server_timing_header(trace, total_ms: float) -> str:
+    """Formatear etapas [(nombre, ms)] como valor de Server-Timing."""
+    entries = [
+        f"{name.replace(' ', '_')};dur={duration_ms:.3f}"
+        for name, duration_ms in trace
+    ]
+    entries.append(f"total;dur={total_ms:.3f}")
+    return ', '.join(entries)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI de métricas HTTP y traza de etapas en modo debug."""
+
+    def __init__(self, app: ASGIApp, debug: Optional[bool] = None, exclude_paths=('/metrics',)):
+        self.app = app
+        self.debug = debug_mode_from_env() if debug is None else debug
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['path'] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        token = begin_request_trace() if self.debug else None
+        trace = current_trace() if self.debug else None
+        status_code = 500
+        route = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, route
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                elapsed_ns = time.perf_counter_ns() - start
+                route = _route_template(scope)
+                if HTTP_DURATION is not None:
+                    HTTP_DURATION.labels(scope['method'], route).observe(elapsed_ns / 1e9)
+                if trace is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers.append('Server-Timing', server_timing_header(trace, elapsed_ns / 1e6))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                end_request_trace(token)
+            if HTTP_REQUESTS is not None:
+                HTTP_REQUESTS.labels(scope['method'], route or _route_template(scope), str(status_code)).inc()
@@ -0,0 +1,40 @@
+"""
+Profiling Middleware
+Perfila con cProfile/pyinstrument las peticiones reservadas por una captura
+activa (ver src/shared/profiling.py). Sin capturas abiertas el costo por
+petición es una comprobación de un flag.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.shared.profiling import get_capture_registry, start_profiler, stop_profiler
+from .metrics import _route_template
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI que perfila las próximas N peticiones de una ruta."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.registry = get_capture_registry()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self.registry.has_open_captures:
+            await self.app(scope, receive, send)
+            return
+
+        capture = self.registry.claim(_route_template(scope), scope['method'])
+        if capture is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        profiler = start_profiler(capture.profiler)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stop_profiler(profiler)
+            self.registry.release()
+            capture.add_profile(profiler, (time.perf_counter_ns() - start) / 1e6)
@@ -3,17 +3,49 @@ HEALTH CHECK ENDPOINT PARA PRODUCCIÓN
 Monitoreo del modelo híbrido optimizado
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 from datetime import datetime
-import psutil
+from typing import Literal, Optional
 import os
+import secrets
+
+from src.infrastructure.warmup import get_warmup_state
+from src.shared.profiling import (
+    available_profilers,
+    get_capture_registry,
+    get_sampler,
+    profiling_enabled
+)
 
 router = APIRouter(prefix="/health", tags=["Health Check"])
 
+
+def readiness_response() -> JSONResponse:
+    """Estado de warm-up del worker: 200 si está listo, 503 si no."""
+    warmup = get_warmup_state()
+    return JSONResponse(
+        status_code=200 if warmup.ready else 503,
+        content={
+            "status": "ready" if warmup.ready else "warming_up",
+            "timestamp": datetime.now().isoformat(),
+            "warmup": warmup.to_dict()
+        }
+    )
+
+
+@router.get("/ready")
+async def health_ready():
+    """Readiness probe (503 hasta completar el warm-up)"""
+    return readiness_response()
+
+
 @router.get("/status")
 async def health_status():
     """Health check básico del sistema con modelo híbrido"""
     try:
+        import psutil
         from src.infrastructure.container import get_sentiment_model
 
         # Verificar modelo
@@ -47,8 +79,12 @@ async def health_status():
                 "f1_neutro": round(test_metrics.get("per_class", {}).get("neutro", {}).get("f1-score", 0), 3)
             }
 
+        warmup = get_warmup_state()
+
         status = "healthy"
-        if not model_status:
+        if not warmup.ready:
+            status = "warming_up"
+        elif not model_status:
             status = "critical"
         elif memory_usage > 90 or cpu_usage > 90:
             status = "warning"
@@ -66,6 +102,7 @@ async def health_status():
                 "process_id": os.getpid()
             },
             "test_prediction": test_prediction,
+            "warmup": warmup.to_dict(),
             "version": "hybrid_v1.0"
         }
 
@@ -187,3 +224,121 @@ async def run_benchmark():
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Benchmark failed: {str(e)}")
+
+
+# =========================================================================
+# ADMIN: MEMORIA Y PROFILING (profiling apagado por defecto, ver PROFILING_ENABLED)
+# =========================================================================
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Endpoints de administración: requieren el header X-Admin-Token igual a
+    ADMIN_TOKEN. Sin ADMIN_TOKEN configurado quedan deshabilitados.
+    """
+    expected = os.getenv('ADMIN_TOKEN')
+    if not expected:
+        raise HTTPException(status_code=403, detail="Endpoints de administración deshabilitados (ADMIN_TOKEN no configurado)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="X-Admin-Token inválido")
+
+
+@router.get("/memory", dependencies=[Depends(require_admin)], include_in_schema=False)
+async def memory_report(
+    tracemalloc_top: int = Query(0, ge=0, le=100, description="Sitios de asignación (requiere PYTHONTRACEMALLOC)")
+):
+    """Memoria por componente: DataFrames, caches de objetos y modelos cargados"""
+    import asyncio
+    from src.infrastructure.memory_report import build_memory_report
+
+    # memory_usage(deep=True) recorre los str de cada fila: fuera del event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, build_memory_report, tracemalloc_top)
+
+
+def require_profiling() -> None:
+    """404 si el profiling no está habilitado (PROFILING_ENABLED=true)."""
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+class ProfileCaptureRequest(BaseModel):
+    """Perfilar las próximas `requests` peticiones a `route`."""
+    route: str = Field(..., description="Plantilla de la ruta, ej. /api/v1/sentiment/restaurant/{restaurant_id}")
+    method: Optional[str] = Field(None, description="Método HTTP (todos si se omite)")
+    requests: int = Field(10, ge=1, le=1000)
+    profiler: Literal['cprofile', 'pyinstrument'] = 'cprofile'
+
+
+profiling_dependencies = [Depends(require_profiling), Depends(require_admin)]
+
+
+@router.get("/profiling", dependencies=profiling_dependencies, include_in_schema=False)
+async def profiling_status():
+    """Profilers disponibles, capturas recientes y estado del sampler"""
+    return {
+        "profilers": available_profilers(),
+        "captures": [capture.to_dict(top=0) for capture in get_capture_registry().list()],
+        "sampler": get_sampler().to_dict()
+    }
+
+
+@router.post("/profiling/captures", status_code=202, dependencies=profiling_dependencies, include_in_schema=False)
+async def create_profile_capture(request: ProfileCaptureRequest):
+    """Iniciar una captura: las próximas N peticiones a la ruta se perfilan"""
+    try:
+        capture = get_capture_registry().create(
+            route=request.route,
+            method=request.method,
+            requests=request.requests,
+            profiler=request.profiler
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return capture.to_dict()
+
+
+@router.get("/profiling/captures/{capture_id}", dependencies=profiling_dependencies, include_in_schema=False)
+async def get_profile_capture(
+    capture_id: str,
+    top: int = Query(30, ge=1, le=500),
+    sort: Literal['cumulative', 'tottime', 'ncalls'] = 'cumulative',
+    report: bool = Query(False, description="Incluir el reporte en texto (pstats)")
+):
+    """Funciones más costosas acumuladas en las peticiones perfiladas"""
+    capture = get_capture_registry().get(capture_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail=f"Captura no encontrada: {capture_id}")
+    return capture.to_dict(top=top, sort=sort, include_report=report)
+
+
+@router.delete("/profiling/captures/{capture_id}", dependencies=profiling_dependencies, include_in_schema=False)
+async def cancel_profile_capture(capture_id: str):
+    """Cancelar una captura en curso (conserva lo perfilado hasta ahora)"""
+    capture = get_capture_registry().cancel(capture_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail=f"Captura no encontrada: {capture_id}")
+    return capture.to_dict()
+
+
+@router.post("/profiling/sampler/start", dependencies=profiling_dependencies, include_in_schema=False)
+async def start_sampler(
+    interval_ms: Optional[float] = Query(None, ge=1, le=1000),
+    dump_interval_s: Optional[float] = Query(None, ge=1, le=3600)
+):
+    """Activar el muestreo continuo de stacks (archivos .folded en PROFILING_DIR)"""
+    sampler = get_sampler()
+    if not sampler.running:
+        if interval_ms is not None:
+            sampler.interval_ms = interval_ms
+        if dump_interval_s is not None:
+            sampler.dump_interval_s = dump_interval_s
+        sampler.start()
+    return sampler.to_dict()
+
+
+@router.post("/profiling/sampler/stop", dependencies=profiling_dependencies, include_in_schema=False)
+async def stop_sampler():
+    """Detener el muestreo y escribir los stacks pendientes"""
+    sampler = get_sampler()
+    dumped = sampler.stop()
+    return {**sampler.to_dict(), "dumped": dumped}
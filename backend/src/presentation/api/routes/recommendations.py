@@ -3,28 +3,45 @@ Recommendations Routes
 Endpoints para recomendaciones de restaurantes.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
 from src.application import RecommendationService, RecommendationRequestDTO, RecommendationResponseDTO
-from src.infrastructure import get_restaurant_repository
-from src.domain.repositories import RestaurantRepository
+from typing import Optional
+from src.infrastructure import get_restaurant_repository, get_review_repository
+from src.domain.repositories import RestaurantRepository, ReviewRepository
+from src.presentation.api.http_cache import check_catalogue_cache
 
 router = APIRouter()
 
 
+def get_optional_review_repository() -> Optional[ReviewRepository]:
+    """Repositorio de reseñas, o None si el dataset de reseñas no está disponible."""
+    try:
+        return get_review_repository()
+    except Exception:
+        return None
+
+
 def get_recommendation_service(
     restaurant_repo: RestaurantRepository = Depends(get_restaurant_repository)
 ) -> RecommendationService:
     """
     Dependency provider para RecommendationService.
 
-    Equivalente a @Autowired en Spring Boot.
+    Equivalente a @Autowired en Spring Boot. El repositorio de reseñas se
+    resuelve solo si la petición pide include_sentiment: las recomendaciones
+    sin sentimientos no cargan el dataset de reseñas.
     """
-    return RecommendationService(restaurant_repo)
+    return RecommendationService(
+        restaurant_repo,
+        review_repository_provider=get_optional_review_repository
+    )
 
 
 @router.post(
     "/recommendations",
     response_model=RecommendationResponseDTO,
+    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     summary="Obtener recomendaciones personalizadas",
     description="Genera recomendaciones de restaurantes basadas en ubicación y preferencias del usuario."
@@ -41,6 +58,7 @@ async def get_recommendations(
     - preferences: Preferencias del usuario (categoría, etc.)
     - filters: Filtros de búsqueda (min_rating, max_distance_km, district)
     - top_n: Número de recomendaciones deseadas (1-50)
+    - include_sentiment: Incluir estadísticas de sentimientos en `details.sentiment`
 
     **Respuesta:**
     - Lista de restaurantes recomendados ordenados por score
@@ -49,7 +67,9 @@ async def get_recommendations(
     """
     try:
         response = service.get_recommendations(request)
-        return response
+        # Los DTOs ya se construyen con tipos nativos: se serializan con
+        # orjson directamente, sin la re-validación contra response_model
+        return ORJSONResponse(response.model_dump())
 
     except ValueError as e:
         raise HTTPException(
@@ -71,9 +91,15 @@ async def get_recommendations(
     description="Lista todas las categorías de restaurantes disponibles."
 )
 async def get_categories(
+    request: Request,
+    response: Response,
     restaurant_repo: RestaurantRepository = Depends(get_restaurant_repository)
 ):
-    """Obtener lista de categorías."""
+    """Obtener lista de categorías (cacheable con ETag por versión del catálogo)."""
+    not_modified = check_catalogue_cache(request, response)
+    if not_modified is not None:
+        return not_modified
+
     try:
         categories = restaurant_repo.get_categories()
         return categories
@@ -91,9 +117,15 @@ async def get_categories(
     description="Lista todos los distritos con restaurantes."
 )
 async def get_districts(
+    request: Request,
+    response: Response,
     restaurant_repo: RestaurantRepository = Depends(get_restaurant_repository)
 ):
-    """Obtener lista de distritos."""
+    """Obtener lista de distritos (cacheable con ETag por versión del catálogo)."""
+    not_modified = check_catalogue_cache(request, response)
+    if not_modified is not None:
+        return not_modified
+
     try:
         print(f"[DEBUG] Getting districts from repository: {type(restaurant_repo).__name__}")
         districts = restaurant_repo.get_districts()
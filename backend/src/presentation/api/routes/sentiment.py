@@ -3,23 +3,45 @@ Sentiment Analysis API Routes
 Endpoints para análisis de sentimientos de reseñas.
 """
 
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from typing import Optional
 
 from src.application.dto.sentiment_dto import (
     SentimentAnalysisRequestDTO,
     SentimentAnalysisResponseDTO,
     RestaurantSentimentStatsDTO,
+    BulkSentimentStatsRequestDTO,
+    BulkSentimentStatsResponseDTO,
     BatchSentimentAnalysisRequestDTO,
     BatchSentimentAnalysisResponseDTO,
     SentimentComparisonRequestDTO,
     SentimentComparisonResponseDTO,
     ReviewDTO,
+    ReviewPageDTO,
     ModelPerformanceMetricsDTO,
     ModelMetricsPerClassDTO
 )
-from src.application.services.sentiment_service import SentimentAnalysisService
-from src.infrastructure.container import get_review_repository, get_sentiment_model
+from src.application.services.sentiment_service import SentimentAnalysisService, STREAM_CHUNK_SIZE
+from src.presentation.api.streaming import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    NDJSONStreamingResponse,
+    OversizedLine,
+    csv_chunks,
+    iter_lines,
+    json_array_chunks,
+    ndjson_chunks,
+    ndjson_line
+)
+from src.infrastructure.container import (
+    get_review_repository,
+    get_sentiment_model,
+    get_sentiment_batcher,
+    get_sentiment_online_updater,
+    get_single_flight
+)
 
 # Router
 router = APIRouter(
@@ -32,12 +54,18 @@ def get_sentiment_service() -> SentimentAnalysisService:
     """Dependency injection para el servicio de sentimientos."""
     review_repo = get_review_repository()
     sentiment_model = get_sentiment_model()
-    return SentimentAnalysisService(review_repo, sentiment_model)
+    return SentimentAnalysisService(
+        review_repo,
+        sentiment_model,
+        batcher=get_sentiment_batcher(),
+        single_flight=get_single_flight()
+    )
 
 
 @router.post(
     "/analyze",
     response_model=SentimentAnalysisResponseDTO,
+    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     summary="Analizar sentimiento de un comentario",
     description="Analiza el sentimiento de un comentario individual usando el modelo de Redes Bayesianas."
@@ -52,9 +80,10 @@ async def analyze_sentiment(request: SentimentAnalysisRequestDTO):
     """
     try:
         service = get_sentiment_service()
-        result = service.analyze_comment(request.comment)
+        result = await service.analyze_comment_async(request.comment)
 
-        return SentimentAnalysisResponseDTO(
+        # predict_batch emite tipos nativos: sin re-validación, directo a orjson
+        response = SentimentAnalysisResponseDTO.model_construct(
             comment=result['comment'],
             sentiment=result['sentiment'],
             confidence=result['confidence'],
@@ -62,6 +91,7 @@ async def analyze_sentiment(request: SentimentAnalysisRequestDTO):
             probabilities=result['probabilities'],
             processed_text=result.get('processed_text')
         )
+        return ORJSONResponse(response.model_dump())
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,6 +107,7 @@ async def analyze_sentiment(request: SentimentAnalysisRequestDTO):
 @router.post(
     "/analyze/batch",
     response_model=BatchSentimentAnalysisResponseDTO,
+    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     summary="Analizar múltiples comentarios",
     description="Analiza el sentimiento de múltiples comentarios en una sola petición."
@@ -95,22 +126,23 @@ async def analyze_batch_sentiment(request: BatchSentimentAnalysisRequestDTO):
         results = []
         summary = {"positivo": 0, "neutro": 0, "negativo": 0}
 
-        for comment in request.comments:
-            result = service.analyze_comment(comment)
-            results.append(SentimentAnalysisResponseDTO(
+        for result in service.analyze_comments(request.comments):
+            results.append(SentimentAnalysisResponseDTO.model_construct(
                 comment=result['comment'],
                 sentiment=result['sentiment'],
                 confidence=result['confidence'],
+                confidence_level=None,
                 probabilities=result['probabilities'],
                 processed_text=result.get('processed_text')
             ))
             summary[result['sentiment']] += 1
 
-        return BatchSentimentAnalysisResponseDTO(
+        response = BatchSentimentAnalysisResponseDTO.model_construct(
             total=len(results),
             results=results,
             summary=summary
         )
+        return ORJSONResponse(response.model_dump())
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -123,6 +155,101 @@ async def analyze_batch_sentiment(request: BatchSentimentAnalysisRequestDTO):
         )
 
 
+# Mismo límite que SentimentAnalysisRequestDTO.comment
+MAX_COMMENT_LENGTH = 5000
+
+# Tope de una línea del cuerpo en bytes: un comentario de MAX_COMMENT_LENGTH
+# caracteres escapados como \uXXXX (6 bytes) más el resto del objeto
+MAX_LINE_BYTES = 6 * MAX_COMMENT_LENGTH + 1024
+
+
+async def _parse_comment_lines(request: Request):
+    """
+    Convertir el cuerpo NDJSON/JSON-lines en registros para analyze_stream.
+
+    Cada línea puede ser un string JSON ("texto") o un objeto con 'comment'
+    (o 'text') y un 'id' opcional que se devuelve en el resultado.
+    """
+    index = 0
+    async for line in iter_lines(request.stream(), max_line_bytes=MAX_LINE_BYTES):
+        if isinstance(line, OversizedLine):
+            yield {'index': index, 'error': f"Línea mayor a {MAX_LINE_BYTES} bytes"}
+            index += 1
+            continue
+        if not line.strip():
+            continue
+
+        record = {'index': index}
+        index += 1
+        try:
+            value = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield {**record, 'error': 'JSON inválido'}
+            continue
+
+        if isinstance(value, dict):
+            comment = value.get('comment', value.get('text'))
+            if value.get('id') is not None:
+                record['id'] = value['id']
+        else:
+            comment = value
+
+        if not isinstance(comment, str) or not comment.strip():
+            yield {**record, 'error': "Se requiere 'comment' no vacío"}
+        elif len(comment) > MAX_COMMENT_LENGTH:
+            yield {**record, 'error': f"Comentario mayor a {MAX_COMMENT_LENGTH} caracteres"}
+        else:
+            yield {**record, 'comment': comment}
+
+
+@router.post(
+    "/analyze/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=NDJSONStreamingResponse,
+    summary="Analizar comentarios en streaming (NDJSON)",
+    description="Acepta un cuerpo NDJSON de tamaño arbitrario y devuelve un resultado NDJSON por línea, con el resumen al final."
+)
+async def analyze_stream_sentiment(
+    request: Request,
+    chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=10000, description="Comentarios por bloque de predicción"),
+    echo_comment: bool = Query(False, description="Incluir el comentario original en cada resultado")
+):
+    """
+    Analizar sentimientos de un stream NDJSON sin límite de tamaño.
+
+    - **Entrada**: una línea por comentario, `"texto"` o `{"id": ..., "comment": "texto"}`
+    - **Salida**: una línea por comentario (`index`, `id`, `sentiment`, `confidence`,
+      `probabilities`) o `{"index", "error"}` si la línea es inválida
+    - **Última línea**: `{"summary": {...}, "total": n, "errors": k}`
+
+    El cuerpo se lee y se puntúa por bloques, con memoria acotada.
+    """
+    try:
+        service = get_sentiment_service()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error en análisis en streaming: {str(e)}"
+        )
+
+    if not service.sentiment_model or not service.sentiment_model.is_trained:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El modelo de sentimientos no está disponible o entrenado"
+        )
+
+    async def body():
+        records = service.analyze_stream(
+            _parse_comment_lines(request),
+            chunk_size=chunk_size,
+            echo_comment=echo_comment
+        )
+        async for record in records:
+            yield ndjson_line(record)
+
+    return NDJSONStreamingResponse(body())
+
+
 @router.get(
     "/restaurant/{restaurant_id}",
     response_model=RestaurantSentimentStatsDTO,
@@ -144,7 +271,7 @@ async def get_restaurant_sentiment_stats(restaurant_id: str):
     """
     try:
         service = get_sentiment_service()
-        stats = service.get_sentiment_statistics(restaurant_id)
+        stats = await service.get_sentiment_statistics_async(restaurant_id)
 
         if stats['total'] == 0:
             raise HTTPException(
@@ -168,6 +295,49 @@ async def get_restaurant_sentiment_stats(restaurant_id: str):
         )
 
 
+@router.post(
+    "/restaurants/stats",
+    response_model=BulkSentimentStatsResponseDTO,
+    status_code=status.HTTP_200_OK,
+    summary="Estadísticas de sentimientos de varios restaurantes",
+    description="Obtiene en una sola llamada las estadísticas de sentimientos de hasta 200 restaurantes."
+)
+async def get_bulk_sentiment_stats(request: BulkSentimentStatsRequestDTO):
+    """
+    Estadísticas de sentimientos de varios restaurantes.
+
+    - **restaurant_ids**: Lista de IDs (1-200)
+
+    Equivale a llamar `GET /restaurant/{id}` por cada restaurante, pero con
+    una sola agregación sobre las reseñas. Los IDs sin reseñas se listan en
+    `not_found` en lugar de devolver 404.
+    """
+    try:
+        service = get_sentiment_service()
+        bulk_stats = await service.get_sentiment_statistics_bulk_async(request.restaurant_ids)
+
+        stats = {}
+        not_found = []
+        for restaurant_id, restaurant_stats in bulk_stats.items():
+            if restaurant_stats['total'] == 0:
+                not_found.append(restaurant_id)
+                continue
+            stats[restaurant_id] = RestaurantSentimentStatsDTO(
+                restaurant_id=restaurant_id,
+                total_reviews=restaurant_stats['total'],
+                sentiments=restaurant_stats['sentiments'],
+                sentiment_percentages=restaurant_stats['percentages'],
+                avg_confidence=restaurant_stats.get('avg_confidence')
+            )
+
+        return BulkSentimentStatsResponseDTO(stats=stats, not_found=not_found)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error obteniendo estadísticas: {str(e)}"
+        )
+
+
 @router.get(
     "/restaurant/{restaurant_id}/reviews",
     response_model=list[ReviewDTO],
@@ -177,8 +347,10 @@ async def get_restaurant_sentiment_stats(restaurant_id: str):
 )
 async def get_reviews_by_sentiment(
     restaurant_id: str,
+    response: Response,
     sentiment: str = Query(..., description="Sentimiento a filtrar (positivo/neutro/negativo)"),
-    limit: int = Query(10, ge=1, le=50, description="Número máximo de reseñas")
+    limit: int = Query(10, ge=1, le=50, description="Número máximo de reseñas"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página (header X-Next-Cursor de la respuesta anterior)")
 ):
     """
     Obtener reseñas filtradas por sentimiento.
@@ -186,12 +358,17 @@ async def get_reviews_by_sentiment(
     - **restaurant_id**: ID del restaurante
     - **sentiment**: Sentimiento a filtrar (positivo, neutro, negativo)
     - **limit**: Número máximo de reseñas (1-50)
+    - **cursor**: Cursor opaco para continuar desde la página anterior
 
-    Retorna lista de reseñas con el sentimiento especificado.
+    Retorna lista de reseñas con el sentimiento especificado. Si hay más
+    reseñas, el header `X-Next-Cursor` trae el cursor de la siguiente página.
     """
     try:
         service = get_sentiment_service()
-        reviews = service.get_reviews_by_sentiment(restaurant_id, sentiment, limit)
+        page = service.get_reviews_page(restaurant_id, sentiment, cursor, limit)
+        reviews = page['reviews']
+        if page['next_cursor']:
+            response.headers['X-Next-Cursor'] = page['next_cursor']
 
         return [
             ReviewDTO(
@@ -217,6 +394,104 @@ async def get_reviews_by_sentiment(
         )
 
 
+@router.get(
+    "/reviews",
+    response_model=ReviewPageDTO,
+    status_code=status.HTTP_200_OK,
+    summary="Listar reseñas con paginación por cursor",
+    description="Lista reseñas de un restaurante, de un sentimiento o de todo el corpus, página a página."
+)
+async def list_reviews(
+    restaurant_id: Optional[str] = Query(None, description="Filtrar por restaurante"),
+    sentiment: Optional[str] = Query(None, description="Filtrar por sentimiento (positivo/neutro/negativo)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor"),
+    limit: int = Query(50, ge=1, le=500, description="Tamaño de página")
+):
+    """
+    Listar reseñas con paginación por cursor.
+
+    - **restaurant_id** / **sentiment**: Filtros opcionales
+    - **cursor**: `next_cursor` de la página anterior (omitir en la primera)
+    - **limit**: Tamaño de página (1-500)
+
+    El cursor es opaco y solo vale para los mismos filtros. A diferencia de
+    un offset, no se desplaza si se agregan reseñas entre páginas.
+    """
+    try:
+        service = get_sentiment_service()
+        page = service.get_reviews_page(restaurant_id, sentiment, cursor, limit)
+        return ReviewPageDTO(
+            reviews=[ReviewDTO(**review) for review in page['reviews']],
+            next_cursor=page['next_cursor']
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error obteniendo reseñas: {str(e)}"
+        )
+
+
+EXPORT_COLUMNS = ('id_review', 'id_place', 'comment', 'rating', 'username', 'review_date', 'sentimiento')
+EXPORT_FORMATS = {
+    'ndjson': (NDJSON_MEDIA_TYPE, 'ndjson'),
+    'json': ('application/json', 'json'),
+    'csv': (CSV_MEDIA_TYPE, 'csv'),
+}
+
+
+@router.get(
+    "/reviews/export",
+    status_code=status.HTTP_200_OK,
+    summary="Exportar reseñas en streaming",
+    description="Exporta reseñas (restaurante, sentimiento o corpus completo) como NDJSON, JSON o CSV en streaming."
+)
+async def export_reviews(
+    restaurant_id: Optional[str] = Query(None, description="Filtrar por restaurante"),
+    sentiment: Optional[str] = Query(None, description="Filtrar por sentimiento (positivo/neutro/negativo)"),
+    format: str = Query('ndjson', pattern='^(ndjson|json|csv)$', description="Formato: ndjson, json o csv"),
+    chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=100, le=10000, description="Reseñas por fragmento")
+):
+    """
+    Exportar reseñas en streaming.
+
+    Las reseñas se leen y serializan por bloques de `chunk_size`: nunca se
+    construye la lista completa ni el cuerpo completo en memoria.
+    """
+    try:
+        service = get_sentiment_service()
+        chunks = service.export_reviews(restaurant_id, sentiment, chunk_size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error exportando reseñas: {str(e)}"
+        )
+
+    media_type, extension = EXPORT_FORMATS[format]
+    if format == 'csv':
+        body = csv_chunks(chunks, EXPORT_COLUMNS)
+    elif format == 'json':
+        body = json_array_chunks(chunks)
+    else:
+        body = ndjson_chunks(chunks)
+
+    filename = f"reviews_{restaurant_id or sentiment or 'all'}.{extension}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get(
     "/model/info",
     status_code=status.HTTP_200_OK,
@@ -348,3 +623,55 @@ async def get_model_metrics():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error obteniendo métricas del modelo: {str(e)}"
         )
+
+
+@router.get(
+    "/batcher/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas del micro-batcher",
+    description="Tamaño de lote y tiempo en cola del micro-batcher de /sentiment/analyze."
+)
+async def get_batcher_metrics():
+    """
+    Obtener métricas del micro-batcher de sentimientos.
+
+    Retorna:
+    - Configuración (max_batch_size, max_wait_ms)
+    - Lotes y comentarios procesados
+    - Tamaño de lote y tiempo en cola (media, p50, p95, p99, max)
+    """
+    try:
+        return get_sentiment_batcher().get_metrics()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error obteniendo métricas del batcher: {str(e)}"
+        )
+
+
+@router.get(
+    "/online-updates/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Métricas de la actualización incremental",
+    description="Reseñas nuevas incorporadas al modelo con partial_fit (SENTIMENT_ONLINE_UPDATES)."
+)
+async def get_online_update_metrics():
+    """
+    Obtener métricas del job de actualización incremental del modelo.
+
+    Retorna:
+    - Si está activo (SENTIMENT_ONLINE_UPDATES)
+    - Reseñas recibidas, pendientes, aplicadas y descartadas
+    - Lotes aplicados, errores y resumen del último lote
+    """
+    from src.application.services.sentiment_online_updater import online_updates_enabled
+
+    if not online_updates_enabled():
+        return {'enabled': False}
+    try:
+        return {'enabled': True, **get_sentiment_online_updater().get_metrics()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error obteniendo métricas de la actualización incremental: {str(e)}"
+        )
@@ -0,0 +1,132 @@
+"""
+Streaming helpers
+Lectura incremental de cuerpos NDJSON y respuestas NDJSON/JSON/CSV en streaming.
+
+Permiten procesar entradas arbitrariamente grandes con memoria acotada:
+el cuerpo se consume por fragmentos y la respuesta se emite línea a línea.
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import orjson
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"  # Starlette añade "; charset=utf-8" a los tipos text/*
+
+RecordChunks = Iterable[List[Dict]]
+
+
+@dataclass(frozen=True)
+class OversizedLine:
+    """Marca de una línea descartada por superar `max_line_bytes`."""
+
+    length: int  # Bytes de la línea (sin el salto de línea)
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: Optional[int] = None
+) -> AsyncIterator[Union[bytes, OversizedLine]]:
+    """
+    Dividir un stream de bytes en líneas (sin el salto de línea).
+
+    Solo se retiene en memoria la línea incompleta actual, hasta
+    `max_line_bytes`: una línea más larga se descarta hasta el siguiente salto
+    de línea y en su lugar se emite un OversizedLine.
+    """
+    pending = bytearray()
+    discarded = 0  # > 0 mientras se descarta una línea demasiado larga
+    async for chunk in chunks:
+        start = 0
+        while start < len(chunk):
+            newline = chunk.find(b'\n', start)
+            end = len(chunk) if newline == -1 else newline
+
+            if discarded:
+                discarded += end - start
+            elif max_line_bytes is not None and len(pending) + (end - start) > max_line_bytes:
+                discarded = len(pending) + (end - start)
+                pending = bytearray()
+            else:
+                pending += chunk[start:end]
+
+            if newline == -1:
+                break
+            if discarded:
+                yield OversizedLine(discarded)
+                discarded = 0
+            else:
+                yield bytes(pending).rstrip(b'\r')
+                pending = bytearray()
+            start = newline + 1
+
+    if discarded:
+        yield OversizedLine(discarded)
+    elif pending:
+        yield bytes(pending).rstrip(b'\r')
+
+
+def ndjson_line(record: dict) -> bytes:
+    """Serializar un registro como una línea NDJSON."""
+    return orjson.dumps(record) + b'\n'
+
+
+def ndjson_chunks(chunks: RecordChunks) -> Iterator[bytes]:
+    """Un bloque de registros -> un fragmento NDJSON."""
+    for records in chunks:
+        if records:
+            yield b''.join(ndjson_line(record) for record in records)
+
+
+def json_array_chunks(chunks: RecordChunks) -> Iterator[bytes]:
+    """Bloques de registros -> un único array JSON emitido por fragmentos."""
+    yield b'['
+    first = True
+    for records in chunks:
+        if not records:
+            continue
+        body = b','.join(orjson.dumps(record) for record in records)
+        yield body if first else b',' + body
+        first = False
+    yield b']'
+
+
+def csv_chunks(chunks: RecordChunks, columns: Sequence[str]) -> Iterator[bytes]:
+    """Bloques de registros -> CSV con cabecera, un fragmento por bloque."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction='ignore')
+    writer.writeheader()
+    for records in chunks:
+        writer.writerows(records)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse NDJSON que puede emitirse mientras se lee el cuerpo
+    de la petición.
+
+    StreamingResponse escucha `receive` en paralelo para detectar la
+    desconexión del cliente, lo que consumiría los mensajes del cuerpo que
+    el endpoint todavía está leyendo. Aquí solo se envía el contenido; una
+    desconexión se detecta igualmente al fallar `send`.
+    """
+
+    def __init__(self, content: Union[AsyncIterable[bytes], Iterable[bytes]], **kwargs):
+        kwargs.setdefault('media_type', NDJSON_MEDIA_TYPE)
+        super().__init__(content, **kwargs)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,17 @@
+"""
+Shared Package
+Utilidades transversales sin dependencias de capa (usables desde dominio,
+aplicación, infraestructura y ML).
+"""
+
+from .instrumentation import stage, timed, begin_request_trace, current_trace, end_request_trace
+from .single_flight import SingleFlight
+
+__all__ = [
+    'stage',
+    'timed',
+    'begin_request_trace',
+    'current_trace',
+    'end_request_trace',
+    'SingleFlight',
+]
@@ -0,0 +1,103 @@
+"""
+Instrumentation
+Medición de latencia por etapa con perf_counter_ns.
+
+Cada etapa (`with stage('recommendation.scoring'):` o `@timed(...)`) se
+registra en un histograma Prometheus con la etiqueta `stage`. Si la petición
+actual tiene una traza activa (modo debug), la duración también se agrega a
+la lista de etapas de esa petición para devolverla en el header
+Server-Timing.
+
+El costo por etapa es de dos lecturas de reloj y una observación del
+histograma; prometheus-client es opcional (sin él solo se mantiene la traza).
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Callable, Iterator, List, Optional, Tuple
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # prometheus-client es opcional
+    Counter = Histogram = None
+
+
+# Buckets en segundos: de 50 µs a 10 s (etapas internas y CSV loads)
+STAGE_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+if Histogram is not None:
+    STAGE_DURATION = Histogram(
+        'app_stage_duration_seconds',
+        'Duración de etapas internas (filtrado, scoring, TF-IDF, lecturas CSV...)',
+        ['stage'],
+        buckets=STAGE_BUCKETS
+    )
+    STAGE_ERRORS = Counter(
+        'app_stage_errors_total',
+        'Etapas que terminaron con excepción',
+        ['stage']
+    )
+else:
+    STAGE_DURATION = STAGE_ERRORS = None
+
+
+StageTrace = List[Tuple[str, float]]
+
+# Etapas de la petición en curso (None = sin traza, caso normal)
+_current_trace: ContextVar[Optional[StageTrace]] = ContextVar('stage_trace', default=None)
+
+
+def begin_request_trace() -> Token:
+    """Activar la traza de etapas para la petición (contexto) actual."""
+    return _current_trace.set([])
+
+
+def current_trace() -> Optional[StageTrace]:
+    """Lista de etapas de la traza activa (None si no hay traza)."""
+    return _current_trace.get()
+
+
+def end_request_trace(token: Token) -> StageTrace:
+    """Cerrar la traza y retornar las etapas registradas [(nombre, ms)]."""
+    trace = _current_trace.get() or []
+    _current_trace.reset(token)
+    return trace
+
+
+def record_stage(name: str, elapsed_ns: int) -> None:
+    """Registrar una duración ya medida."""
+    if STAGE_DURATION is not None:
+        STAGE_DURATION.labels(name).observe(elapsed_ns / 1e9)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.append((name, elapsed_ns / 1e6))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Context manager que mide el bloque como la etapa `name`."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException:
+        if STAGE_ERRORS is not None:
+            STAGE_ERRORS.labels(name).inc()
+        raise
+    finally:
+        record_stage(name, time.perf_counter_ns() - start)
+
+
+def timed(name: str) -> Callable:
+    """Decorador equivalente a envolver la función en `stage(name)`."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
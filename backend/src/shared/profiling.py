@@ -0,0 +1,389 @@
+"""
+Profiling
+Perfilado bajo demanda de peticiones y muestreo continuo de stacks.
+
+- Capturas: perfilan las próximas N peticiones de una ruta con cProfile (o
+  pyinstrument si está instalado) y acumulan las estadísticas de todas ellas
+  para consultar las funciones más costosas.
+- Sampler: un hilo daemon toma `sys._current_frames()` de todos los hilos
+  cada `interval_ms` y escribe periódicamente los stacks agregados en formato
+  "folded" (`frame;frame;frame cantidad`), listo para flamegraph.pl,
+  speedscope o inferno. Ve también el trabajo en el thread pool.
+
+cProfile solo instrumenta el hilo que lo activa (el event loop): mientras la
+petición perfilada espera un `await`, el trabajo de otras corrutinas también
+queda registrado. Por eso se perfila una petición a la vez y conviene
+capturar con poco tráfico o usar el sampler.
+
+Todo está apagado por defecto (PROFILING_ENABLED / PROFILING_SAMPLER).
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyinstrument
+except ImportError:  # pyinstrument es opcional
+    pyinstrument = None
+
+
+PROFILERS = ('cprofile', 'pyinstrument')
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+MAX_FINISHED_CAPTURES = 20
+
+
+def _env_flag(name: str, default: str = 'false') -> bool:
+    return os.getenv(name, default).strip().lower() in ('1', 'true', 'yes')
+
+
+def profiling_enabled() -> bool:
+    """Endpoints de captura activos (PROFILING_ENABLED, apagado por defecto)."""
+    return _env_flag('PROFILING_ENABLED')
+
+
+def sampler_enabled() -> bool:
+    """Sampler continuo al arrancar (PROFILING_SAMPLER, apagado por defecto)."""
+    return _env_flag('PROFILING_SAMPLER')
+
+
+def available_profilers() -> List[str]:
+    return [name for name in PROFILERS if name != 'pyinstrument' or pyinstrument is not None]
+
+
+def _function_label(key) -> str:
+    filename, line, name = key
+    if filename == '~':
+        return name  # funciones built-in: "<method 'sort' of 'list' objects>"
+    return f"{name} ({_short_path(filename)}:{line})"
+
+
+def _short_path(filename: str) -> str:
+    """Recortar el path a partir del paquete (src/..., site-packages/...)."""
+    for marker in ('site-packages' + os.sep, 'backend' + os.sep):
+        index = filename.rfind(marker)
+        if index >= 0:
+            return filename[index + len(marker):]
+    return filename
+
+
+# ========== Capturas bajo demanda ==========
+
+@dataclass
+class ProfileCapture:
+    """Perfil acumulado de las próximas `requested` peticiones a una ruta."""
+    route: str
+    method: Optional[str]
+    requested: int
+    profiler: str = 'cprofile'
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    completed: int = 0
+    in_flight: int = 0
+    cancelled: bool = False
+    finished_at: Optional[str] = None
+    durations_ms: List[float] = field(default_factory=list)
+    _stats: Optional[pstats.Stats] = field(default=None, repr=False)
+    _sessions: List[Any] = field(default_factory=list, repr=False)
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return 'cancelled'
+        if self.completed >= self.requested:
+            return 'completed'
+        return 'running' if self.completed or self.in_flight else 'waiting'
+
+    @property
+    def open(self) -> bool:
+        return not self.cancelled and self.completed + self.in_flight < self.requested
+
+    def matches(self, route: str, method: str) -> bool:
+        return self.route == route and (self.method is None or self.method == method)
+
+    def add_profile(self, profile: Any, duration_ms: float) -> None:
+        """Acumular el perfil de una petición terminada."""
+        if self.profiler == 'cprofile':
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+        else:
+            self._sessions.append(profile.last_session)
+        self.durations_ms.append(round(duration_ms, 3))
+        self.completed += 1
+        self.in_flight -= 1
+        if self.completed >= self.requested:
+            self.finished_at = datetime.now().isoformat()
+
+    def hot_functions(self, top: int = 30, sort: str = 'cumulative') -> List[Dict]:
+        """Funciones más costosas del perfil acumulado (solo cProfile)."""
+        if self._stats is None:
+            return []
+        column = {'ncalls': 1, 'tottime': 2, 'cumulative': 3}[sort]
+        rows = sorted(self._stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+        return [
+            {
+                'function': _function_label(key),
+                'ncalls': ncalls,
+                'primitive_calls': primitive_calls,
+                'tottime_ms': round(tottime * 1000, 3),
+                'cumtime_ms': round(cumtime * 1000, 3),
+                'percall_cum_ms': round(cumtime * 1000 / ncalls, 4) if ncalls else 0.0,
+            }
+            for key, (primitive_calls, ncalls, tottime, cumtime, _) in rows[:top]
+        ]
+
+    def text_report(self, top: int = 30, sort: str = 'cumulative') -> Optional[str]:
+        """Reporte en texto: pstats o árbol de llamadas de pyinstrument."""
+        if self._stats is not None:
+            buffer = io.StringIO()
+            self._stats.stream = buffer
+            self._stats.sort_stats(sort).print_stats(top)
+            return buffer.getvalue()
+        if self._sessions:
+            from pyinstrument.renderers import ConsoleRenderer
+            from pyinstrument.session import Session
+
+            session = self._sessions[0]
+            for other in self._sessions[1:]:
+                session = Session.combine(session, other)
+            return ConsoleRenderer(unicode=True, color=False, show_all=False).render(session)
+        return None
+
+    def to_dict(self, top: int = 30, sort: str = 'cumulative', include_report: bool = False) -> Dict:
+        data = {
+            'id': self.id,
+            'route': self.route,
+            'method': self.method,
+            'profiler': self.profiler,
+            'status': self.status,
+            'requested': self.requested,
+            'completed': self.completed,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'durations_ms': self.durations_ms,
+        }
+        if self.completed:
+            data['hot_functions'] = self.hot_functions(top, sort)
+            if include_report or self.profiler == 'pyinstrument':
+                data['report'] = self.text_report(top, sort)
+        return data
+
+
+class CaptureRegistry:
+    """Capturas activas y recientes; una petición perfilada a la vez."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._captures: Dict[str, ProfileCapture] = {}
+        self._profiling = False
+
+    @property
+    def has_open_captures(self) -> bool:
+        # Lectura sin lock: el middleware la consulta en cada petición
+        return any(capture.open for capture in self._captures.values())
+
+    def create(self, route: str, method: Optional[str], requests: int, profiler: str = 'cprofile') -> ProfileCapture:
+        if profiler not in available_profilers():
+            raise ValueError(f"Profiler no disponible: {profiler} (opciones: {', '.join(available_profilers())})")
+        method = method.upper() if method else None
+        with self._lock:
+            for capture in self._captures.values():
+                if capture.open and capture.route == route and capture.method == method:
+                    raise ValueError(f"Ya hay una captura activa para {method or '*'} {route}: {capture.id}")
+            capture = ProfileCapture(route=route, method=method, requested=requests, profiler=profiler)
+            self._captures[capture.id] = capture
+            self._prune()
+        return capture
+
+    def get(self, capture_id: str) -> Optional[ProfileCapture]:
+        return self._captures.get(capture_id)
+
+    def list(self) -> List[ProfileCapture]:
+        return sorted(self._captures.values(), key=lambda capture: capture.created_at, reverse=True)
+
+    def cancel(self, capture_id: str) -> Optional[ProfileCapture]:
+        capture = self._captures.get(capture_id)
+        if capture is not None and capture.status in ('waiting', 'running'):
+            capture.cancelled = True
+            capture.finished_at = datetime.now().isoformat()
+        return capture
+
+    def claim(self, route: str, method: str) -> Optional[ProfileCapture]:
+        """Reservar un lugar en una captura abierta para esta petición."""
+        with self._lock:
+            if self._profiling:
+                return None
+            for capture in self._captures.values():
+                if capture.open and capture.matches(route, method):
+                    capture.in_flight += 1
+                    self._profiling = True
+                    return capture
+        return None
+
+    def release(self) -> None:
+        with self._lock:
+            self._profiling = False
+
+    def _prune(self) -> None:
+        finished = [capture for capture in self.list() if not capture.open and not capture.in_flight]
+        for capture in finished[MAX_FINISHED_CAPTURES:]:
+            del self._captures[capture.id]
+
+
+def start_profiler(profiler: str):
+    """Crear y activar el profiler de una petición."""
+    if profiler == 'pyinstrument':
+        instance = pyinstrument.Profiler(async_mode='enabled')
+        instance.start()
+        return instance
+    instance = cProfile.Profile()
+    instance.enable()
+    return instance
+
+
+def stop_profiler(instance) -> None:
+    if isinstance(instance, cProfile.Profile):
+        instance.disable()
+    else:
+        instance.stop()
+
+
+# ========== Sampler continuo ==========
+
+class StackSampler:
+    """
+    Muestreo periódico de los stacks de todos los hilos.
+
+    El costo es proporcional a la frecuencia (por defecto 50 Hz) y a la
+    profundidad de los stacks, independiente del tráfico.
+    """
+
+    def __init__(self, output_dir: str = 'data/profiles', interval_ms: float = 20.0,
+                 dump_interval_s: float = 60.0, max_files: int = 120):
+        self.output_dir = Path(output_dir)
+        self.interval_ms = interval_ms
+        self.dump_interval_s = dump_interval_s
+        self.max_files = max_files
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.started_at: Optional[str] = None
+        self.last_dump: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> 'StackSampler':
+        return cls(
+            output_dir=os.getenv('PROFILING_DIR', 'data/profiles'),
+            interval_ms=float(os.getenv('PROFILING_SAMPLE_INTERVAL_MS', '20')),
+            dump_interval_s=float(os.getenv('PROFILING_DUMP_INTERVAL_S', '60')),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self.samples = 0
+        self.started_at = datetime.now().isoformat()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        print(f" Sampler de stacks activo ({1000 / self.interval_ms:.0f} Hz) -> {self.output_dir}")
+
+    def stop(self) -> Optional[str]:
+        """Detener el muestreo y escribir los stacks pendientes."""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        return self.dump()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        interval = self.interval_ms / 1000
+        next_dump = time.monotonic() + self.dump_interval_s
+        while not self._stop.wait(interval):
+            self.sample(skip_thread=own_id)
+            if time.monotonic() >= next_dump:
+                self.dump()
+                next_dump = time.monotonic() + self.dump_interval_s
+
+    def sample(self, skip_thread: Optional[int] = None) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip_thread:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            frames.append(names.get(thread_id, str(thread_id)))
+            stacks.append(';'.join(reversed(frames)))
+        with self._lock:
+            self._counts.update(stacks)
+            self.samples += 1
+
+    def dump(self) -> Optional[str]:
+        """Escribir los stacks acumulados (formato folded) y reiniciar el conteo."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return None
+        path = self.output_dir / f"stacks-{os.getpid()}-{datetime.now():%Y%m%dT%H%M%S}.folded"
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in counts.most_common():
+                f.write(f"{stack} {count}\n")
+        self.last_dump = str(path)
+        self._rotate()
+        return self.last_dump
+
+    def _rotate(self) -> None:
+        files = sorted(self.output_dir.glob('stacks-*.folded'), key=lambda p: p.stat().st_mtime)
+        for old in files[:-self.max_files]:
+            old.unlink(missing_ok=True)
+
+    def to_dict(self) -> Dict:
+        return {
+            'running': self.running,
+            'interval_ms': self.interval_ms,
+            'dump_interval_s': self.dump_interval_s,
+            'output_dir': str(self.output_dir),
+            'started_at': self.started_at,
+            'samples': self.samples,
+            'last_dump': self.last_dump,
+        }
+
+
+capture_registry = CaptureRegistry()
+_sampler: Optional[StackSampler] = None
+
+
+def get_capture_registry() -> CaptureRegistry:
+    return capture_registry
+
+
+def get_sampler() -> StackSampler:
+    global _sampler
+    if _sampler is None:
+        _sampler = StackSampler.from_env()
+    return _sampler
@@ -0,0 +1,75 @@
+"""
+Single-Flight
+Coalescencia de peticiones idénticas en vuelo.
+
+Si llegan varias peticiones concurrentes con la misma clave (endpoint +
+parámetros normalizados), solo la primera ejecuta el cálculo; las demás
+esperan el mismo resultado (o la misma excepción). La clave se libera al
+terminar, de modo que no actúa como cache.
+"""
+
+import asyncio
+import contextvars
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Comparte un único cálculo en vuelo entre llamadas con la misma clave."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecutar `factory()` una sola vez por clave mientras esté en vuelo.
+
+        Args:
+            key: Clave de la petición (p. ej. ('sentiment_stats', restaurant_id))
+            factory: Función sin argumentos que retorna el awaitable a compartir
+
+        Returns:
+            Resultado compartido. No debe mutarse: lo reciben todos los llamadores.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._release, key))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        # shield: si un llamador se cancela, el cálculo compartido continúa
+        return await asyncio.shield(future)
+
+    async def run_in_executor(self, key: Hashable, func: Callable[..., Any], *args) -> Any:
+        """
+        Variante para funciones síncronas (CPU/IO): se ejecutan en un thread
+        para no bloquear el event loop y así poder coalescer las peticiones.
+
+        La función corre con una copia del contexto del primer llamador
+        (run_in_executor no copia contextvars): sus etapas instrumentadas
+        quedan en la traza de esa petición.
+        """
+        loop = asyncio.get_running_loop()
+        return await self.do(key, lambda: loop.run_in_executor(
+            None, functools.partial(contextvars.copy_context().run, func, *args)
+        ))
+
+    def _release(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Marcar la excepción como recuperada si ningún llamador la esperó
+        if not future.cancelled():
+            future.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cálculos ejecutados, peticiones coalescidas y claves en vuelo."""
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight)
+        }
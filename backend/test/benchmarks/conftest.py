@@ -0,0 +1,111 @@
+"""
+Configuración de la suite de benchmarks (pytest-benchmark).
+
+Todos los datos son sintéticos y se generan una vez por sesión, por lo que
+la suite corre sin red ni artefactos en data/.
+
+Escalas (--bench-scale o BENCH_SCALE):
+- quick (por defecto): catálogo 1k, reseñas 10k
+- standard: catálogos 1k/10k, reseñas 10k/100k
+- full: catálogos 1k/10k/100k, reseñas 10k/100k/1M
+
+Uso:
+    pytest test/benchmarks --benchmark-json=bench.json
+    python scripts/check_benchmark_regression.py bench.json test/benchmarks/baselines/quick.json
+"""
+
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+from . import synthetic
+
+
+# Sin pytest-benchmark (requirements.txt) la suite no se recolecta
+if importlib.util.find_spec('pytest_benchmark') is None:
+    collect_ignore_glob = ['test_*.py']
+
+
+SCALES = {
+    'quick': {'catalogue': [1_000], 'reviews': [10_000]},
+    'standard': {'catalogue': [1_000, 10_000], 'reviews': [10_000, 100_000]},
+    'full': {'catalogue': [1_000, 10_000, 100_000], 'reviews': [10_000, 100_000, 1_000_000]},
+}
+
+# Catálogo de las reseñas: los id_place de las reseñas apuntan a él
+REVIEW_CATALOGUE_SIZE = 1_000
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--bench-scale',
+        default=os.getenv('BENCH_SCALE', 'quick'),
+        choices=sorted(SCALES),
+        help='Tamaños de los datos sintéticos de benchmark'
+    )
+
+
+def pytest_generate_tests(metafunc):
+    # La opción solo existe si este conftest se carga al inicio (pytest test/benchmarks)
+    scale = SCALES[metafunc.config.getoption('--bench-scale', default=os.getenv('BENCH_SCALE', 'quick'))]
+    if 'catalogue_size' in metafunc.fixturenames:
+        metafunc.parametrize('catalogue_size', scale['catalogue'], scope='session')
+    if 'review_size' in metafunc.fixturenames:
+        metafunc.parametrize('review_size', scale['reviews'], scope='session')
+
+
+@pytest.fixture(scope='session')
+def bench_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp('bench_data')
+
+
+@pytest.fixture(scope='session')
+def catalogue_csv(bench_dir, catalogue_size):
+    return synthetic.write_csv(synthetic.make_catalogue(catalogue_size), bench_dir / f'catalogue_{catalogue_size}.csv')
+
+
+@pytest.fixture(scope='session')
+def catalogue_source(catalogue_csv):
+    from src.infrastructure.repositories import CatalogueDataSource
+    return CatalogueDataSource(str(catalogue_csv))
+
+
+@pytest.fixture(scope='session')
+def restaurant_repository(catalogue_source):
+    from src.infrastructure.repositories import CSVRestaurantRepository
+    repository = CSVRestaurantRepository(source=catalogue_source)
+    repository.find_all()  # cache de entidades construido fuera de la medición
+    return repository
+
+
+@pytest.fixture(scope='session')
+def review_repository(bench_dir, review_size):
+    from src.infrastructure.repositories import CSVReviewRepository
+    place_ids = synthetic.make_catalogue(REVIEW_CATALOGUE_SIZE)['id_place']
+    path = synthetic.write_csv(
+        synthetic.make_reviews(review_size, place_ids),
+        bench_dir / f'reviews_{review_size}.csv'
+    )
+    return CSVReviewRepository(str(path))
+
+
+@pytest.fixture(scope='session')
+def sentiment_model():
+    """Modelo de sentimientos entrenado sobre comentarios sintéticos."""
+    import pandas as pd
+    from src.ml.models import SentimentAnalysisModel
+
+    comments, labels = synthetic.make_comments(3_000, seed=11)
+    model = SentimentAnalysisModel()
+    model.train(pd.Series(comments), pd.Series(labels), max_features=2000)
+    return model
+
+
+@pytest.fixture(scope='session')
+def event_loop_runner():
+    """Ejecuta corutinas en un loop reutilizado (sin medir su creación)."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
@@ -0,0 +1,97 @@
+"""
+Datos sintéticos para benchmarks
+Catálogos de restaurantes y corpus de reseñas reproducibles (semilla fija),
+con el mismo esquema que los CSV procesados y sin depender de data/.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+DISTRICTS = ['Barranco', 'Miraflores', 'San_Isidro', 'Surco', 'Surquillo', 'Lince', 'Magdalena']
+
+CATEGORIES = [
+    'Restaurante', 'Restaurante peruano', 'Cevichería', 'Pollería', 'Pizzería',
+    'Restaurante italiano', 'Restaurante chino', 'Parrilla', 'Cafetería',
+    'Restaurante japonés', 'Restaurante vegetariano', 'Bar restaurante'
+]
+
+SENTIMENTS = np.array(['positivo', 'neutro', 'negativo'])
+
+# Vocabulario por sentimiento para que el modelo tenga señal que aprender
+WORDS = {
+    'positivo': ['delicioso', 'excelente', 'rico', 'amable', 'recomendado', 'increíble', 'fresco', 'genial'],
+    'neutro': ['normal', 'regular', 'aceptable', 'promedio', 'correcto', 'sencillo', 'típico', 'estándar'],
+    'negativo': ['malo', 'frío', 'lento', 'caro', 'sucio', 'pésimo', 'demora', 'horrible'],
+}
+COMMON_WORDS = ['comida', 'servicio', 'lugar', 'plato', 'mesero', 'precio', 'ambiente', 'local']
+
+# Caja aproximada de los distritos de Lima del dataset
+LAT_RANGE = (-12.16, -12.07)
+LONG_RANGE = (-77.08, -76.98)
+
+
+def make_catalogue(n: int, seed: int = 42) -> pd.DataFrame:
+    """Catálogo de `n` restaurantes con el esquema de restaurantes_sin_anomalias.csv."""
+    rng = np.random.default_rng(seed)
+    ids = [f"SYN{seed:02d}{i:07d}" for i in range(n)]
+    district = rng.choice(DISTRICTS, n)
+    category = rng.choice(CATEGORIES, n)
+
+    return pd.DataFrame({
+        'restaurant_id': np.arange(1, n + 1),
+        'id_place': ids,
+        'url_place': [f"https://www.google.com/maps/place/?q=place_id:{i}" for i in ids],
+        'title': [f"Restaurante {i}" for i in range(n)],
+        'category': category,
+        'address': [f"Av. Sintética {i % 900 + 100}, {d}" for i, d in enumerate(district)],
+        'phone_number': '(01) 0000000',
+        'complete_phone_number': '+51 1 0000000',
+        'domain': 'No disponible',
+        'url': 'No disponible',
+        'stars': np.round(rng.uniform(3.0, 5.0, n), 1),
+        'reviews': rng.lognormal(5.5, 1.2, n).astype(np.int64) + 1,
+        'district': district,
+        'lat': rng.uniform(*LAT_RANGE, n),
+        'long': rng.uniform(*LONG_RANGE, n),
+    })
+
+
+def make_comments(n: int, seed: int = 7) -> tuple:
+    """`n` comentarios sintéticos y su sentimiento."""
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(SENTIMENTS, n, p=[0.55, 0.2, 0.25])
+    comments = []
+    for label in labels:
+        words = list(rng.choice(WORDS[label], 3)) + list(rng.choice(COMMON_WORDS, 4))
+        rng.shuffle(words)
+        comments.append(' '.join(words))
+    return comments, labels
+
+
+def make_reviews(n: int, place_ids, seed: int = 7) -> pd.DataFrame:
+    """Corpus de `n` reseñas con el esquema de modelo_limpio.csv."""
+    rng = np.random.default_rng(seed)
+    # Distribución sesgada: pocos restaurantes concentran muchas reseñas
+    weights = rng.pareto(1.5, len(place_ids)) + 1
+    weights /= weights.sum()
+    # Pocas plantillas de texto: el tamaño del CSV no domina la generación
+    comments, labels = make_comments(min(n, 5000), seed)
+    picks = rng.integers(0, len(comments), n)
+
+    return pd.DataFrame({
+        'id_review': [f"R{i:08d}" for i in range(n)],
+        'id_place': rng.choice(np.asarray(place_ids), n, p=weights),
+        'caption': np.asarray(comments, dtype=object)[picks],
+        'rating': rng.integers(1, 6, n),
+        'username': [f"user{i % 5000}" for i in range(n)],
+        'review_date': (pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 700, n), unit='D')),
+        'sentimiento': np.asarray(labels)[picks],
+    })
+
+
+def write_csv(df: pd.DataFrame, path: Path) -> Path:
+    df.to_csv(path, index=False)
+    return path
@@ -0,0 +1,34 @@
+"""
+Benchmarks de agregados por distrito.
+"""
+
+import pytest
+
+from src.infrastructure.repositories.csv_district_repository import CSVDistrictRepository
+
+
+@pytest.fixture
+def district_repository(catalogue_source):
+    repository = CSVDistrictRepository(source=catalogue_source)
+    yield repository
+    catalogue_source.unsubscribe(repository._on_catalogue_changed)
+
+
+@pytest.mark.benchmark(group='district_aggregates')
+def test_district_statistics_cold(benchmark, district_repository, event_loop_runner, catalogue_size):
+    """Agregación completa: groupby del catálogo + tabla de estadísticas."""
+    def run():
+        district_repository.clear_cache()
+        return event_loop_runner(district_repository.get_districts_with_statistics())
+
+    districts = benchmark(run)
+    assert districts
+
+
+@pytest.mark.benchmark(group='district_aggregates')
+def test_district_lookup_warm(benchmark, district_repository, event_loop_runner, catalogue_size):
+    """Consulta servida desde la tabla ya construida."""
+    event_loop_runner(district_repository.get_all_districts())
+
+    district = benchmark(lambda: event_loop_runner(district_repository.get_district_by_name('Miraflores')))
+    assert district is not None
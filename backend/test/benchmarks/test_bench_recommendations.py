@@ -0,0 +1,63 @@
+"""
+Benchmarks de recomendaciones y búsqueda geográfica.
+"""
+
+import pytest
+
+from src.application import RecommendationService, RecommendationRequestDTO
+from src.ml.models import RestaurantRecommenderSystem
+
+
+USER_LAT, USER_LONG = -12.12, -77.03
+
+
+@pytest.fixture(scope='session')
+def recommendation_service(restaurant_repository):
+    # Sin modelos ML: mide el algoritmo de scoring, no la carga de .pkl
+    return RecommendationService(restaurant_repository, use_ml_models=False)
+
+
+@pytest.fixture(scope='session')
+def recommender_system(catalogue_source):
+    recommender = RestaurantRecommenderSystem()
+    recommender.set_restaurants_data(catalogue_source.df)
+    return recommender
+
+
+@pytest.mark.benchmark(group='recommendations')
+def test_get_recommendations(benchmark, recommendation_service, catalogue_size):
+    request = RecommendationRequestDTO(
+        user_location={'lat': USER_LAT, 'long': USER_LONG},
+        top_n=10
+    )
+    response = benchmark(recommendation_service.get_recommendations, request)
+    assert response.total_found == 10
+
+
+@pytest.mark.benchmark(group='recommendations')
+def test_get_recommendations_filtered(benchmark, recommendation_service, catalogue_size):
+    request = RecommendationRequestDTO(
+        user_location={'lat': USER_LAT, 'long': USER_LONG},
+        preferences={'category': 'Pizzería'},
+        filters={'min_rating': 4.0, 'max_distance_km': 3.0},
+        top_n=10
+    )
+    benchmark(recommendation_service.get_recommendations, request)
+
+
+@pytest.mark.benchmark(group='recommender_system')
+def test_recommender_system_recommend(benchmark, recommender_system, catalogue_size):
+    results = benchmark(
+        recommender_system.recommend,
+        USER_LAT, USER_LONG,
+        preferences={},
+        filters={'max_distance_km': 5.0},
+        top_n=10
+    )
+    assert len(results) <= 10
+
+
+@pytest.mark.benchmark(group='find_nearby')
+def test_find_nearby(benchmark, restaurant_repository, catalogue_size):
+    results = benchmark(restaurant_repository.find_nearby, USER_LAT, USER_LONG, 2.0)
+    assert all(r.lat is not None for r in results[:5])
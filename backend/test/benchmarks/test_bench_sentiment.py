@@ -0,0 +1,40 @@
+"""
+Benchmarks de estadísticas de reseñas y del modelo de sentimientos.
+"""
+
+import pytest
+
+from . import synthetic
+
+
+@pytest.fixture(scope='session')
+def busiest_restaurants(review_repository):
+    """Los 50 restaurantes con más reseñas (peor caso de las estadísticas)."""
+    counts = review_repository._df['id_place'].value_counts()
+    return list(counts.index[:50])
+
+
+@pytest.mark.benchmark(group='sentiment_stats')
+def test_get_sentiment_stats(benchmark, review_repository, busiest_restaurants, review_size):
+    stats = benchmark(review_repository.get_sentiment_stats, busiest_restaurants[0])
+    assert stats['total'] > 0
+
+
+@pytest.mark.benchmark(group='sentiment_stats')
+def test_get_sentiment_stats_bulk_50(benchmark, review_repository, busiest_restaurants, review_size):
+    stats = benchmark(review_repository.get_sentiment_stats_bulk, busiest_restaurants)
+    assert len(stats) == 50
+
+
+@pytest.mark.benchmark(group='sentiment_model')
+def test_predict_single(benchmark, sentiment_model):
+    result = benchmark(sentiment_model.predict_single, "La comida estuvo excelente pero el servicio lento")
+    assert result['sentiment'] in ('positivo', 'neutro', 'negativo')
+
+
+@pytest.mark.benchmark(group='sentiment_model')
+@pytest.mark.parametrize('batch_size', [32, 1000])
+def test_predict_batch(benchmark, sentiment_model, batch_size):
+    comments, _ = synthetic.make_comments(batch_size, seed=3)
+    results = benchmark(sentiment_model.predict_batch, comments)
+    assert len(results) == batch_size
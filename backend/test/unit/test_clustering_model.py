@@ -0,0 +1,67 @@
+"""
+Tests de la carga del modelo de clustering y su uso en el enriquecimiento del catálogo.
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.ml.catalogue_enricher import CatalogueEnricher
+from src.ml.models.clustering_model import RestaurantClusteringModel
+
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'lat': rng.normal(-12.1, 0.05, 60),
+        'long': rng.normal(-77.0, 0.05, 60),
+        'stars': rng.uniform(1, 5, 60),
+    })
+
+
+@pytest.fixture
+def trained(features):
+    return RestaurantClusteringModel(n_clusters=3, algorithm='kmeans').train(features)
+
+
+def test_load_round_trip_restores_scaler_and_unpickles_once(trained, features, tmp_path, monkeypatch):
+    path = tmp_path / 'clustering.pkl'
+    trained.save(str(path))
+    loads = []
+    real_load = joblib.load
+    monkeypatch.setattr(joblib, 'load', lambda *args, **kwargs: loads.append(1) or real_load(*args, **kwargs))
+
+    model = RestaurantClusteringModel().load(str(path))
+
+    assert len(loads) == 1
+    assert model.can_predict
+    assert model.n_clusters == 3
+    np.testing.assert_array_equal(model.predict(features), trained.predict(features))
+
+
+def test_artifact_without_scaler_cannot_predict(trained, tmp_path):
+    path = tmp_path / 'legacy.pkl'
+    joblib.dump({'model': trained.model, 'metadata': trained.metadata, 'is_trained': True}, path)
+
+    model = RestaurantClusteringModel().load(str(path))
+
+    assert model.is_trained
+    assert not model.can_predict
+
+
+def test_enricher_skips_model_without_fitted_scaler(trained, features, capsys):
+    legacy = RestaurantClusteringModel()
+    legacy.model = trained.model
+    legacy.feature_names = trained.feature_names
+    legacy.is_trained = True
+
+    df = features.copy()
+    CatalogueEnricher(clustering_model=legacy).refresh_clusters(df)
+
+    assert df['cluster_id'].isna().all()
+    assert 'Error en enriquecimiento' not in capsys.readouterr().out
+
+    CatalogueEnricher(clustering_model=trained).refresh_clusters(df)
+    assert df['cluster_id'].notna().all()
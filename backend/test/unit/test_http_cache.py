@@ -0,0 +1,168 @@
+"""
+Tests de ETag/304 del catálogo junto con el middleware de compresión.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
+
+from src.presentation.api import http_cache
+from src.presentation.api.middleware.compression import CompressionMiddleware
+
+
+VERSION = 'abc123-1'
+STRONG = f'"{VERSION}"'
+WEAK = f'W/"{VERSION}"'
+
+
+class _FakeSource:
+    dataset_version = VERSION
+    last_modified = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(http_cache, 'get_catalogue_source', lambda: _FakeSource())
+    calls = []
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get('/large')
+    async def large(request: Request, response: Response):
+        not_modified = http_cache.check_catalogue_cache(request, response)
+        if not_modified is not None:
+            return not_modified
+        calls.append('large')
+        return [f'categoria-{i}' for i in range(500)]
+
+    @app.get('/small')
+    async def small(request: Request, response: Response):
+        not_modified = http_cache.check_catalogue_cache(request, response)
+        if not_modified is not None:
+            return not_modified
+        return ['a', 'b']
+
+    @app.get('/uncached', response_class=ORJSONResponse)
+    async def uncached():
+        return ORJSONResponse({'items': list(range(1000))})
+
+    app.state.calls = calls
+    return app
+
+
+def _get(app, path, **headers):
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await client.get(path, headers=headers)
+    return asyncio.run(request())
+
+
+def _vary(response):
+    return [value.strip().lower() for value in response.headers.get('vary', '').split(',') if value.strip()]
+
+
+# ========== If-None-Match / If-Modified-Since ==========
+
+def test_matching_if_none_match_returns_304_without_running_endpoint(app):
+    response = _get(app, '/large', **{'Accept-Encoding': 'identity', 'If-None-Match': STRONG})
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == STRONG
+    assert response.headers['cache-control'] == http_cache.CATALOGUE_CACHE_CONTROL
+    assert app.state.calls == []
+
+
+@pytest.mark.parametrize('if_none_match', [
+    WEAK, STRONG, f'"otro", {WEAK}', '*',
+])
+def test_weak_comparison_matches_weak_and_strong_tags(app, if_none_match):
+    response = _get(app, '/large', **{'Accept-Encoding': 'gzip', 'If-None-Match': if_none_match})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('if_none_match', ['"otro"', f'W/"{VERSION}-x"', '"abc123"'])
+def test_different_etag_returns_200(app, if_none_match):
+    response = _get(app, '/large', **{'Accept-Encoding': 'identity', 'If-None-Match': if_none_match})
+
+    assert response.status_code == 200
+    assert app.state.calls == ['large']
+
+
+def test_if_modified_since(app):
+    not_modified = _get(app, '/large', **{'If-Modified-Since': 'Tue, 02 Jan 2024 03:04:05 GMT'})
+    modified = _get(app, '/large', **{'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert modified.headers['last-modified'] == 'Tue, 02 Jan 2024 03:04:05 GMT'
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(app):
+    response = _get(app, '/large', **{
+        'If-None-Match': '"otro"',
+        'If-Modified-Since': 'Tue, 02 Jan 2024 03:04:05 GMT',
+    })
+
+    assert response.status_code == 200
+
+
+# ========== Headers con y sin compresión ==========
+
+def test_compressed_200_and_its_304_share_the_weak_validator(app):
+    first = _get(app, '/large', **{'Accept-Encoding': 'gzip'})
+
+    assert first.status_code == 200
+    assert first.headers['content-encoding'] == 'gzip'
+    assert first.headers['etag'] == WEAK
+    assert _vary(first) == ['accept-encoding']
+    assert first.json()[0] == 'categoria-0'
+
+    revalidated = _get(app, '/large', **{'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['etag']})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == first.headers['etag']
+    assert _vary(revalidated) == ['accept-encoding']
+
+
+def test_identity_200_and_its_304_share_the_strong_validator(app):
+    first = _get(app, '/large', **{'Accept-Encoding': 'identity'})
+
+    assert first.status_code == 200
+    assert 'content-encoding' not in first.headers
+    assert first.headers['etag'] == STRONG
+    assert _vary(first) == ['accept-encoding']
+
+    revalidated = _get(app, '/large', **{'Accept-Encoding': 'identity', 'If-None-Match': STRONG})
+
+    assert revalidated.headers['etag'] == STRONG
+    assert _vary(revalidated) == ['accept-encoding']
+
+
+def test_small_body_is_not_compressed_but_uses_weak_etag_when_gzip_accepted(app):
+    first = _get(app, '/small', **{'Accept-Encoding': 'gzip'})
+    revalidated = _get(app, '/small', **{'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['etag']})
+
+    assert 'content-encoding' not in first.headers
+    assert first.headers['etag'] == WEAK
+    assert _vary(first) == ['accept-encoding']
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == WEAK
+
+
+def test_vary_on_json_without_cache_headers(app):
+    identity = _get(app, '/uncached', **{'Accept-Encoding': 'identity'})
+    compressed = _get(app, '/uncached', **{'Accept-Encoding': 'gzip'})
+
+    assert _vary(identity) == ['accept-encoding']
+    assert _vary(compressed) == ['accept-encoding']
+    assert compressed.headers['content-encoding'] == 'gzip'
+    assert 'etag' not in compressed.headers
+    assert compressed.json() == identity.json()
@@ -0,0 +1,89 @@
+"""
+Tests de KeyCodes (códigos enteros de columnas de texto).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.repositories.key_codes import KeyCodes
+
+
+VALUES = ['Miraflores', None, 'miraflores', 'Barranco', np.nan, 'MIRAFLORES', 'barranco', 'Surco']
+
+
+@pytest.fixture(params=['object', 'str', 'category'])
+def column(request):
+    return pd.Series(VALUES, dtype=request.param)
+
+
+def test_keys_are_lowercase_sorted_and_nulls_have_no_code(column):
+    codes = KeyCodes(column)
+
+    assert codes.keys == ['barranco', 'miraflores', 'surco']
+    assert codes.codes.tolist() == [1, -1, 1, 0, -1, 1, 0, 2]
+
+
+def test_positions_of_ignores_case_and_is_ascending(column):
+    codes = KeyCodes(column)
+
+    assert codes.positions_of('MiraFlores').tolist() == [0, 2, 5]
+    assert codes.positions_of('barranco').tolist() == [3, 6]
+    assert codes.positions_of('Surco').tolist() == [7]
+
+
+def test_unknown_and_null_like_values_have_no_positions(column):
+    codes = KeyCodes(column)
+
+    assert codes.code_of('San Isidro') == -1
+    assert codes.positions_of('San Isidro').size == 0
+    # Los nulos no se convierten en claves de texto
+    assert codes.positions_of('nan').size == 0
+    assert codes.positions_of('None').size == 0
+
+
+def test_counts_per_code_skip_nulls(column):
+    codes = KeyCodes(column)
+
+    assert codes.counts(np.arange(len(column))).tolist() == [2, 3, 1]
+    assert codes.counts(np.array([0, 1, 3, 4])).tolist() == [1, 1, 0]
+    assert codes.counts(np.array([], dtype=np.intp)).tolist() == [0, 0, 0]
+
+
+def test_case_sensitive_keeps_distinct_keys():
+    codes = KeyCodes(pd.Series(['abc', 'ABC', None, 'abc'], dtype='category'), case_sensitive=True)
+
+    assert codes.keys == ['ABC', 'abc']
+    assert codes.positions_of('abc').tolist() == [0, 3]
+    assert codes.positions_of('ABC').tolist() == [1]
+    assert codes.positions_of('Abc').size == 0
+
+
+def test_category_with_unused_and_colliding_categories():
+    # Categorías que colisionan al normalizar ('Surco'/'SURCO') y una sin uso
+    column = pd.Series(
+        pd.Categorical(['Surco', 'SURCO', None], categories=['SURCO', 'Surco', 'Lince'])
+    )
+    codes = KeyCodes(column)
+
+    assert codes.keys == ['lince', 'surco']
+    assert codes.positions_of('surco').tolist() == [0, 1]
+    assert codes.positions_of('lince').size == 0
+    assert codes.counts(np.arange(3)).tolist() == [0, 2]
+
+
+def test_codes_where_and_mask_for(column):
+    codes = KeyCodes(column)
+
+    selected = codes.codes_where(lambda key: key.endswith('o'))
+    assert sorted(codes.keys[code] for code in selected) == ['barranco', 'surco']
+    assert codes.mask_for(selected).tolist() == [False, False, False, True, False, False, True, True]
+
+
+def test_all_null_column():
+    codes = KeyCodes(pd.Series([None, None], dtype=object))
+
+    assert len(codes) == 0
+    assert codes.codes.tolist() == [-1, -1]
+    assert codes.positions_of('x').size == 0
+    assert codes.counts(np.arange(2)).tolist() == []
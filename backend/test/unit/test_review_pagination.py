@@ -0,0 +1,129 @@
+"""
+Tests de la paginación por cursor de CSVReviewRepository.
+"""
+
+import base64
+import json
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.repositories.csv_review_repository import CSVReviewRepository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    rows = []
+    for i in range(12):
+        rows.append({
+            'id_review': f'r{i}',
+            'id_place': 'A' if i % 3 else 'B',
+            'comment': f'comentario {i}',
+            'rating': 5 if i % 2 else 1,
+            'username': f'user{i}',
+            'sentimiento': 'positivo' if i % 2 else 'negativo',
+        })
+    path = tmp_path / 'reviews.csv'
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return CSVReviewRepository(str(path))
+
+
+def _pages(repository, **filters):
+    ids, cursor = [], None
+    while True:
+        reviews, cursor = repository.find_page(cursor=cursor, **filters)
+        ids.append([review.id for review in reviews])
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize('restaurant_id,sentiment', [
+    (None, None), ('A', None), (None, 'positivo'), ('A', 'Positivo'), ('B', 'negativo'),
+])
+def test_cursor_round_trip(restaurant_id, sentiment):
+    cursor = CSVReviewRepository.encode_cursor(7, restaurant_id, sentiment)
+
+    assert '=' not in cursor
+    assert CSVReviewRepository.decode_cursor(cursor, restaurant_id, sentiment) == 7
+
+
+def test_sentiment_filter_in_cursor_ignores_case():
+    cursor = CSVReviewRepository.encode_cursor(3, 'A', 'Positivo')
+
+    assert CSVReviewRepository.decode_cursor(cursor, 'A', 'positivo') == 3
+
+
+@pytest.mark.parametrize('restaurant_id,sentiment', [
+    ('B', 'positivo'), ('A', 'negativo'), (None, 'positivo'), ('A', None), ('a', 'positivo'),
+])
+def test_cursor_from_other_filters_is_rejected(restaurant_id, sentiment):
+    cursor = CSVReviewRepository.encode_cursor(3, 'A', 'positivo')
+
+    with pytest.raises(ValueError, match='no corresponde'):
+        CSVReviewRepository.decode_cursor(cursor, restaurant_id, sentiment)
+
+
+@pytest.mark.parametrize('cursor', [
+    'no-es-base64!!',
+    base64.urlsafe_b64encode(b'no es json').decode(),
+    base64.urlsafe_b64encode(json.dumps({'f': '|'}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps({'p': 'x', 'f': '|'}).encode()).decode(),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match='Cursor inválido'):
+        CSVReviewRepository.decode_cursor(cursor, None, None)
+
+
+def test_negative_position_is_rejected():
+    cursor = CSVReviewRepository.encode_cursor(-1, None, None)
+
+    with pytest.raises(ValueError):
+        CSVReviewRepository.decode_cursor(cursor, None, None)
+
+
+def test_pages_cover_all_rows_in_order(repository):
+    pages = _pages(repository, limit=5)
+
+    assert pages == [
+        ['r0', 'r1', 'r2', 'r3', 'r4'],
+        ['r5', 'r6', 'r7', 'r8', 'r9'],
+        ['r10', 'r11'],
+    ]
+
+
+def test_filtered_pages(repository):
+    pages = _pages(repository, restaurant_id='A', sentiment='positivo', limit=2)
+
+    assert pages == [['r1', 'r5'], ['r7', 'r11']]
+
+
+def test_last_full_page_has_no_next_cursor(repository):
+    reviews, cursor = repository.find_page(restaurant_id='B', limit=4)
+
+    assert [review.id for review in reviews] == ['r0', 'r3', 'r6', 'r9']
+    assert cursor is None
+
+
+def test_find_page_rejects_cursor_from_other_filters(repository):
+    _, cursor = repository.find_page(restaurant_id='A', limit=2)
+
+    with pytest.raises(ValueError, match='no corresponde'):
+        repository.find_page(restaurant_id='B', cursor=cursor, limit=2)
+    with pytest.raises(ValueError, match='no corresponde'):
+        repository.find_page(restaurant_id='A', sentiment='positivo', cursor=cursor, limit=2)
+
+
+def test_unknown_restaurant_returns_empty_page(repository):
+    assert repository.find_page(restaurant_id='Z') == ([], None)
+
+
+def test_unknown_sentiment_does_not_match_null_sentiments(tmp_path):
+    path = tmp_path / 'reviews.csv'
+    pd.DataFrame([
+        {'id_review': 'r0', 'id_place': 'R1', 'comment': 'a', 'rating': 5, 'username': 'u', 'sentimiento': 'positivo'},
+        {'id_review': 'r1', 'id_place': 'R1', 'comment': 'b', 'rating': 3, 'username': 'u', 'sentimiento': None},
+    ]).to_csv(path, index=False)
+    repository = CSVReviewRepository(str(path))
+
+    assert repository.find_page(restaurant_id='R1', sentiment='bogus') == ([], None)
+    assert repository.find_page(sentiment='bogus') == ([], None)
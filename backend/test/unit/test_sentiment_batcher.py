@@ -0,0 +1,118 @@
+"""
+Tests del micro-batcher de análisis de sentimiento.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.application.services.sentiment_batcher import SentimentMicroBatcher
+
+
+class _RecordingModel:
+    """Modelo falso: registra cada lote y responde con el texto de cada comentario."""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def predict_batch(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError('modelo caído')
+        return [{'text': text, 'sentiment': 'positivo'} for text in texts]
+
+
+def _run(coroutine, timeout=5):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout))
+
+
+async def _predict_all(batcher, texts, **kwargs):
+    return await asyncio.gather(*(batcher.predict(text) for text in texts), **kwargs)
+
+
+def test_concurrent_requests_are_scored_in_one_batch():
+    model = _RecordingModel()
+    batcher = SentimentMicroBatcher(model, max_batch_size=32, max_wait_ms=50)
+    texts = [f'comentario {i}' for i in range(5)]
+
+    results = _run(_predict_all(batcher, texts))
+
+    assert model.batches == [texts]
+    # Cada llamador recibe su propio resultado
+    assert [result['text'] for result in results] == texts
+    metrics = batcher.get_metrics()
+    assert (metrics['batches'], metrics['items'], metrics['errors']) == (1, 5, 0)
+
+
+def test_batches_are_split_at_max_batch_size():
+    model = _RecordingModel()
+    batcher = SentimentMicroBatcher(model, max_batch_size=2, max_wait_ms=50)
+    texts = ['a', 'b', 'c', 'd', 'e']
+
+    results = _run(_predict_all(batcher, texts))
+
+    assert [len(batch) for batch in model.batches] == [2, 2, 1]
+    assert [text for batch in model.batches for text in batch] == texts
+    assert [result['text'] for result in results] == texts
+
+
+def test_partial_batch_is_flushed_after_max_wait_ms():
+    model = _RecordingModel()
+    batcher = SentimentMicroBatcher(model, max_batch_size=100, max_wait_ms=10)
+
+    async def scenario():
+        first = await batcher.predict('solo')
+        # Llega después de cerrar la ventana del primer lote
+        await asyncio.sleep(0.05)
+        second = await batcher.predict('tarde')
+        return first, second
+
+    first, second = _run(scenario())
+
+    # El lote no se llenó, pero la espera máxima lo despachó
+    assert (first['text'], second['text']) == ('solo', 'tarde')
+    assert model.batches == [['solo'], ['tarde']]
+
+
+def test_zero_wait_scores_without_waiting_for_more():
+    model = _RecordingModel()
+    batcher = SentimentMicroBatcher(model, max_batch_size=100, max_wait_ms=0)
+
+    assert _run(batcher.predict('inmediato'))['text'] == 'inmediato'
+    assert model.batches == [['inmediato']]
+
+
+def test_error_reaches_every_future_in_the_batch():
+    model = _RecordingModel(fail=True)
+    batcher = SentimentMicroBatcher(model, max_batch_size=32, max_wait_ms=50)
+
+    results = _run(_predict_all(batcher, ['a', 'b', 'c'], return_exceptions=True))
+
+    assert len(model.batches) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert all(str(result) == 'modelo caído' for result in results)
+    assert batcher.get_metrics()['errors'] == 1
+
+
+def test_worker_keeps_serving_after_a_failed_batch():
+    model = _RecordingModel(fail=True)
+    batcher = SentimentMicroBatcher(model, max_batch_size=32, max_wait_ms=5)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await batcher.predict('falla')
+        model.fail = False
+        return await batcher.predict('recupera')
+
+    assert _run(scenario())['text'] == 'recupera'
+    assert model.batches == [['falla'], ['recupera']]
+
+
+@pytest.mark.parametrize('kwargs', [{'max_batch_size': 0}, {'max_wait_ms': -1}])
+def test_invalid_configuration_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        SentimentMicroBatcher(_RecordingModel(), **kwargs)
@@ -0,0 +1,241 @@
+"""
+Tests de la actualización incremental del modelo de sentimientos.
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.ensemble import VotingClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import ComplementNB
+
+from src.application.services.sentiment_online_updater import SentimentOnlineUpdater
+from src.domain.entities import Review
+from src.ml.models.sentiment_model import SentimentAnalysisModel
+
+
+TEXTS = [
+    'comida excelente y rica', 'muy buena atencion', 'excelente lugar rico',
+    'comida normal', 'atencion regular normal', 'lugar normal regular',
+    'comida horrible fria', 'pesima atencion mala', 'lugar malo horrible',
+]
+LABELS = ['positivo'] * 3 + ['neutro'] * 3 + ['negativo'] * 3
+
+
+def _model(classifier) -> SentimentAnalysisModel:
+    model = SentimentAnalysisModel()
+    model.vectorizer = TfidfVectorizer()
+    X = model.vectorizer.fit_transform(TEXTS)
+    model.classifier = classifier.fit(X, LABELS)
+    model.is_trained = True
+    return model
+
+
+@pytest.fixture
+def ensemble_model():
+    return _model(VotingClassifier(
+        estimators=[('nb', ComplementNB()), ('lr', LogisticRegression(max_iter=200))],
+        voting='soft'
+    ))
+
+
+# ========== partial_update ==========
+
+def test_voting_partial_update_uses_encoded_labels(ensemble_model):
+    nb_before = ensemble_model.classifier.named_estimators_['nb'].class_count_.copy()
+    encoded = {label: i for i, label in enumerate(ensemble_model.classifier.le_.classes_)}
+
+    result = ensemble_model.partial_update(
+        ['excelente comida', 'mala comida', 'excelente atencion'],
+        ['positivo', 'negativo', 'positivo']
+    )
+
+    nb_after = ensemble_model.classifier.named_estimators_['nb'].class_count_
+    expected = nb_before.copy()
+    expected[encoded['positivo']] += 2
+    expected[encoded['negativo']] += 1
+    np.testing.assert_array_equal(nb_after, expected)
+    assert result['samples'] == 3
+    assert result['updated_estimators'] == ['nb']
+    assert result['frozen_estimators'] == ['lr']
+
+
+def test_voting_partial_update_keeps_public_classes_and_frozen_estimators(ensemble_model):
+    lr_coef = ensemble_model.classifier.named_estimators_['lr'].coef_.copy()
+
+    ensemble_model.partial_update(['comida normal'], ['neutro'])
+
+    classifier = ensemble_model.classifier
+    assert list(classifier.classes_) == ['negativo', 'neutro', 'positivo']
+    np.testing.assert_array_equal(classifier.named_estimators_['lr'].coef_, lr_coef)
+    assert set(ensemble_model.predict_batch(['excelente comida'])[0]['probabilities']) == set(LABELS)
+
+
+def test_partial_update_is_copy_on_write(ensemble_model):
+    previous = ensemble_model.classifier
+    counts_before = previous.named_estimators_['nb'].class_count_.copy()
+
+    ensemble_model.partial_update(['excelente'], ['positivo'])
+
+    assert ensemble_model.classifier is not previous
+    np.testing.assert_array_equal(previous.named_estimators_['nb'].class_count_, counts_before)
+
+
+def test_partial_update_records_incremental_metadata(ensemble_model):
+    ensemble_model.partial_update(['excelente'], ['positivo'])
+    ensemble_model.partial_update(['mala', 'horrible'], ['negativo', 'negativo'])
+
+    incremental = ensemble_model.metadata['incremental']
+    assert incremental['batches'] == 2
+    assert incremental['samples'] == 3
+    assert incremental['frozen_estimators'] == ['lr']
+
+
+def test_partial_update_rejects_unknown_labels(ensemble_model):
+    previous = ensemble_model.classifier
+
+    with pytest.raises(ValueError, match='desconocidas'):
+        ensemble_model.partial_update(['excelente'], ['muy positivo'])
+    assert ensemble_model.classifier is previous
+
+
+def test_partial_update_plain_classifier():
+    model = _model(ComplementNB())
+    before = model.classifier.class_count_.copy()
+
+    result = model.partial_update(['excelente', 'normal'], ['positivo', 'neutro'])
+
+    assert result['updated_estimators'] == ['ComplementNB']
+    assert model.classifier.class_count_.sum() == before.sum() + 2
+
+
+def test_partial_update_without_partial_fit_raises():
+    model = _model(LogisticRegression(max_iter=200))
+
+    with pytest.raises(ValueError, match='partial_fit'):
+        model.partial_update(['excelente'], ['positivo'])
+
+
+# ========== SentimentOnlineUpdater ==========
+
+class _RecordingModel:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.applied = threading.Event()
+
+    def partial_update(self, texts, labels):
+        if self.fail:
+            raise RuntimeError('sin modelo')
+        self.batches.append(list(zip(texts, labels)))
+        self.applied.set()
+        return {'samples': len(texts)}
+
+
+def _review(comment, rating) -> Review:
+    return Review(
+        id='r', id_place='p', comment=comment, rating=rating,
+        username='u', review_date=datetime(2024, 1, 1), validate=False
+    )
+
+
+def test_submit_labels_by_rating_and_flush_applies_batch():
+    model = _RecordingModel()
+    updater = SentimentOnlineUpdater(lambda: model, batch_size=100, flush_interval_s=60)
+
+    assert updater.submit(_review('excelente', 5))
+    assert updater.submit(_review('normal', 3))
+    assert updater.submit(_review('malo', 1))
+
+    assert updater.flush() == {'samples': 3}
+    assert model.batches == [[('excelente', 'positivo'), ('normal', 'neutro'), ('malo', 'negativo')]]
+    assert updater.flush() is None
+
+    metrics = updater.get_metrics()
+    assert (metrics['submitted'], metrics['applied'], metrics['batches'], metrics['pending']) == (3, 3, 1, 0)
+    updater.close()
+
+
+def test_unusable_reviews_are_skipped():
+    updater = SentimentOnlineUpdater(lambda: _RecordingModel(), flush_interval_s=60)
+
+    assert not updater.submit(_review('   ', 5))
+    assert not updater.submit(_review('texto', 0))
+    assert updater.get_metrics()['skipped'] == 2
+    assert not updater.running
+
+
+def test_full_batch_is_applied_in_background():
+    model = _RecordingModel()
+    updater = SentimentOnlineUpdater(lambda: model, batch_size=2, flush_interval_s=60)
+
+    updater.submit(_review('uno', 5))
+    updater.submit(_review('dos', 1))
+
+    assert model.applied.wait(5)
+    assert model.batches == [[('uno', 'positivo'), ('dos', 'negativo')]]
+    updater.close()
+
+
+def test_close_flushes_pending_and_stops_thread():
+    model = _RecordingModel()
+    updater = SentimentOnlineUpdater(lambda: model, batch_size=100, flush_interval_s=60)
+    updater.submit(_review('pendiente', 4))
+    assert updater.running
+
+    updater.close()
+
+    assert not updater.running
+    assert model.batches == [[('pendiente', 'positivo')]]
+    # Tras cerrar no se vuelve a crear el thread
+    updater.submit(_review('tarde', 4))
+    assert not updater.running
+
+
+def test_close_without_flush_keeps_pending():
+    model = _RecordingModel()
+    updater = SentimentOnlineUpdater(lambda: model, batch_size=100, flush_interval_s=60)
+    updater.submit(_review('pendiente', 4))
+
+    updater.close(flush=False)
+
+    assert model.batches == []
+    assert updater.get_metrics()['pending'] == 1
+
+
+def test_failed_batch_is_counted_not_raised():
+    updater = SentimentOnlineUpdater(lambda: _RecordingModel(fail=True), batch_size=100, flush_interval_s=60)
+    updater.submit(_review('texto', 5))
+
+    assert updater.flush() is None
+
+    metrics = updater.get_metrics()
+    assert metrics['errors'] == 1
+    assert metrics['last_error'] == 'RuntimeError: sin modelo'
+    assert metrics['applied'] == 0
+    updater.close(flush=False)
+
+
+def test_max_pending_drops_oldest():
+    model = _RecordingModel()
+    updater = SentimentOnlineUpdater(lambda: model, batch_size=100, flush_interval_s=60, max_pending=2)
+    for comment in ('a', 'b', 'c'):
+        updater.submit(_review(comment, 5))
+
+    updater.close()
+
+    assert model.batches == [[('b', 'positivo'), ('c', 'positivo')]]
+    assert updater.get_metrics()['dropped'] == 1
+
+
+def test_existing_updater_accessor_does_not_create_it():
+    from src.infrastructure.container import Container
+
+    container = Container()
+    assert container.existing_sentiment_online_updater() is None
+
+    updater = container.sentiment_online_updater()
+    assert container.existing_sentiment_online_updater() is updater
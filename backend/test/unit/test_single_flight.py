@@ -0,0 +1,231 @@
+"""
+Tests de SingleFlight y de las claves que usan los servicios.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.application.services.district_service import DistrictService
+from src.application.services.sentiment_service import SentimentAnalysisService
+from src.domain.entities.district import District
+from src.shared.instrumentation import begin_request_trace, current_trace, end_request_trace, timed
+from src.shared.single_flight import SingleFlight
+
+
+def test_concurrent_calls_with_same_key_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'value': 42}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do(('stats', 'abc'), compute) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.get_stats() == {'executions': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do(('stats', 'a'), lambda: asyncio.sleep(0.01, result='a')),
+            flight.do(('stats', 'b'), lambda: asyncio.sleep(0.01, result='b')),
+        )
+
+    assert asyncio.run(scenario()) == ['a', 'b']
+    assert flight.executions == 2
+    assert flight.coalesced == 0
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        first = await flight.do('key', compute)
+        second = await flight.do('key', compute)
+        return first, second
+
+    # No actúa como cache: una llamada posterior vuelve a ejecutar
+    assert asyncio.run(scenario()) == (1, 2)
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_exception_is_shared_and_key_released():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do('key', failing),
+            flight.do('key', failing),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.executions == 1
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_computation():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return 'done'
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do('key', compute))
+        second = asyncio.ensure_future(flight.do('key', compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == 'done'
+
+
+def test_run_in_executor_coalesces_sync_functions():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute(value):
+        calls.append(value)
+        release.wait(1)
+        return value * 2
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(flight.run_in_executor('key', compute, 21)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(scenario()) == [42, 42, 42]
+    assert calls == [21]
+
+
+class _ExactIdReviewRepository:
+    """Repositorio falso con índice exacto por ID (como el CSV)."""
+
+    def __init__(self, known_ids):
+        self.known_ids = set(known_ids)
+        self.calls = []
+
+    def get_sentiment_stats(self, restaurant_id):
+        self.calls.append(restaurant_id)
+        if restaurant_id not in self.known_ids:
+            return {'restaurant_id': restaurant_id, 'total': 0}
+        return {'restaurant_id': restaurant_id, 'total': 3}
+
+
+@pytest.mark.parametrize('requested', ['abc', ' abc', 'abc '])
+def test_sentiment_stats_key_and_argument_use_same_normalized_id(requested):
+    repository = _ExactIdReviewRepository({'abc'})
+    service = SentimentAnalysisService(repository, single_flight=SingleFlight())
+
+    result = asyncio.run(service.get_sentiment_statistics_async(requested))
+
+    assert repository.calls == ['abc']
+    assert result['total'] == 3
+
+
+def test_sentiment_stats_with_spacing_variants_coalesce_to_same_result():
+    repository = _ExactIdReviewRepository({'abc'})
+    flight = SingleFlight()
+    service = SentimentAnalysisService(repository, single_flight=flight)
+
+    async def scenario():
+        return await asyncio.gather(
+            service.get_sentiment_statistics_async('abc'),
+            service.get_sentiment_statistics_async(' abc'),
+        )
+
+    first, second = asyncio.run(scenario())
+
+    # Ambas variantes reciben el resultado del ID normalizado
+    assert first['total'] == second['total'] == 3
+    assert set(repository.calls) == {'abc'}
+
+
+class _DistrictUseCases:
+    """Casos de uso falsos: búsqueda exacta en minúsculas (como el repositorio)."""
+
+    def __init__(self, names):
+        self.names = set(names)
+        self.calls = []
+
+    async def get_district_details(self, name):
+        self.calls.append(name)
+        await asyncio.sleep(0.01)
+        if name.lower() not in self.names:
+            return None
+        return District(name=name.lower(), display_name=name.title(), restaurant_count=1)
+
+
+@pytest.mark.parametrize('first,second', [(' Miraflores', 'Miraflores'), ('Miraflores', 'MIRAFLORES ')])
+def test_district_info_variants_share_one_normalized_lookup(first, second):
+    use_cases = _DistrictUseCases({'miraflores'})
+    service = DistrictService(use_cases, single_flight=SingleFlight())
+
+    async def scenario():
+        return await asyncio.gather(
+            service.get_district_info(first),
+            service.get_district_info(second),
+        )
+
+    a, b = asyncio.run(scenario())
+
+    assert a == b
+    assert a['name'] == 'miraflores'
+    assert use_cases.calls == ['miraflores']
+
+
+def test_district_info_not_found_reports_normalized_name():
+    service = DistrictService(_DistrictUseCases(set()), single_flight=SingleFlight())
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(service.get_district_info(' Atlantis '))
+
+    assert error.value.status_code == 404
+    assert error.value.detail == "Distrito 'atlantis' no encontrado"
+
+
+def test_run_in_executor_keeps_request_trace():
+    flight = SingleFlight()
+
+    @timed('test.sync_stage')
+    def compute():
+        return 'ok'
+
+    async def scenario():
+        token = begin_request_trace()
+        try:
+            result = await flight.run_in_executor('key', compute)
+            return result, list(current_trace())
+        finally:
+            end_request_trace(token)
+
+    result, trace = asyncio.run(scenario())
+
+    assert result == 'ok'
+    assert [name for name, _ in trace] == ['test.sync_stage']